@@ -1,7 +1,8 @@
 import matplotlib.pyplot as plt
-from montecarlo.analysis import run_scaling_benchmark, plot_benchmark_results, save_results_to_csv
-from montecarlo.visualization import plot_w_distribution, save_w_distribution_csv
-from montecarlo.simulation import generate_chains
+from montecarlo.analysis import run_scaling_benchmark, summarize_benchmark, plot_benchmark_results, save_results_to_csv
+from montecarlo.distribution import WDistribution
+from montecarlo.ensemble import generate_ensemble
+from montecarlo.baseline import save_run
 
 if __name__ == "__main__":
     # 1️⃣ Benchmark execution time for sorting algorithms
@@ -10,23 +11,26 @@ if __name__ == "__main__":
     
     # 2️⃣ Save benchmark results to CSV
     save_results_to_csv(df_results, "results/benchmark_with_numba.csv")
+    summarize_benchmark(df_results).to_csv("results/benchmark_summary.csv", index=False)
+    save_run(df_results)  # results/benchmarks/<machine>/<commit>-<timestamp>.csv
     
     # 3️⃣ Plot execution time results
     plot_benchmark_results(df_results, metric="sorting_time", save_path="results/sorting_time.png")
     plot_benchmark_results(df_results, metric="total_time", save_path="results/total_time.png")
     
     # 4️⃣ Generate polymer chains for distribution analysis
-    chain_lengths, freq_A, freq_B, freq_C = generate_chains(10000, use_numba=True)
+    ensemble = generate_ensemble(10000, use_numba=True)
 
-    # 5️⃣ Save W distribution data to CSV
-    save_w_distribution_csv(freq_A, chain_lengths, filename="results/distribution_WA.csv")
-    save_w_distribution_csv(freq_B, chain_lengths, filename="results/distribution_WB.csv")
-    save_w_distribution_csv(freq_C, chain_lengths, filename="results/distribution_WC.csv")
+    # 5️⃣ Save W distribution data to CSV (A, B and C binned once from the counts, on shared bins)
+    distribution = WDistribution.from_counts(ensemble.chain_lengths, ensemble.counts, names=ensemble.names)
+    distribution.to_csv("results/distribution_WA.csv", monomer="A")
+    distribution.to_csv("results/distribution_WB.csv", monomer="B")
+    distribution.to_csv("results/distribution_WC.csv", monomer="C")
     
     # 6️⃣ Plot W distributions
     # Monomer A
     plt.figure(figsize=(12, 6))
-    plot_w_distribution(freq_A, chain_lengths, smooth_window=5, poly_order=2, label="A", color="blue")
+    distribution.plot("A", smooth_window=5, poly_order=2, label="A", color="blue")
     plt.xlim(left=0.84, right=1.0)
     plt.xlabel("Fraction of monomer")
     plt.ylabel("W")
@@ -35,8 +39,8 @@ if __name__ == "__main__":
 
     # Monomers B and C
     plt.figure(figsize=(12, 6))
-    plot_w_distribution(freq_B, chain_lengths, smooth_window=5, poly_order=2, label="B", color="green")
-    plot_w_distribution(freq_C, chain_lengths, smooth_window=5, poly_order=2, label="C", color="red")
+    distribution.plot("B", smooth_window=5, poly_order=2, label="B", color="green")
+    distribution.plot("C", smooth_window=5, poly_order=2, label="C", color="red")
     plt.xlim(left=0.0, right=0.12)
     plt.xlabel("Fraction of monomer")
     plt.ylabel("W")
@@ -0,0 +1,540 @@
+import numpy as np
+
+
+def composition_bins(chain_lengths, counts, n_bins):
+    """
+    Composition bin of every monomer of every chain, on `n_bins` bins over [0, 1].
+
+    The bin is computed exactly from the integer counts (``count * n_bins // length``);
+    a fraction of exactly 1 falls in the last bin.
+
+    Parameters
+    ----------
+    chain_lengths : np.ndarray
+        Length of each chain.
+    counts : np.ndarray
+        Monomer counts per chain, shape ``(n_monomers, n_chains)``.
+    n_bins : int
+        Number of bins.
+
+    Returns
+    -------
+    np.ndarray
+        int64 bin indices, shape ``(n_monomers, n_chains)``.
+    """
+    return np.minimum(np.asarray(counts, dtype=np.int64) * n_bins // chain_lengths, n_bins - 1)
+
+
+def length_bins(edges, chain_lengths):
+    """
+    Chain-length bin of every chain: bin ``j`` holds ``edges[j] <= length < edges[j + 1]``.
+
+    Lengths outside the edges are clipped to the first or last bin.
+
+    Returns
+    -------
+    np.ndarray
+        int64 bin indices.
+    """
+    return np.clip(np.searchsorted(edges, chain_lengths, side="right") - 1, 0, len(edges) - 2)
+
+
+class CountAccumulator:
+    """
+    Streaming count of chains and of monomer units of each type.
+
+    Parameters
+    ----------
+    n_monomers : int, default=3
+        Number of monomer types.
+    """
+
+    def __init__(self, n_monomers=3):
+        self.n_chains = 0
+        self.monomer_counts = np.zeros(n_monomers, dtype=np.int64)
+
+    def update(self, chain_lengths, counts):
+        """
+        Add a chunk of chains.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain of the chunk.
+        counts : np.ndarray
+            Monomer counts per chain, shape ``(n_monomers, chunk)``.
+        """
+        self.n_chains += len(chain_lengths)
+        self.monomer_counts += counts.sum(axis=1, dtype=np.int64)
+
+    def merge(self, other):
+        """Add the totals of another `CountAccumulator`."""
+        self.n_chains += other.n_chains
+        self.monomer_counts += other.monomer_counts
+        return self
+
+    @property
+    def n_units(self):
+        """Total number of monomer units."""
+        return int(self.monomer_counts.sum())
+
+
+class WHistogramAccumulator:
+    """
+    Streaming length-weighted composition histograms (W distributions).
+
+    All monomers share the same bins over [0, 1]; a fraction of exactly 1 falls
+    in the last bin.
+
+    Parameters
+    ----------
+    n_bins : int, default=1000
+        Number of bins over [0, 1].
+    n_monomers : int, default=3
+        Number of monomer types.
+    """
+
+    def __init__(self, n_bins=1000, n_monomers=3):
+        self.n_bins = n_bins
+        self.bin_edges = np.linspace(0, 1, n_bins + 1)
+        self.weights = np.zeros((n_monomers, n_bins))
+
+    def update(self, chain_lengths, counts):
+        """
+        Add a chunk of chains.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain of the chunk.
+        counts : np.ndarray
+            Monomer counts per chain, shape ``(n_monomers, chunk)``.
+        """
+        bin_indices = composition_bins(chain_lengths, counts, self.n_bins)
+        for m in range(self.weights.shape[0]):
+            self.weights[m] += np.bincount(bin_indices[m], weights=chain_lengths, minlength=self.n_bins)
+
+    def merge(self, other):
+        """Add the histograms of another `WHistogramAccumulator` with the same bins."""
+        if other.n_bins != self.n_bins:
+            raise ValueError("cannot merge histograms with different bins")
+        self.weights += other.weights
+        return self
+
+    @property
+    def bin_centers(self):
+        """Center of each bin."""
+        return (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+
+    def distribution(self):
+        """
+        W distributions normalized so that the area under each curve is 1.
+
+        Returns
+        -------
+        np.ndarray
+            Normalized W values, shape ``(n_monomers, n_bins)``.
+        """
+        dx = self.bin_edges[1] - self.bin_edges[0]
+        totals = self.weights.sum(axis=1, keepdims=True)
+        return self.weights / (np.where(totals > 0, totals, 1.0) * dx)
+
+
+def log_length_edges(max_length=10**7, bins_per_decade=10):
+    """
+    Integer, roughly logarithmically spaced chain-length bin edges starting at 1.
+
+    Parameters
+    ----------
+    max_length : int, default=10**7
+        Last edge; longer chains fall in the last bin.
+    bins_per_decade : int, default=10
+        Number of bins per factor of 10 in chain length.
+
+    Returns
+    -------
+    np.ndarray
+        Strictly increasing int64 edges.
+    """
+    n_edges = int(np.ceil(np.log10(max_length) * bins_per_decade)) + 1
+    return np.unique(np.round(np.geomspace(1, max_length, n_edges)).astype(np.int64))
+
+
+class LengthHistogramAccumulator:
+    """
+    Streaming number distribution of chain lengths.
+
+    Bin ``j`` counts the chains with ``edges[j] <= length < edges[j + 1]``; chains
+    longer than the last edge are counted in the last bin.
+
+    Parameters
+    ----------
+    edges : array_like, optional
+        Increasing bin edges. Default: `log_length_edges()`.
+    """
+
+    def __init__(self, edges=None):
+        self.edges = log_length_edges() if edges is None else np.asarray(edges, dtype=np.int64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, chain_lengths, counts=None):
+        """
+        Add a chunk of chains.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain of the chunk.
+        counts : np.ndarray, optional
+            Monomer counts per chain (unused, accepted for a uniform interface).
+        """
+        self.counts += np.bincount(length_bins(self.edges, chain_lengths), minlength=len(self.counts))
+
+    def merge(self, other):
+        """Add the counts of another `LengthHistogramAccumulator` with the same edges."""
+        if not np.array_equal(other.edges, self.edges):
+            raise ValueError("cannot merge histograms with different edges")
+        self.counts += other.counts
+        return self
+
+
+class JointHistogramAccumulator:
+    """
+    Streaming bivariate distribution of chain length x monomer fraction.
+
+    For every monomer, chains are binned on the (usually logarithmic) length
+    edges of `LengthHistogramAccumulator` and on the composition bins of
+    `WHistogramAccumulator`. Both the number of chains and their summed length
+    (the W weight) are kept per cell, as int64, so merging partial histograms
+    (per chunk, per thread or per worker) is exact.
+
+    Parameters
+    ----------
+    length_edges : array_like, optional
+        Increasing chain-length bin edges. Default: `log_length_edges()`.
+    n_bins : int, default=100
+        Number of composition bins over [0, 1].
+    n_monomers : int, default=3
+        Number of monomer types.
+    """
+
+    def __init__(self, length_edges=None, n_bins=100, n_monomers=3):
+        self.length_edges = log_length_edges() if length_edges is None else np.asarray(length_edges,
+                                                                                      dtype=np.int64)
+        self.n_bins = n_bins
+        self.bin_edges = np.linspace(0, 1, n_bins + 1)
+        shape = (n_monomers, len(self.length_edges) - 1, n_bins)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.weights = np.zeros(shape, dtype=np.int64)
+
+    def update(self, chain_lengths, counts):
+        """
+        Add a chunk of chains.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain of the chunk.
+        counts : np.ndarray
+            Monomer counts per chain, shape ``(n_monomers, chunk)``.
+        """
+        n_cells = self.counts[0].size
+        row = length_bins(self.length_edges, chain_lengths) * self.n_bins
+        cells = composition_bins(chain_lengths, counts, self.n_bins) + row
+        for m in range(self.counts.shape[0]):
+            self.counts[m] += np.bincount(cells[m], minlength=n_cells).reshape(self.counts[m].shape)
+            weights = np.bincount(cells[m], weights=chain_lengths, minlength=n_cells)
+            self.weights[m] += np.rint(weights).astype(np.int64).reshape(self.weights[m].shape)
+
+    def merge(self, other):
+        """Add the histograms of another `JointHistogramAccumulator` with the same bins."""
+        if other.n_bins != self.n_bins or not np.array_equal(other.length_edges, self.length_edges):
+            raise ValueError("cannot merge histograms with different bins")
+        self.counts += other.counts
+        self.weights += other.weights
+        return self
+
+    def marginal_w(self):
+        """Length-weighted composition histograms, summed over chain lengths (as in `WHistogramAccumulator`)."""
+        return self.weights.sum(axis=1)
+
+    def marginal_lengths(self):
+        """Number of chains per length bin (as in `LengthHistogramAccumulator`)."""
+        return self.counts[0].sum(axis=1)
+
+    def save(self, path):
+        """
+        Save the non-empty cells to a compressed ``.npz`` file (sparse format).
+
+        Parameters
+        ----------
+        path : str or Path
+            Output file.
+        """
+        cells = np.flatnonzero(self.counts)
+        np.savez_compressed(path, shape=np.array(self.counts.shape), length_edges=self.length_edges,
+                            cells=cells, counts=self.counts.ravel()[cells], weights=self.weights.ravel()[cells])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a histogram saved with `save`.
+
+        Returns
+        -------
+        JointHistogramAccumulator
+        """
+        with np.load(path) as data:
+            n_monomers, _, n_bins = data["shape"]
+            joint = cls(data["length_edges"], n_bins=int(n_bins), n_monomers=int(n_monomers))
+            joint.counts.ravel()[data["cells"]] = data["counts"]
+            joint.weights.ravel()[data["cells"]] = data["weights"]
+        return joint
+
+    def to_frame(self, names=None):
+        """
+        Long table of the non-empty cells.
+
+        Parameters
+        ----------
+        names : sequence of str, optional
+            Monomer labels. Default: "A", "B", "C", ...
+
+        Returns
+        -------
+        pd.DataFrame
+            monomer | length_min | length_max | fraction_min | fraction_max | n_chains | weight
+        """
+        import pandas as pd
+        if names is None:
+            names = [chr(ord("A") + i) for i in range(self.counts.shape[0])]
+        m, j, k = np.nonzero(self.counts)
+        return pd.DataFrame({
+            "monomer": np.asarray(names)[m],
+            "length_min": self.length_edges[j],
+            "length_max": self.length_edges[j + 1],
+            "fraction_min": self.bin_edges[k],
+            "fraction_max": self.bin_edges[k + 1],
+            "n_chains": self.counts[m, j, k],
+            "weight": self.weights[m, j, k],
+        })
+
+
+# Highest power of the chain length kept by `MomentAccumulator`: Mz needs the
+# third, its standard error the sixth.
+LENGTH_MOMENT_ORDER = 6
+
+
+def _neumaier_add(sums, comps, values):
+    """Add `values` to `sums` in place, accumulating the rounding errors in `comps` (Neumaier summation)."""
+    total = sums + values
+    comps += np.where(np.abs(sums) >= np.abs(values), (sums - total) + values, (values - total) + sums)
+    sums[...] = total
+
+
+def _ratio_se(n, mean_x, mean_y, var_x, cov_xy, var_y):
+    """Delta-method standard error of ``mean_x / mean_y`` estimated from `n` samples."""
+    ratio = mean_x / mean_y
+    var = (var_x - 2 * ratio * cov_xy + ratio ** 2 * var_y) / (n * mean_y ** 2)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+class MomentAccumulator:
+    """
+    Streaming moments of the chain-length distribution and of the composition.
+
+    Memory is O(1) in the number of chains. The state holds:
+
+    - the exact int64 count of each monomer (their total is the sum of lengths);
+    - the power sums of the chain lengths up to `LENGTH_MOMENT_ORDER` and, per
+      monomer, the sums of ``count**2`` and ``count * length``, as float64 sums
+      with Neumaier compensation;
+    - the Welford mean and sum of squared deviations of the per-chain fractions.
+
+    Partial accumulators (chunks, threads, workers) merge with the compensated
+    sums and Chan's pairwise update, so the result does not depend on how the
+    ensemble was split beyond the last bits of rounding.
+
+    Parameters
+    ----------
+    n_monomers : int, default=3
+        Number of monomer types.
+    """
+
+    def __init__(self, n_monomers=3):
+        self.n_chains = 0
+        self.count_sums = np.zeros(n_monomers, dtype=np.int64)
+        # Layout: length**1..LENGTH_MOMENT_ORDER, count**2 per monomer, count * length per monomer
+        self.sums = np.zeros(LENGTH_MOMENT_ORDER + 2 * n_monomers)
+        self.comps = np.zeros_like(self.sums)
+        self.fraction_means = np.zeros(n_monomers)
+        self.fraction_m2 = np.zeros(n_monomers)
+
+    def _add(self, n_chains, count_sums, sums, comps, fraction_means, fraction_m2):
+        """Merge a partial state into this one."""
+        if n_chains == 0:
+            return
+        total = self.n_chains + n_chains
+        delta = fraction_means - self.fraction_means
+        self.fraction_m2 += fraction_m2 + delta ** 2 * self.n_chains * (n_chains / total)
+        self.fraction_means += delta * (n_chains / total)
+        self.n_chains = total
+        self.count_sums += count_sums
+        _neumaier_add(self.sums, self.comps, sums)
+        self.comps += comps
+
+    def update(self, chain_lengths, counts):
+        """
+        Add a chunk of chains.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain of the chunk.
+        counts : np.ndarray
+            Monomer counts per chain, shape ``(n_monomers, chunk)``.
+        """
+        if len(chain_lengths) == 0:
+            return
+        lengths = np.asarray(chain_lengths, dtype=np.float64)
+        counts_f = np.asarray(counts, dtype=np.float64)
+        powers = np.cumprod(np.broadcast_to(lengths, (LENGTH_MOMENT_ORDER, len(lengths))), axis=0)
+        sums = np.concatenate([powers.sum(axis=1), (counts_f * counts_f).sum(axis=1),
+                               (counts_f * lengths).sum(axis=1)])
+        fractions = counts_f / lengths
+        means = fractions.mean(axis=1)
+        m2 = ((fractions - means[:, np.newaxis]) ** 2).sum(axis=1)
+        self._add(len(lengths), np.sum(counts, axis=1, dtype=np.int64), sums, np.zeros_like(sums), means, m2)
+
+    def merge(self, other):
+        """Add the moments of another `MomentAccumulator`."""
+        if len(other.count_sums) != len(self.count_sums):
+            raise ValueError("cannot merge moments of different numbers of monomers")
+        self._add(other.n_chains, other.count_sums, other.sums, other.comps, other.fraction_means,
+                  other.fraction_m2)
+        return self
+
+    def _raw_moments(self):
+        """Means of length**1..6, count**2 and count * length."""
+        return (self.sums + self.comps) / self.n_chains
+
+    @property
+    def sum_lengths(self):
+        """Total number of monomer units (exact)."""
+        return int(self.count_sums.sum())
+
+    @property
+    def mn(self):
+        """Number-average chain length."""
+        return self.sum_lengths / self.n_chains
+
+    @property
+    def mw(self):
+        """Weight-average chain length."""
+        moments = self._raw_moments()
+        return moments[1] / moments[0]
+
+    @property
+    def mz(self):
+        """Z-average chain length."""
+        moments = self._raw_moments()
+        return moments[2] / moments[1]
+
+    @property
+    def pdi(self):
+        """Polydispersity index Mw / Mn."""
+        return self.mw / self.mn
+
+    @property
+    def composition(self):
+        """Overall fraction of each monomer in the ensemble (weight average)."""
+        return self.count_sums / self.sum_lengths
+
+    @property
+    def mean_fractions(self):
+        """Number average of the per-chain monomer fractions."""
+        return self.fraction_means.copy()
+
+    def standard_errors(self):
+        """
+        Standard errors of the estimates (delta method for the ratios).
+
+        Returns
+        -------
+        dict
+            ``mn``, ``mw``, ``mz``, ``pdi`` (floats), ``composition`` and
+            ``mean_fractions`` (one value per monomer).
+        """
+        n = self.n_chains
+        n_monomers = len(self.count_sums)
+        moments = self._raw_moments()
+        m1, m2, m3, m4, m5, m6 = moments[:LENGTH_MOMENT_ORDER]
+        var_l1, var_l2, var_l3 = m2 - m1 ** 2, m4 - m2 ** 2, m6 - m3 ** 2
+        cov_12, cov_23 = m3 - m1 * m2, m5 - m2 * m3
+
+        # PDI = m2 / m1**2
+        grad_1, grad_2 = -2 * m2 / m1 ** 3, 1 / m1 ** 2
+        var_pdi = (grad_1 ** 2 * var_l1 + 2 * grad_1 * grad_2 * cov_12 + grad_2 ** 2 * var_l2) / n
+
+        mean_counts = self.count_sums / n
+        counts_sq = moments[LENGTH_MOMENT_ORDER:LENGTH_MOMENT_ORDER + n_monomers]
+        counts_length = moments[LENGTH_MOMENT_ORDER + n_monomers:]
+        var_counts = counts_sq - mean_counts ** 2
+        cov_counts = counts_length - mean_counts * m1
+
+        return {
+            "mn": float(np.sqrt(max(var_l1, 0.0) / n)),
+            "mw": float(_ratio_se(n, m2, m1, var_l2, cov_12, var_l1)),
+            "mz": float(_ratio_se(n, m3, m2, var_l3, cov_23, var_l2)),
+            "pdi": float(np.sqrt(max(var_pdi, 0.0))),
+            "composition": _ratio_se(n, mean_counts, m1, var_counts, cov_counts, var_l1),
+            "mean_fractions": np.sqrt(self.fraction_m2 / max(n - 1, 1) / n),
+        }
+
+    def to_frame(self, names=None):
+        """
+        Table of the estimates and their standard errors.
+
+        Parameters
+        ----------
+        names : sequence of str, optional
+            Monomer labels. Default: "A", "B", "C", ...
+
+        Returns
+        -------
+        pd.DataFrame
+            quantity | value | standard_error
+        """
+        import pandas as pd
+        if names is None:
+            names = [chr(ord("A") + i) for i in range(len(self.count_sums))]
+        errors = self.standard_errors()
+        rows = [("Mn", self.mn, errors["mn"]), ("Mw", self.mw, errors["mw"]), ("Mz", self.mz, errors["mz"]),
+                ("PDI", self.pdi, errors["pdi"])]
+        for m, name in enumerate(names):
+            rows.append((f"composition_{name}", self.composition[m], errors["composition"][m]))
+        for m, name in enumerate(names):
+            rows.append((f"mean_fraction_{name}", self.fraction_means[m], errors["mean_fractions"][m]))
+        return pd.DataFrame(rows, columns=["quantity", "value", "standard_error"])
+
+
+def accumulate(chunks, *accumulators):
+    """
+    Feed every chunk of a chain stream to the given accumulators.
+
+    Parameters
+    ----------
+    chunks : iterable
+        ``(chain_lengths, counts)`` pairs, e.g. from `montecarlo.simulation.iter_chains`.
+    *accumulators
+        Objects with an ``update(chain_lengths, counts)`` method.
+
+    Returns
+    -------
+    tuple
+        The accumulators, updated in place.
+    """
+    for chain_lengths, counts in chunks:
+        for accumulator in accumulators:
+            accumulator.update(chain_lengths, counts)
+    return accumulators
@@ -1,79 +1,363 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from montecarlo.simulation import generate_chains
-from montecarlo.performance import (
-    bubble_sort, bubble_sort_numba,
-    insertion_sort, insertion_sort_numba,
-    selection_sort, selection_sort_numba,
-    tim_sort
+import numba
+from montecarlo.simulation import generate_chains, _block_seeds, BLOCK_SIZE, DEFAULT_MODEL
+from montecarlo.rng import RNG_BUFFER_SIZE, _generate_chain_rng
+from montecarlo.sorting_algorithms import (
+    co_sort, merge_sort_numba, introsort_numba,
+    QUADRATIC_SIZE_LIMIT, select_algorithms
 )
-import time
+from montecarlo.timing import measure, summarize_times
+
+# (generator, uniforms per monomer) of `run_rng_benchmark`; the first is the reference scheme
+RNG_SCHEMES = (("mt19937", 2), ("mt19937", 1), ("counter", 2), ("counter", 1))
+
+STARTUP_SCRIPT = "from montecarlo.simulation import generate_chains; generate_chains(1000, use_numba=True, seed=0)"
 
-def run_scaling_benchmark(n_chains_list, n_repeats=3, use_numba=False, random_seed=42):
+def run_scaling_benchmark(n_chains_list, n_repeats=3, use_numba=False, random_seed=42,
+                          max_quadratic_size=QUADRATIC_SIZE_LIMIT, min_repeats=None, rel_tolerance=0.02,
+                          max_time=30.0):
     """
     Runs benchmarks for increasing number of chains, including generation and sorting
     of freq_A, freq_B, freq_C along with chain_lengths.
     Supports both Python and Numba-accelerated sorting functions.
 
+    Every measurement starts with a warm-up call that is excluded from the
+    statistics; its extra cost (Numba compilation) is reported in its own
+    column. Timed calls then repeat with `time.perf_counter_ns` until the
+    timings are stable (see `montecarlo.timing.measure`).
+
     Parameters
     ----------
     n_chains_list : int
         List of number of chians.
     n_repeats : int
-        Number of repeats.
+        Maximum number of timed repeats.
     use_numba : bool
         Wether use Numba or not.
     random_seed : int
         Set the seed number for the simulation.
+    max_quadratic_size : int, default=QUADRATIC_SIZE_LIMIT
+        O(n^2) algorithms are skipped for sizes above this.
+    min_repeats : int, optional
+        Minimum number of timed repeats before adaptive stopping. Default: ``min(3, n_repeats)``.
+    rel_tolerance : float, default=0.02
+        Stop repeating once the relative standard error of the mean time is below this.
+    max_time : float, default=30.0
+        Time budget in seconds for the timed repeats of each measurement.
 
     Returns
     -------
     DataFrame
-        Information for the chain generation and sorting times.
-        number_of_chains | algorithm | use_numba | generation_time | sorting_time | repeat
+        Information for the chain generation and sorting times, one row per timed sort.
+        number_of_chains | algorithm | use_numba | generation_time | generation_compile_time |
+        sorting_time | sorting_compile_time | repeat
     """
-    np.random.seed(random_seed)
+    import pandas as pd
+    if min_repeats is None:
+        min_repeats = min(3, n_repeats)
+    timing_options = dict(min_repeats=min_repeats, max_repeats=n_repeats, rel_tolerance=rel_tolerance,
+                          max_time=max_time)
     records = []
 
     for n in n_chains_list:
         # --- Chain generation ---
-        start_gen = time.time()
-        chain_lengths, freq_A, freq_B, freq_C = generate_chains(n, use_numba=use_numba)
-        gen_time = time.time() - start_gen
+        generation = measure(lambda: generate_chains(n, use_numba=use_numba, seed=random_seed),
+                             **timing_options)
+        chain_lengths, freq_A, freq_B, freq_C = generation["result"]
+        gen_time = float(np.median(generation["times"]))
 
         # --- Sorting algorithms ---
-        sorting_algos = {
-            'bubble_sort': bubble_sort_numba if use_numba else bubble_sort,
-            'insertion_sort': insertion_sort_numba if use_numba else insertion_sort,
-            'selection_sort': selection_sort_numba if use_numba else selection_sort,
-            'tim_sort': tim_sort  # Tim sort does not support Numba
-        }
-
-        for algo_name, algo_func in sorting_algos.items():
-            for repeat in range(n_repeats):
-                D_copy = chain_lengths.copy()
-                F_A_copy = freq_A.copy()
-                F_B_copy = freq_B.copy()
-                F_C_copy = freq_C.copy()
-
-                start_sort = time.time()
-                algo_func(D_copy, F_A_copy)
-                algo_func(D_copy, F_B_copy)
-                algo_func(D_copy, F_C_copy)
-                sort_time = time.time() - start_sort
+        # One variant per family (Numba when available and requested), no O(n^2) sorts on large n
+        sorting_algos = select_algorithms(use_numba=use_numba, n=n, max_quadratic_size=max_quadratic_size)
+
+        for algo_name, algorithm in sorting_algos.items():
+            def sort_all(pairs, func=algorithm.func):
+                for D_copy, F_copy in pairs:
+                    func(D_copy, F_copy)
 
+            # Each fraction is sorted with its own copy of chain_lengths, so that
+            # the lengths always stay aligned with the fraction being sorted.
+            sorting = measure(
+                sort_all,
+                setup=lambda: ([(chain_lengths.copy(), freq.copy()) for freq in (freq_A, freq_B, freq_C)],),
+                **timing_options
+            )
+
+            for repeat, sort_time in enumerate(sorting["times"]):
                 records.append({
                     'number_of_chains': n,
                     'algorithm': algo_name,
                     'use_numba': use_numba,
                     'generation_time': gen_time,
+                    'generation_compile_time': generation["compile_time"],
                     'sorting_time': sort_time,
+                    'sorting_compile_time': sorting["compile_time"],
                     'repeat': repeat + 1
                 })
 
     return pd.DataFrame(records)
 
+def run_generation_benchmark(n_chains_list, engines=("numba", "skip"), n_repeats=5, random_seed=42,
+                             min_repeats=None, rel_tolerance=0.02, max_time=30.0):
+    """
+    Times the chain generation engines on their own, one row per timed repeat.
+
+    Parameters
+    ----------
+    n_chains_list : list of int
+        Numbers of chains to generate.
+    engines : tuple of str, default=("numba", "skip")
+        Generation engines to time (see `generate_chains`).
+    n_repeats : int
+        Maximum number of timed repeats.
+    random_seed : int
+        Set the seed number for the simulation.
+    min_repeats, rel_tolerance, max_time
+        As in `run_scaling_benchmark`.
+
+    Returns
+    -------
+    DataFrame
+        number_of_chains | algorithm | generation_time | generation_compile_time | repeat
+    """
+    import pandas as pd
+    if min_repeats is None:
+        min_repeats = min(3, n_repeats)
+    records = []
+    for n in n_chains_list:
+        for engine in engines:
+            generation = measure(lambda: generate_chains(n, engine=engine, seed=random_seed),
+                                 min_repeats=min_repeats, max_repeats=n_repeats, rel_tolerance=rel_tolerance,
+                                 max_time=max_time)
+            for repeat, gen_time in enumerate(generation["times"]):
+                records.append({
+                    'number_of_chains': n,
+                    'algorithm': engine,
+                    'generation_time': gen_time,
+                    'generation_compile_time': generation["compile_time"],
+                    'repeat': repeat + 1
+                })
+    return pd.DataFrame(records)
+
+def run_rng_benchmark(n_chains=10**5, n_repeats=5, random_seed=42, model=None, schemes=RNG_SCHEMES):
+    """
+    Times the RNG schemes of `montecarlo.rng` and checks their statistics.
+
+    Each scheme (MT19937 or counter-based uniforms, two uniforms per monomer
+    or one) generates the same number of chains with the same block seeds.
+    Its chain lengths are compared with an independent ensemble of the
+    reference scheme (the first one, i.e. the current "numba" engine) by a
+    two-sample Kolmogorov-Smirnov test, and its mean monomer counts by z-scores.
+
+    Parameters
+    ----------
+    n_chains : int
+        Number of chains per run.
+    n_repeats : int
+        Maximum number of timed repeats.
+    random_seed : int
+        Seed of the timed runs (the reference ensemble uses ``random_seed + 1``).
+    model : KineticModel, optional
+        Kinetic parameters. Default: the A/B/C terpolymer of the reference paper.
+    schemes : sequence of (str, int)
+        ``(generator, uniforms_per_monomer)`` pairs, generator "mt19937" or "counter".
+
+    Returns
+    -------
+    DataFrame
+        generator | uniforms_per_monomer | generation_time | compile_time | chains_per_s |
+        speedup | mn | ks_statistic | ks_pvalue | max_count_z
+    """
+    import pandas as pd
+    from scipy.stats import ks_2samp
+    model = DEFAULT_MODEL if model is None else model
+
+    def generate(generator, uniforms_per_monomer, seed):
+        chain_lengths = np.empty(n_chains, dtype=np.int64)
+        counts = np.empty((model.n_monomers, n_chains), dtype=np.int64)
+        _generate_chain_rng(_block_seeds(n_chains, seed), BLOCK_SIZE, model.propagate_probs,
+                            model.cumulative_transitions, model.start_monomer, generator == "counter",
+                            uniforms_per_monomer == 1, RNG_BUFFER_SIZE, chain_lengths, counts)
+        return chain_lengths, counts
+
+    ref_lengths, ref_counts = generate(*schemes[0], random_seed + 1)
+    ref_means = ref_counts.mean(axis=1)
+    ref_var = ref_counts.var(axis=1) / n_chains
+
+    records = []
+    for generator, uniforms_per_monomer in schemes:
+        timing = measure(lambda: generate(generator, uniforms_per_monomer, random_seed),
+                         min_repeats=min(3, n_repeats), max_repeats=n_repeats)
+        chain_lengths, counts = timing["result"]
+        ks = ks_2samp(chain_lengths, ref_lengths)
+        z = (counts.mean(axis=1) - ref_means) / np.sqrt(counts.var(axis=1) / n_chains + ref_var)
+        generation_time = float(np.median(timing["times"]))
+        records.append({
+            'generator': generator,
+            'uniforms_per_monomer': uniforms_per_monomer,
+            'generation_time': generation_time,
+            'compile_time': timing["compile_time"],
+            'chains_per_s': n_chains / generation_time,
+            'mn': chain_lengths.mean(),
+            'ks_statistic': ks.statistic,
+            'ks_pvalue': ks.pvalue,
+            'max_count_z': float(np.abs(z).max()),
+        })
+    df = pd.DataFrame(records)
+    df['speedup'] = df['generation_time'].iloc[0] / df['generation_time']
+    return df
+
+def summarize_benchmark(df_results, n_fractions=3):
+    """
+    Robust summary of `run_scaling_benchmark` results with derived throughput.
+
+    Parameters
+    ----------
+    df_results : pd.DataFrame
+        Benchmark results, one row per timed sort.
+    n_fractions : int, default=3
+        Number of fraction arrays sorted per repeat (to count sorted elements).
+
+    Returns
+    -------
+    DataFrame
+        number_of_chains | algorithm | use_numba | n_repeats | sorting_time_median |
+        sorting_time_iqr | sorting_time_min | sorting_compile_time | generation_time |
+        generation_compile_time | chains_per_s | elements_sorted_per_s
+    """
+    import pandas as pd
+    rows = []
+    keys = ['number_of_chains', 'algorithm', 'use_numba']
+    for (n, algo_name, use_numba), group in df_results.groupby(keys, sort=False):
+        stats = summarize_times(group['sorting_time'])
+        generation_time = group['generation_time'].iloc[0]
+        rows.append({
+            'number_of_chains': n,
+            'algorithm': algo_name,
+            'use_numba': use_numba,
+            'n_repeats': stats['n_repeats'],
+            'sorting_time_median': stats['median'],
+            'sorting_time_iqr': stats['iqr'],
+            'sorting_time_min': stats['min'],
+            'sorting_compile_time': group['sorting_compile_time'].iloc[0],
+            'generation_time': generation_time,
+            'generation_compile_time': group['generation_compile_time'].iloc[0],
+            'chains_per_s': n / generation_time if generation_time > 0 else np.inf,
+            'elements_sorted_per_s': n_fractions * n / stats['median'] if stats['median'] > 0 else np.inf,
+        })
+    return pd.DataFrame(rows)
+
+def run_thread_scaling_benchmark(n_chains, thread_counts=None, n_repeats=3, random_seed=42):
+    """
+    Measures how the parallel Numba sorts scale with the number of threads,
+    next to NumPy's built-in sorts (which always run on one thread).
+
+    Parameters
+    ----------
+    n_chains : int
+        Number of chains to generate and sort.
+    thread_counts : list of int, optional
+        Numbers of threads to test. Default: powers of two up to
+        ``numba.config.NUMBA_NUM_THREADS``.
+    n_repeats : int
+        Number of repeats.
+    random_seed : int
+        Set the seed number for the simulation.
+
+    Returns
+    -------
+    DataFrame
+        number_of_chains | algorithm | n_threads | sorting_time | sorting_compile_time | repeat
+    """
+    import pandas as pd
+    if thread_counts is None:
+        thread_counts = [2 ** k for k in range(int(np.log2(numba.config.NUMBA_NUM_THREADS)) + 1)]
+    chain_lengths, freq_A, _, _ = generate_chains(n_chains, use_numba=True, seed=random_seed)
+
+    sorting_algos = {
+        'merge_sort': merge_sort_numba,
+        'introsort': introsort_numba,
+        'numpy_stable_argsort': lambda D, F: co_sort(F, D),
+        'numpy_sort': lambda D, F: F.sort(kind='quicksort'),  # keys only, lower bound
+    }
+
+    previous_threads = numba.get_num_threads()
+    records = []
+    try:
+        for n_threads in thread_counts:
+            # Requests above NUMBA_NUM_THREADS are capped; the effective count is recorded
+            n_threads = min(n_threads, numba.config.NUMBA_NUM_THREADS)
+            numba.set_num_threads(n_threads)
+            for algo_name, algo_func in sorting_algos.items():
+                sorting = measure(algo_func, setup=lambda: (chain_lengths.copy(), freq_A.copy()),
+                                  min_repeats=n_repeats, max_repeats=n_repeats)
+                for repeat, sort_time in enumerate(sorting["times"]):
+                    records.append({
+                        'number_of_chains': n_chains,
+                        'algorithm': algo_name,
+                        'n_threads': n_threads,
+                        'sorting_time': sort_time,
+                        'sorting_compile_time': sorting["compile_time"],
+                        'repeat': repeat + 1
+                    })
+    finally:
+        numba.set_num_threads(previous_threads)
+
+    return pd.DataFrame(records)
+
+def run_startup_benchmark(script=STARTUP_SCRIPT, import_script="import montecarlo.simulation", n_repeats=3):
+    """
+    Measures the launch latency of short jobs, each run in a fresh interpreter.
+
+    Three modes are timed per repeat:
+
+    - "import": the interpreter only runs `import_script`,
+    - "cold": `script` runs with an empty Numba cache (every kernel is compiled),
+    - "warm": `script` runs again with the cache filled by the cold run.
+
+    Each repeat uses its own temporary ``NUMBA_CACHE_DIR``, so the user's cache
+    is neither read nor modified.
+
+    Parameters
+    ----------
+    script : str
+        Python code of the job.
+    import_script : str
+        Python code of the import-only launch.
+    n_repeats : int
+        Number of repeats.
+
+    Returns
+    -------
+    DataFrame
+        mode | launch_time | repeat
+    """
+    import pandas as pd
+    project_root = str(Path(__file__).resolve().parent.parent)
+    python_path = os.pathsep.join(filter(None, [project_root, os.environ.get("PYTHONPATH")]))
+
+    records = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for repeat in range(1, n_repeats + 1):
+            env = dict(os.environ, PYTHONPATH=python_path,
+                       NUMBA_CACHE_DIR=os.path.join(tmp_dir, f"cache-{repeat}"))
+            for mode, code in (("import", import_script), ("cold", script), ("warm", script)):
+                start = time.perf_counter_ns()
+                subprocess.run([sys.executable, "-c", code], env=env, cwd=project_root, check=True)
+                records.append({
+                    'mode': mode,
+                    'launch_time': (time.perf_counter_ns() - start) * 1e-9,
+                    'repeat': repeat
+                })
+
+    return pd.DataFrame(records)
+
 def plot_benchmark_results(df_results, save_path=None, metric="sorting_time"):
     '''
     Plots the algorithms' benchmark results.
@@ -90,6 +374,7 @@ def plot_benchmark_results(df_results, save_path=None, metric="sorting_time"):
         - "generation_time" : only chain generation time
         - "total_time" : generation + sorting
     '''
+    import matplotlib.pyplot as plt
     if metric == "total_time":
         df_results = df_results.copy()
         df_results["total_time"] = df_results["generation_time"] + df_results["sorting_time"]
@@ -154,4 +439,4 @@ def save_results_to_csv(df_results, filename='benchmark_results.csv'):
     '''
     df = df_results.copy()
     df['total_time'] = df['generation_time'] + df['sorting_time']
-    df_results.to_csv(filename, index=False)
\ No newline at end of file
+    df.to_csv(filename, index=False)
\ No newline at end of file
@@ -0,0 +1,318 @@
+import json
+import zipfile
+from pathlib import Path
+import numpy as np
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import iter_chains, DEFAULT_CHUNK_SIZE, DEFAULT_MODEL
+from montecarlo.accumulators import WHistogramAccumulator
+from montecarlo.distribution import WDistribution
+from montecarlo.ensemble import ChainEnsemble
+
+ARCHIVE_VERSION = 1
+METADATA_MEMBER = "metadata.json"
+
+# Size of the fixed part of a ZIP local file header, and offsets of its name/extra lengths
+_LOCAL_HEADER_SIZE = 30
+_NAME_LENGTH_OFFSET = 26
+
+
+def _segment_member(index, column):
+    return f"chains/{index:06d}/{column}.npy"
+
+
+def model_metadata(model: KineticModel):
+    """
+    JSON-serializable parameters of a kinetic model (enough to rebuild it).
+
+    Returns
+    -------
+    dict
+        `KineticModel` keyword arguments.
+    """
+    return {
+        "feed": model.feed.tolist(),
+        "reactivity_ratios": model.reactivity_ratios.tolist(),
+        "propagation_factors": model.propagation_factors.tolist(),
+        "termination_factors": model.termination_factors.tolist(),
+        "total_random_events": model.total_random_events,
+        "start_monomer": model.start_monomer,
+        "names": list(model.names),
+    }
+
+
+class ChainArchiveWriter:
+    """
+    Write a chain ensemble and its W distributions into one columnar file.
+
+    The file is a ZIP archive of ``.npy`` members, so ``np.load`` opens it
+    like any ``.npz``: every appended chunk adds a ``lengths`` and a ``counts``
+    column (``chains/<segment>/lengths.npy``, ``chains/<segment>/counts.npy``),
+    the W histograms of all chains are updated as they are appended and
+    written with the metadata (``metadata.json``) on `close`. Uncompressed
+    archives are read back through memory maps by `ChainArchive`; compressed
+    ones are smaller but must be decompressed on read.
+
+    Parameters
+    ----------
+    path : str or Path
+        Output file (overwritten).
+    names : sequence of str, optional
+        Monomer labels. Default: "A", "B", "C".
+    n_bins : int, default=1000
+        Number of W composition bins over [0, 1].
+    dtype : np.dtype, default=np.uint32
+        Storage dtype of the lengths and counts.
+    compress : bool, default=False
+        Deflate the members.
+    metadata : dict, optional
+        Provenance stored with the archive (parameters, seed, engine...). Must
+        be JSON-serializable.
+    """
+
+    def __init__(self, path, names=None, n_bins=1000, dtype=np.uint32, compress=False, metadata=None):
+        self.path = Path(path)
+        self.names = tuple(names) if names is not None else ("A", "B", "C")
+        self.dtype = np.dtype(dtype)
+        self.metadata = dict(metadata or {})
+        self.segment_sizes = []
+        self.w_hist = WHistogramAccumulator(n_bins=n_bins, n_monomers=len(self.names))
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._zip = zipfile.ZipFile(self.path, mode="w", compression=compression, allowZip64=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return sum(self.segment_sizes)
+
+    def _write_array(self, name, array):
+        with self._zip.open(name, mode="w", force_zip64=True) as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+    def append(self, chain_lengths, counts):
+        """
+        Write a chunk of chains as a new segment and add it to the W histograms.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain of the chunk.
+        counts : np.ndarray
+            Number of monomers of each type per chain, shape ``(n_monomers, chunk)``.
+        """
+        if counts.shape[0] != len(self.names):
+            raise ValueError(f"counts must have {len(self.names)} rows")
+        if len(chain_lengths) and int(chain_lengths.max()) > np.iinfo(self.dtype).max:
+            raise OverflowError(f"chain lengths do not fit in {self.dtype}")
+        index = len(self.segment_sizes)
+        self._write_array(_segment_member(index, "lengths"), chain_lengths.astype(self.dtype))
+        self._write_array(_segment_member(index, "counts"), counts.astype(self.dtype))
+        self.w_hist.update(chain_lengths, counts)
+        self.segment_sizes.append(int(len(chain_lengths)))
+
+    def extend(self, chunks):
+        """
+        Append every chunk of a chain stream, one segment per chunk.
+
+        Parameters
+        ----------
+        chunks : iterable
+            ``(chain_lengths, counts)`` pairs, e.g. from `iter_chains`.
+
+        Returns
+        -------
+        ChainArchiveWriter
+            The writer itself.
+        """
+        for chain_lengths, counts in chunks:
+            self.append(chain_lengths, counts)
+        return self
+
+    def close(self):
+        """Write the W histograms and the metadata, and close the file."""
+        if self._zip.fp is None:
+            return
+        self._write_array("w/weights.npy", self.w_hist.weights)
+        self._write_array("w/bin_edges.npy", self.w_hist.bin_edges)
+        metadata = {
+            "version": ARCHIVE_VERSION,
+            "names": list(self.names),
+            "dtype": self.dtype.str,
+            "n_chains": len(self),
+            "segment_sizes": self.segment_sizes,
+            "n_bins": self.w_hist.n_bins,
+            **self.metadata,
+        }
+        self._zip.writestr(METADATA_MEMBER, json.dumps(metadata, indent=1))
+        self._zip.close()
+
+
+class ChainArchive:
+    """
+    Read-only view of a file written by `ChainArchiveWriter`.
+
+    Columns of an uncompressed archive are returned as read-only memory maps
+    of the file (no copy); members of a compressed archive are decompressed
+    into memory.
+
+    Parameters
+    ----------
+    path : str or Path
+        Archive file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with zipfile.ZipFile(self.path) as archive:
+            self.metadata = json.loads(archive.read(METADATA_MEMBER))
+            self._members = {info.filename: info for info in archive.infolist()}
+        self.names = tuple(self.metadata["names"])
+        self.segment_sizes = list(self.metadata["segment_sizes"])
+
+    def __len__(self):
+        return self.metadata["n_chains"]
+
+    def __repr__(self):
+        return (f"ChainArchive({str(self.path)!r}, n_chains={len(self)}, "
+                f"n_segments={len(self.segment_sizes)})")
+
+    @property
+    def n_monomers(self):
+        """Number of monomer types."""
+        return len(self.names)
+
+    @property
+    def mmap(self):
+        """True if the columns are read as memory maps (uncompressed archive)."""
+        return all(info.compress_type == zipfile.ZIP_STORED for info in self._members.values())
+
+    def array(self, name):
+        """
+        One ``.npy`` member of the archive.
+
+        Parameters
+        ----------
+        name : str
+            Member name, e.g. ``"chains/000000/counts.npy"``.
+
+        Returns
+        -------
+        np.ndarray
+            A read-only memory map if the member is stored uncompressed.
+        """
+        info = self._members[name]
+        if info.compress_type != zipfile.ZIP_STORED:
+            with zipfile.ZipFile(self.path) as archive, archive.open(name) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+        with open(self.path, "rb") as f:
+            f.seek(info.header_offset + _NAME_LENGTH_OFFSET)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + _LOCAL_HEADER_SIZE + int(name_length) + int(extra_length))
+            read_header = {(1, 0): np.lib.format.read_array_header_1_0,
+                           (2, 0): np.lib.format.read_array_header_2_0}[np.lib.format.read_magic(f)]
+            shape, fortran_order, dtype = read_header(f)
+            offset = f.tell()
+        if not np.prod(shape, dtype=np.int64):
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                         order="F" if fortran_order else "C")
+
+    def segments(self):
+        """
+        Yield ``(chain_lengths, counts)`` per segment, for the accumulators of
+        `montecarlo.accumulators` (e.g. with `accumulate`).
+        """
+        for index in range(len(self.segment_sizes)):
+            yield self.array(_segment_member(index, "lengths")), self.array(_segment_member(index, "counts"))
+
+    def read(self, start, stop):
+        """
+        Lengths and counts of the chains ``start:stop`` (copied into memory).
+
+        Returns
+        -------
+        chain_lengths : np.ndarray
+            Shape ``(stop - start,)``.
+        counts : np.ndarray
+            Shape ``(n_monomers, stop - start)``.
+        """
+        dtype = np.dtype(self.metadata["dtype"])
+        n = max(stop - start, 0)
+        chain_lengths = np.empty(n, dtype=dtype)
+        counts = np.empty((self.n_monomers, n), dtype=dtype)
+        offset = 0
+        for index, size in enumerate(self.segment_sizes):
+            lo, hi = max(start - offset, 0), min(stop - offset, size)
+            if lo < hi:
+                chain_lengths[offset + lo - start:offset + hi - start] = \
+                    self.array(_segment_member(index, "lengths"))[lo:hi]
+                counts[:, offset + lo - start:offset + hi - start] = \
+                    self.array(_segment_member(index, "counts"))[:, lo:hi]
+            offset += size
+            if offset >= stop:
+                break
+        return chain_lengths, counts
+
+    def model(self):
+        """The `KineticModel` recorded in the metadata (None if absent)."""
+        parameters = self.metadata.get("model")
+        return None if parameters is None else KineticModel(**parameters)
+
+    def w_distribution(self):
+        """W distributions of all chains of the archive."""
+        return WDistribution(self.array("w/weights.npy"), self.names)
+
+    def to_ensemble(self):
+        """Load all chains into an in-memory `ChainEnsemble`."""
+        return ChainEnsemble(self.read(0, len(self))[1], names=self.names)
+
+
+def write_archive(path, num_chains: int, chunk_size: int = DEFAULT_CHUNK_SIZE, n_bins: int = 1000,
+                  use_numba: bool = True, n_threads: int = None, seed: int = None, engine: str = None,
+                  model: KineticModel = None, dtype=np.uint32, compress: bool = False):
+    """
+    Generate chains chunk by chunk straight into a `ChainArchiveWriter` file.
+
+    Memory is bounded by `chunk_size`; for a given seed the archive holds the
+    same chains as `generate_chains`. The metadata records the model
+    parameters, the seed (drawn here if None, so that the run can be
+    repeated), the engine, the chain count and the git commit.
+
+    Parameters
+    ----------
+    path : str or Path
+        Output file.
+    num_chains : int
+        Number of chains to generate.
+    chunk_size : int, default=DEFAULT_CHUNK_SIZE
+        Chains per chunk and per segment.
+    n_bins : int, default=1000
+        Number of W composition bins over [0, 1].
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains` (here `use_numba` defaults to True).
+    dtype : np.dtype, default=np.uint32
+        Storage dtype of the lengths and counts.
+    compress : bool, default=False
+        Deflate the members (smaller file, no memory mapping on read).
+
+    Returns
+    -------
+    ChainArchive
+    """
+    from montecarlo.baseline import _git_commit
+    model = DEFAULT_MODEL if model is None else model
+    if seed is None:
+        # 32-bit, so that the recorded seed also seeds the Python engine's RandomState
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    if engine is None:
+        engine = "numba" if use_numba else "python"
+    metadata = {"model": model_metadata(model), "seed": seed, "engine": engine, "chunk_size": chunk_size,
+                "git_commit": _git_commit()}
+    with ChainArchiveWriter(path, names=model.names, n_bins=n_bins, dtype=dtype, compress=compress,
+                            metadata=metadata) as writer:
+        writer.extend(iter_chains(num_chains, chunk_size=chunk_size, n_threads=n_threads, seed=seed,
+                                  engine=engine, model=model))
+    return ChainArchive(path)
@@ -0,0 +1,237 @@
+import argparse
+import hashlib
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import numba
+
+DEFAULT_STORE = "results/benchmarks"
+
+FINGERPRINT_COLUMNS = [
+    "machine_key", "git_commit", "cpu_model", "n_cores",
+    "numpy_version", "numba_version", "python_version", "timestamp",
+]
+
+def _git_commit():
+    '''Short hash of the current git commit, or "unknown" outside a git checkout.'''
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], cwd=Path(__file__).resolve().parent,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _cpu_model():
+    '''CPU model name from /proc/cpuinfo (Linux) or the platform module.'''
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine() or "unknown"
+
+def machine_fingerprint():
+    '''
+    Describes the code version and machine a benchmark runs on.
+
+    Returns
+    -------
+    dict
+        git_commit, cpu_model, n_cores, numpy_version, numba_version,
+        python_version, timestamp and ``machine_key``, a short hash of the fields
+        that affect performance (CPU model, core count, NumPy and Numba versions).
+    '''
+    fingerprint = {
+        "git_commit": _git_commit(),
+        "cpu_model": _cpu_model(),
+        "n_cores": os.cpu_count(),
+        "numpy_version": np.__version__,
+        "numba_version": numba.__version__,
+        "python_version": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+    }
+    machine = "|".join(str(fingerprint[k]) for k in ("cpu_model", "n_cores", "numpy_version", "numba_version"))
+    fingerprint["machine_key"] = hashlib.sha1(machine.encode()).hexdigest()[:12]
+    return fingerprint
+
+def save_run(df_results, store_dir=DEFAULT_STORE, fingerprint=None):
+    '''
+    Saves a benchmark run in the results store, stamped with its fingerprint.
+
+    Runs are written to ``<store_dir>/<machine_key>/<git_commit>-<timestamp>.csv``
+    with the fingerprint fields repeated as columns.
+
+    Parameters
+    ----------
+    df_results : pd.DataFrame
+        Benchmark results, one row per timed repeat.
+    store_dir : str, default=DEFAULT_STORE
+        Root of the results store.
+    fingerprint : dict, optional
+        Default: `machine_fingerprint()`.
+
+    Returns
+    -------
+    Path
+        Path of the saved file.
+    '''
+    if fingerprint is None:
+        fingerprint = machine_fingerprint()
+    df = df_results.copy()
+    for col in FINGERPRINT_COLUMNS:
+        df[col] = fingerprint[col]
+
+    path = Path(store_dir) / fingerprint["machine_key"] / f"{fingerprint['git_commit']}-{fingerprint['timestamp']}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False)
+    return path
+
+def _same_run(stored, run):
+    '''True if a stored run holds the same measurements as `run` (on their shared columns).'''
+    columns = [col for col in run.columns if col in stored.columns and col not in FINGERPRINT_COLUMNS]
+    if not columns or len(stored) != len(run):
+        return False
+    for col in columns:
+        a, b = stored[col].to_numpy(), run[col].to_numpy()
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+            if not np.allclose(a, b, rtol=1e-12, atol=0, equal_nan=True):
+                return False
+        elif not (a.astype(str) == b.astype(str)).all():
+            return False
+    return True
+
+def load_baseline(store_dir=DEFAULT_STORE, machine_key=None, git_commit=None, exclude=None):
+    '''
+    Loads a stored run of the same machine, the latest one unless a commit is given.
+
+    Parameters
+    ----------
+    store_dir : str, default=DEFAULT_STORE
+        Root of the results store.
+    machine_key : str, optional
+        Default: the key of the current machine.
+    git_commit : str, optional
+        Commit of the baseline run (its latest run is used).
+    exclude : pd.DataFrame, optional
+        The run being compared. Stored runs with the same measurements (i.e.
+        this run, already saved by `save_run`) are skipped, so a run is never
+        its own baseline.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        The stored run, or None if there is none.
+    '''
+    if machine_key is None:
+        machine_key = machine_fingerprint()["machine_key"]
+    pattern = f"{git_commit}-*.csv" if git_commit else "*.csv"
+    runs = sorted((Path(store_dir) / machine_key).glob(pattern), key=lambda p: p.stem.rsplit("-", 1)[-1])
+    for path in reversed(runs):
+        stored = pd.read_csv(path, dtype={"machine_key": str, "git_commit": str})
+        if exclude is None or not _same_run(stored, exclude):
+            return stored
+    return None
+
+def compare_runs(current, baseline, metric="sorting_time", keys=("number_of_chains", "algorithm"),
+                 alpha=0.05, threshold=0.05):
+    '''
+    Compares a benchmark run with a baseline, group by group.
+
+    A group is flagged as a regression when its throughput dropped by more than
+    `threshold` (relative change of the median time) and a one-sided
+    Mann-Whitney U test finds the current times significantly larger
+    (p <= `alpha`; needs at least 3 repeats on each side).
+
+    Parameters
+    ----------
+    current, baseline : pd.DataFrame
+        Benchmark runs, one row per timed repeat.
+    metric : str, default="sorting_time"
+        Timing column to compare.
+    keys : tuple of str, default=("number_of_chains", "algorithm")
+        Columns identifying a group (algorithm and size).
+    alpha : float, default=0.05
+        Significance level.
+    threshold : float, default=0.05
+        Minimum relative throughput drop to flag.
+
+    Returns
+    -------
+    DataFrame
+        keys | baseline_median | current_median | throughput_change | p_value | regression
+    '''
+    from scipy.stats import mannwhitneyu
+    keys = list(keys)
+    baseline_groups = dict(tuple(baseline.groupby(keys)))
+    rows = []
+    for key, group in current.groupby(keys):
+        if key not in baseline_groups:
+            continue
+        current_times = group[metric].to_numpy()
+        baseline_times = baseline_groups[key][metric].to_numpy()
+        current_median = float(np.median(current_times))
+        baseline_median = float(np.median(baseline_times))
+        throughput_change = baseline_median / current_median - 1 if current_median > 0 else 0.0
+        if np.all(current_times == current_times[0]) and np.all(baseline_times == current_times[0]):
+            p_value = 1.0
+        else:
+            p_value = float(mannwhitneyu(current_times, baseline_times, alternative="greater").pvalue)
+
+        row = dict(zip(keys, key))
+        row.update({
+            "baseline_median": baseline_median,
+            "current_median": current_median,
+            "throughput_change": throughput_change,
+            "p_value": p_value,
+            "regression": bool(p_value <= alpha and throughput_change < -threshold),
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def main(argv=None):
+    '''
+    Command line interface.
+
+    ``python -m montecarlo.baseline save RUN.csv`` stores a run;
+    ``python -m montecarlo.baseline compare RUN.csv`` compares it with the latest
+    stored run of this machine (or ``--commit``), other than RUN itself, and
+    exits with status 1 when a regression is flagged.
+    '''
+    parser = argparse.ArgumentParser(prog="python -m montecarlo.baseline")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="results store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = subparsers.add_parser("save", help="store a benchmark run")
+    save_parser.add_argument("run", help="benchmark CSV (one row per repeat)")
+
+    compare_parser = subparsers.add_parser("compare", help="compare a run with a stored baseline")
+    compare_parser.add_argument("run", help="benchmark CSV (one row per repeat)")
+    compare_parser.add_argument("--commit", default=None, help="git commit of the baseline")
+    compare_parser.add_argument("--metric", default="sorting_time")
+    compare_parser.add_argument("--alpha", type=float, default=0.05)
+    compare_parser.add_argument("--threshold", type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+    run = pd.read_csv(args.run)
+
+    if args.command == "save":
+        print(save_run(run, args.store))
+        return 0
+
+    baseline = load_baseline(args.store, git_commit=args.commit, exclude=run)
+    if baseline is None:
+        print("No baseline stored for this machine.")
+        return 0
+    result = compare_runs(run, baseline, metric=args.metric, alpha=args.alpha, threshold=args.threshold)
+    print(result.to_string(index=False))
+    return 1 if result["regression"].any() else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
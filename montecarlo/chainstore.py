@@ -0,0 +1,288 @@
+import json
+import shutil
+from pathlib import Path
+import numpy as np
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import iter_chains, DEFAULT_CHUNK_SIZE, DEFAULT_MODEL
+from montecarlo.sorting_algorithms import co_sort, sort
+from montecarlo.ensemble import ChainEnsemble
+
+METADATA_FILE = "store.json"
+
+class ChainStore:
+    """
+    Appendable on-disk chain ensemble made of ``.npy`` count segments.
+
+    Each segment holds the per-monomer counts of a block of chains, shape
+    ``(n_monomers, n_chains)``; a small JSON file lists the segments, the
+    monomer names and the count dtype. Segments are read back as read-only
+    memory maps, so chain lengths, fractions and histograms are computed one
+    segment at a time and the ensemble can be far larger than RAM.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Store directory. An existing store is opened; otherwise a new one is created.
+    names : sequence of str, optional
+        Monomer labels of a new store. Default: "A", "B", "C".
+    dtype : np.dtype, default=np.uint32
+        Count dtype of a new store.
+    """
+
+    def __init__(self, directory, names=None, dtype=np.uint32):
+        self.directory = Path(directory)
+        metadata_path = self.directory / METADATA_FILE
+        if metadata_path.exists():
+            metadata = json.loads(metadata_path.read_text())
+            self.names = tuple(metadata["names"])
+            self.dtype = np.dtype(metadata["dtype"])
+            self.segment_sizes = list(metadata["segment_sizes"])
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.names = tuple(names) if names is not None else ("A", "B", "C")
+            self.dtype = np.dtype(dtype)
+            self.segment_sizes = []
+            self._write_metadata()
+
+    def _write_metadata(self):
+        metadata = {"names": list(self.names), "dtype": self.dtype.str, "segment_sizes": self.segment_sizes}
+        (self.directory / METADATA_FILE).write_text(json.dumps(metadata))
+
+    def _segment_path(self, index):
+        return self.directory / f"segment-{index:06d}.npy"
+
+    def __len__(self):
+        return sum(self.segment_sizes)
+
+    def __repr__(self):
+        return (f"ChainStore({str(self.directory)!r}, n_chains={len(self)}, "
+                f"n_segments={len(self.segment_sizes)}, dtype={self.dtype})")
+
+    @property
+    def n_monomers(self):
+        """Number of monomer types."""
+        return len(self.names)
+
+    def append(self, counts):
+        """
+        Write a block of chains as a new segment.
+
+        Parameters
+        ----------
+        counts : np.ndarray
+            Number of monomers of each type per chain, shape ``(n_monomers, n_chains)``.
+        """
+        if counts.shape[0] != self.n_monomers:
+            raise ValueError(f"counts must have {self.n_monomers} rows")
+        if counts.size and int(counts.max()) > np.iinfo(self.dtype).max:
+            raise OverflowError(f"counts do not fit in {self.dtype}")
+        segment = np.lib.format.open_memmap(self._segment_path(len(self.segment_sizes)), mode="w+",
+                                            dtype=self.dtype, shape=counts.shape)
+        segment[...] = counts
+        segment.flush()
+        del segment
+        self.segment_sizes.append(int(counts.shape[1]))
+        self._write_metadata()
+
+    def extend(self, chunks):
+        """
+        Append every chunk of a chain stream, one segment per chunk.
+
+        Parameters
+        ----------
+        chunks : iterable
+            ``(chain_lengths, counts)`` pairs, e.g. from `iter_chains`.
+
+        Returns
+        -------
+        ChainStore
+            The store itself.
+        """
+        for _, counts in chunks:
+            self.append(counts)
+        return self
+
+    def segments(self):
+        """
+        Yield the count segments as read-only memory maps (no copy).
+
+        Yields
+        ------
+        np.memmap
+            Counts of one segment, shape ``(n_monomers, segment_size)``.
+        """
+        for index in range(len(self.segment_sizes)):
+            yield np.load(self._segment_path(index), mmap_mode="r")
+
+    def chunks(self):
+        """
+        Yield ``(chain_lengths, counts)`` per segment, for the accumulators of
+        `montecarlo.accumulators` (e.g. with `accumulate`).
+        """
+        for counts in self.segments():
+            yield counts.sum(axis=0, dtype=np.int64), counts
+
+    def read(self, start, stop):
+        """
+        Counts of the chains ``start:stop`` (copied into memory).
+
+        Returns
+        -------
+        np.ndarray
+            Shape ``(n_monomers, stop - start)``.
+        """
+        out = np.empty((self.n_monomers, max(stop - start, 0)), dtype=self.dtype)
+        offset = 0
+        for index, size in enumerate(self.segment_sizes):
+            lo, hi = max(start - offset, 0), min(stop - offset, size)
+            if lo < hi:
+                segment = np.load(self._segment_path(index), mmap_mode="r")
+                out[:, offset + lo - start:offset + hi - start] = segment[:, lo:hi]
+            offset += size
+            if offset >= stop:
+                break
+        return out
+
+    def to_ensemble(self):
+        """Load the whole store into an in-memory `ChainEnsemble`."""
+        return ChainEnsemble(self.read(0, len(self)), names=self.names)
+
+    def clear(self):
+        """Delete every segment."""
+        for index in range(len(self.segment_sizes)):
+            self._segment_path(index).unlink()
+        self.segment_sizes = []
+        self._write_metadata()
+
+
+def generate_store(directory, num_chains: int, chunk_size: int = DEFAULT_CHUNK_SIZE, use_numba: bool = True,
+                   n_threads: int = None, seed: int = None, engine: str = None, model: KineticModel = None,
+                   dtype=np.uint32):
+    """
+    Generate chains chunk by chunk into a new `ChainStore`.
+
+    Memory is bounded by `chunk_size`; for a given seed the store holds the
+    same chains as `generate_chains`.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Store directory (must not hold a store yet).
+    num_chains : int
+        Number of chains to generate.
+    chunk_size : int, default=DEFAULT_CHUNK_SIZE
+        Chains per chunk and per segment.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains` (here `use_numba` defaults to True).
+    dtype : np.dtype, default=np.uint32
+        Count dtype of the store.
+
+    Returns
+    -------
+    ChainStore
+    """
+    if (Path(directory) / METADATA_FILE).exists():
+        raise FileExistsError(f"{directory} already holds a chain store")
+    model = DEFAULT_MODEL if model is None else model
+    store = ChainStore(directory, names=model.names, dtype=dtype)
+    return store.extend(iter_chains(num_chains, chunk_size=chunk_size, use_numba=use_numba,
+                                    n_threads=n_threads, seed=seed, engine=engine, model=model))
+
+
+def _sort_key(counts, row):
+    """Fraction of monomer `row` in each chain of a count block."""
+    return np.divide(counts[row], counts.sum(axis=0, dtype=np.int64))
+
+
+def external_sort(store: ChainStore, out_directory, by=0, run_size: int = DEFAULT_CHUNK_SIZE,
+                  buffer_size: int = None, algorithm: str = "auto"):
+    """
+    Out-of-core sort of a chain store by the fraction of one monomer.
+
+    Run phase: blocks of `run_size` chains are read, sorted in memory with a
+    registered algorithm of `montecarlo.sorting_algorithms` and written as
+    sorted runs. Merge phase: the runs are merged through one buffer of
+    `buffer_size` chains per run. At each step every buffered chain whose key
+    does not exceed the smallest last key of the partially read runs is
+    emitted, so at least one buffer is drained and refilled. Memory is bounded
+    by ``run_size`` chains in the first phase and ``n_runs * buffer_size``
+    chains in the second.
+
+    Parameters
+    ----------
+    store : ChainStore
+        Store to sort (left unchanged).
+    out_directory : str or Path
+        Directory of the sorted store (must not hold a store yet). Temporary
+        runs are written to its ``runs`` subdirectory and removed at the end.
+    by : int or str, default=0
+        Monomer index or name to sort by.
+    run_size : int, default=DEFAULT_CHUNK_SIZE
+        Chains per in-memory run.
+    buffer_size : int, optional
+        Chains buffered per run during the merge. Default: ``run_size // n_runs``
+        (at least 1024), so the merge uses about as much memory as one run.
+        The merged chains are written in segments of about `run_size` chains.
+    algorithm : str, default="auto"
+        In-memory algorithm for the runs (see `sort`).
+
+    Returns
+    -------
+    ChainStore
+        The sorted store.
+    """
+    out_directory = Path(out_directory)
+    if (out_directory / METADATA_FILE).exists():
+        raise FileExistsError(f"{out_directory} already holds a chain store")
+    row = store.names.index(by) if isinstance(by, str) else int(by)
+    out = ChainStore(out_directory, names=store.names, dtype=store.dtype)
+    runs = ChainStore(out_directory / "runs", names=store.names, dtype=store.dtype)
+
+    # Run phase
+    n_chains = len(store)
+    for start in range(0, n_chains, run_size):
+        counts = store.read(start, min(start + run_size, n_chains))
+        order = np.asarray(sort(np.arange(counts.shape[1]), _sort_key(counts, row), algorithm=algorithm)[0])
+        runs.append(counts[:, order])
+
+    # Merge phase
+    n_runs = len(runs.segment_sizes)
+    if buffer_size is None:
+        buffer_size = max(run_size // max(n_runs, 1), 1024)
+    run_maps = list(runs.segments())
+    positions = [0] * n_runs
+    buffers = [np.empty((store.n_monomers, 0), dtype=store.dtype) for _ in range(n_runs)]
+    keys = [np.empty(0) for _ in range(n_runs)]
+    pending_out = []
+
+    while True:
+        for i in range(n_runs):
+            if len(keys[i]) == 0 and positions[i] < runs.segment_sizes[i]:
+                stop = min(positions[i] + buffer_size, runs.segment_sizes[i])
+                buffers[i] = np.array(run_maps[i][:, positions[i]:stop])
+                keys[i] = _sort_key(buffers[i], row)
+                positions[i] = stop
+        if not any(len(k) for k in keys):
+            break
+
+        # Chains up to the smallest last key of the runs still on disk can be emitted
+        pending = [keys[i][-1] for i in range(n_runs) if len(keys[i]) and positions[i] < runs.segment_sizes[i]]
+        threshold = min(pending) if pending else np.inf
+        takes = [np.searchsorted(k, threshold, side="right") for k in keys]
+
+        merged_counts = np.concatenate([b[:, :t] for b, t in zip(buffers, takes)], axis=1)
+        merged_keys = np.concatenate([k[:t] for k, t in zip(keys, takes)])
+        co_sort(merged_keys, *merged_counts)
+        pending_out.append(merged_counts)
+        if sum(c.shape[1] for c in pending_out) >= run_size:
+            out.append(np.concatenate(pending_out, axis=1))
+            pending_out = []
+
+        buffers = [b[:, t:] for b, t in zip(buffers, takes)]
+        keys = [k[t:] for k, t in zip(keys, takes)]
+
+    if pending_out:
+        out.append(np.concatenate(pending_out, axis=1))
+    del run_maps
+    shutil.rmtree(runs.directory)
+    return out
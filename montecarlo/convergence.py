@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+import numpy as np
+from montecarlo.kinetics import KineticModel
+from montecarlo.accumulators import WHistogramAccumulator, MomentAccumulator
+from montecarlo.simulation import iter_chains, BLOCK_SIZE, DEFAULT_MODEL
+
+METRICS = ("L1", "KS", "Hellinger", "moments")
+
+def _probabilities(weights):
+    """Normalize each row of a histogram to probability masses (zero rows stay zero)."""
+    totals = weights.sum(axis=1, keepdims=True)
+    return weights / np.where(totals > 0, totals, 1.0)
+
+
+def distribution_distance(p_weights, q_weights, metric="L1"):
+    """
+    Distance between two sets of W histograms with the same bins.
+
+    Each row (monomer) is normalized to probability masses and the largest
+    distance over the monomers is returned.
+
+    Parameters
+    ----------
+    p_weights, q_weights : np.ndarray
+        Histogram weights, shape ``(n_monomers, n_bins)``.
+    metric : {"L1", "KS", "Hellinger"}, default="L1"
+        "L1": sum of absolute differences (0 to 2),
+        "KS": largest difference of the cumulative distributions (0 to 1),
+        "Hellinger": Hellinger distance (0 to 1).
+
+    Returns
+    -------
+    float
+    """
+    p = _probabilities(np.atleast_2d(p_weights))
+    q = _probabilities(np.atleast_2d(q_weights))
+    if metric == "L1":
+        distances = np.abs(p - q).sum(axis=1)
+    elif metric == "KS":
+        distances = np.abs(np.cumsum(p, axis=1) - np.cumsum(q, axis=1)).max(axis=1)
+    elif metric == "Hellinger":
+        distances = np.sqrt(0.5 * ((np.sqrt(p) - np.sqrt(q)) ** 2).sum(axis=1))
+    else:
+        raise ValueError(f"metric must be one of {list(METRICS[:3])}")
+    return float(distances.max())
+
+
+@dataclass
+class ConvergenceResult:
+    """
+    Outcome of `simulate_until_converged`.
+
+    Attributes
+    ----------
+    converged : bool
+        True if the tolerance was met before `max_chains`.
+    n_chains : int
+        Number of chains generated.
+    w_hist : WHistogramAccumulator
+        W histograms of the whole ensemble.
+    averages : MomentAccumulator
+        Mn, Mw, Mz, PDI and composition of the whole ensemble, with standard errors.
+    trace : list of dict
+        One entry per batch: ``n_chains``, ``distance`` (change from the previous
+        batch, NaN for the first one), ``mn`` and ``mw``. ``pd.DataFrame(trace)``
+        gives a table.
+    """
+    converged: bool
+    n_chains: int
+    w_hist: WHistogramAccumulator
+    averages: MomentAccumulator
+    trace: list = field(default_factory=list)
+
+
+def simulate_until_converged(tolerance=1e-3, metric="L1", batch=4 * BLOCK_SIZE, max_chains=10**7, n_bins=100,
+                             patience=2, use_numba=True, n_threads=None, seed=None, engine=None,
+                             model: KineticModel = None):
+    """
+    Generate chains in batches until the W distributions stop changing.
+
+    After each batch the W histograms of every monomer and the Mn/Mw averages
+    are updated and compared with their values after the previous batch.
+    Generation stops once the change stays below `tolerance` for `patience`
+    consecutive batches, or when `max_chains` chains have been generated.
+
+    Parameters
+    ----------
+    tolerance : float, default=1e-3
+        Largest accepted change between successive batches.
+    metric : {"L1", "KS", "Hellinger", "moments"}, default="L1"
+        Distance between successive W distributions (see `distribution_distance`),
+        or "moments" for the largest relative change of Mn and Mw.
+    batch : int, default=4 * BLOCK_SIZE
+        Chains per batch. Must be a multiple of `BLOCK_SIZE` for the Numba engines.
+    max_chains : int, default=10**7
+        Upper bound on the number of chains.
+    n_bins : int, default=100
+        Number of composition bins over [0, 1]. Finer bins need more chains to
+        converge for the same tolerance.
+    patience : int, default=2
+        Number of consecutive batches that must meet the tolerance.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains` (here `use_numba` defaults to True).
+
+    Returns
+    -------
+    ConvergenceResult
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {list(METRICS)}")
+    if model is None:
+        model = DEFAULT_MODEL
+
+    w_hist = WHistogramAccumulator(n_bins=n_bins, n_monomers=model.n_monomers)
+    averages = MomentAccumulator(n_monomers=model.n_monomers)
+    trace = []
+    previous_weights = previous_moments = None
+    streak = 0
+
+    for chain_lengths, counts in iter_chains(max_chains, chunk_size=batch, use_numba=use_numba,
+                                             n_threads=n_threads, seed=seed, engine=engine, model=model):
+        w_hist.update(chain_lengths, counts)
+        averages.update(chain_lengths, counts)
+        moments = np.array([averages.mn, averages.mw])
+
+        distance = np.nan
+        if previous_weights is not None:
+            if metric == "moments":
+                distance = float(np.max(np.abs(moments - previous_moments) / previous_moments))
+            else:
+                distance = distribution_distance(w_hist.weights, previous_weights, metric)
+        trace.append({"n_chains": averages.n_chains, "distance": distance, "mn": moments[0], "mw": moments[1]})
+
+        streak = streak + 1 if distance <= tolerance else 0
+        if streak >= patience:
+            return ConvergenceResult(True, averages.n_chains, w_hist, averages, trace)
+        previous_weights = w_hist.weights.copy()
+        previous_moments = moments
+
+    return ConvergenceResult(False, averages.n_chains, w_hist, averages, trace)
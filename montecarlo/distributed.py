@@ -0,0 +1,286 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+import numba
+from montecarlo.kinetics import KineticModel
+from montecarlo.accumulators import WHistogramAccumulator, LengthHistogramAccumulator
+from montecarlo.simulation import (
+    BLOCK_SIZE, KERNEL_ENGINES, _block_seeds, _histogram_chains_kernel, _numba_threads, _run_engine
+)
+
+# Number of tasks submitted per worker, so that faster workers pick up more blocks.
+TASKS_PER_WORKER = 4
+
+def _shard_seeds(num_chains: int, engine: str, seed=None):
+    """
+    One random stream per block of `BLOCK_SIZE` chains.
+
+    The Numba engines use the same uint32 block seeds as the in-process run, so
+    the ensemble does not depend on the number of workers. The Python engine
+    gets one `SeedSequence.spawn` child per block.
+    """
+    if engine == "python":
+        return np.random.SeedSequence(seed).spawn(-(-num_chains // BLOCK_SIZE))
+    return _block_seeds(num_chains, seed)
+
+
+def _tasks(num_chains: int, n_tasks: int):
+    """
+    Split the blocks into at most `n_tasks` contiguous ranges.
+
+    Returns
+    -------
+    list of (int, int)
+        ``(first_block, stop_block)`` of each task.
+    """
+    n_blocks = -(-num_chains // BLOCK_SIZE)
+    bounds = np.linspace(0, n_blocks, min(max(n_tasks, 1), max(n_blocks, 1)) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _fill_shard(engine: str, model: KineticModel, shard_seeds, n_threads, chain_lengths, counts):
+    """
+    Fill the output arrays of one shard, one random stream per block.
+
+    Parameters
+    ----------
+    engine : str
+        Generation engine.
+    model : KineticModel
+        Kinetic parameters of the polymerization.
+    shard_seeds : sequence
+        Random stream of each block of the shard (see `_shard_seeds`).
+    n_threads : int or None
+        Number of Numba threads of this worker.
+    chain_lengths, counts : np.ndarray
+        Output arrays of the shard.
+    """
+    if engine == "python":
+        for b, child in enumerate(shard_seeds):
+            block = slice(b * BLOCK_SIZE, (b + 1) * BLOCK_SIZE)
+            rng = np.random.RandomState(np.random.MT19937(child))
+            _run_engine(engine, model, chain_lengths[block], counts[:, block], rng=rng)
+    else:
+        with _numba_threads(n_threads):
+            _run_engine(engine, model, chain_lengths, counts, block_seeds=shard_seeds)
+
+
+def _generate_shard(engine: str, model: KineticModel, num_chains: int, first_block: int, shard_seeds,
+                    n_threads: int = None, buffers=None):
+    """
+    Generate the chains of the blocks starting at `first_block` (worker side).
+
+    Parameters
+    ----------
+    engine, model, shard_seeds, n_threads
+        As in `_fill_shard`.
+    num_chains : int
+        Total number of chains of the ensemble.
+    first_block : int
+        Index of the first block of the shard.
+    buffers : tuple of str, optional
+        Names of the shared-memory blocks holding the full ``chain_lengths`` and
+        ``counts`` arrays, written in place. If None, the shard is returned instead.
+
+    Returns
+    -------
+    tuple of np.ndarray or None
+        ``(chain_lengths, counts)`` of the shard when `buffers` is None.
+    """
+    start = first_block * BLOCK_SIZE
+    stop = min(start + len(shard_seeds) * BLOCK_SIZE, num_chains)
+
+    if buffers is None:
+        chain_lengths = np.empty(stop - start, dtype=np.int64)
+        counts = np.empty((model.n_monomers, stop - start), dtype=np.int64)
+        _fill_shard(engine, model, shard_seeds, n_threads, chain_lengths, counts)
+        return chain_lengths, counts
+
+    segments = [shared_memory.SharedMemory(name=name) for name in buffers]
+    try:
+        chain_lengths = np.ndarray(num_chains, dtype=np.int64, buffer=segments[0].buf)
+        counts = np.ndarray((model.n_monomers, num_chains), dtype=np.int64, buffer=segments[1].buf)
+        _fill_shard(engine, model, shard_seeds, n_threads, chain_lengths[start:stop], counts[:, start:stop])
+        del chain_lengths, counts  # release the exported buffers before closing
+    finally:
+        for segment in segments:
+            segment.close()
+    return None
+
+
+def _histogram_shard(engine: str, model: KineticModel, num_chains: int, first_block: int, shard_seeds,
+                     n_threads, n_bins: int, length_edges):
+    """
+    Partial W and chain-length histograms of the blocks starting at `first_block` (worker side).
+
+    Returns
+    -------
+    w_hist : WHistogramAccumulator
+    length_hist : LengthHistogramAccumulator
+    """
+    w_hist = WHistogramAccumulator(n_bins=n_bins, n_monomers=model.n_monomers)
+    length_hist = LengthHistogramAccumulator(length_edges)
+    shard_chains = min(len(shard_seeds) * BLOCK_SIZE, num_chains - first_block * BLOCK_SIZE)
+
+    if engine not in KERNEL_ENGINES:
+        chain_lengths, counts = _generate_shard(engine, model, num_chains, first_block, shard_seeds, n_threads)
+        w_hist.update(chain_lengths, counts)
+        length_hist.update(chain_lengths)
+        return w_hist, length_hist
+
+    with _numba_threads(n_threads):
+        w_weights, length_counts = _histogram_chains_kernel(
+            shard_seeds, BLOCK_SIZE, shard_chains, engine == "skip", model.propagate_probs,
+            model.cumulative_transitions, model.transition_matrix, model.start_monomer, n_bins,
+            length_hist.edges, 4 * numba.get_num_threads())
+    w_hist.weights += w_weights
+    length_hist.counts += length_counts
+    return w_hist, length_hist
+
+
+@contextmanager
+def _pool(workers: int, backend: str, executor):
+    """
+    Yield the executor running the tasks and its number of workers.
+
+    A user-supplied `executor` is used as is (and not shut down); otherwise the
+    "process" backend starts a `ProcessPoolExecutor`. Its workers are spawned,
+    not forked: forking a process whose Numba thread pool is running can deadlock.
+    """
+    if executor is not None:
+        yield executor, workers or os.cpu_count() or 1
+        return
+    if backend != "process":
+        raise ValueError('backend must be "process" when no executor is given')
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield pool, workers
+
+
+def _worker_threads(n_threads: int, workers: int, executor):
+    """Numba threads per worker: an even share of the local threads, unless given."""
+    if n_threads is not None or executor is not None:
+        return n_threads
+    return max(1, numba.config.NUMBA_NUM_THREADS // workers)
+
+
+def distributed_counts(num_chains: int, model: KineticModel, engine: str, workers: int = None,
+                       backend: str = "process", executor=None, n_threads: int = None, seed: int = None):
+    """
+    Generate per-chain monomer counts over a pool of worker processes.
+
+    The ensemble is split into contiguous ranges of `BLOCK_SIZE`-chain blocks,
+    each block with its own random stream. With the "process" backend the
+    workers write straight into `multiprocessing.shared_memory` arrays, so no
+    large array is pickled back. A user-supplied `executor` (any object with a
+    ``concurrent.futures``-style ``submit``, e.g. a cluster client spanning
+    several nodes) returns each range by value instead, since its workers may
+    not share memory with this process.
+
+    For a given seed the Numba engines give the same ensemble as the in-process
+    run; the Python engine gives the same ensemble whatever the number of workers.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    model : KineticModel
+        Kinetic parameters of the polymerization.
+    engine : str
+        Generation engine.
+    workers : int, optional
+        Number of worker processes. Default: ``os.cpu_count()``.
+    backend : str, default="process"
+        Built-in executor, used when `executor` is None (only "process").
+    executor : concurrent.futures.Executor, optional
+        Pluggable executor running the tasks.
+    n_threads : int, optional
+        Numba threads per worker. Default: an even share of ``NUMBA_NUM_THREADS``
+        for the "process" backend, the worker's own setting for an `executor`.
+    seed : int, optional
+        Root seed.
+
+    Returns
+    -------
+    chain_lengths : np.ndarray
+        Length of each chain.
+    counts : np.ndarray
+        Number of monomers of each type per chain, shape ``(n_monomers, num_chains)``.
+    """
+    seeds = _shard_seeds(num_chains, engine, seed)
+    n_monomers = model.n_monomers
+
+    with _pool(workers, backend, executor) as (pool, n_workers):
+        n_threads = _worker_threads(n_threads, n_workers, executor)
+        tasks = _tasks(num_chains, TASKS_PER_WORKER * n_workers)
+
+        if executor is not None:
+            futures = [pool.submit(_generate_shard, engine, model, num_chains, a, seeds[a:b], n_threads)
+                       for a, b in tasks]
+            chain_lengths = np.empty(num_chains, dtype=np.int64)
+            counts = np.empty((n_monomers, num_chains), dtype=np.int64)
+            for (a, _), future in zip(tasks, futures):
+                shard_lengths, shard_counts = future.result()
+                start = a * BLOCK_SIZE
+                chain_lengths[start:start + len(shard_lengths)] = shard_lengths
+                counts[:, start:start + len(shard_lengths)] = shard_counts
+            return chain_lengths, counts
+
+        itemsize = np.dtype(np.int64).itemsize
+        segments = [shared_memory.SharedMemory(create=True, size=max(num_chains * itemsize, 1)),
+                    shared_memory.SharedMemory(create=True, size=max(n_monomers * num_chains * itemsize, 1))]
+        try:
+            names = tuple(segment.name for segment in segments)
+            futures = [pool.submit(_generate_shard, engine, model, num_chains, a, seeds[a:b], n_threads, names)
+                       for a, b in tasks]
+            for future in futures:
+                future.result()
+            chain_lengths = np.ndarray(num_chains, dtype=np.int64, buffer=segments[0].buf).copy()
+            counts = np.ndarray((n_monomers, num_chains), dtype=np.int64, buffer=segments[1].buf).copy()
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+    return chain_lengths, counts
+
+
+def distributed_histograms(num_chains: int, model: KineticModel, engine: str, n_bins: int = 1000,
+                           length_edges=None, workers: int = None, backend: str = "process", executor=None,
+                           n_threads: int = None, seed: int = None):
+    """
+    Binned W and chain-length distributions computed over a pool of workers.
+
+    Every task returns its partial histograms (a few kilobytes), which are
+    merged here; no per-chain array leaves the workers.
+
+    Parameters
+    ----------
+    num_chains, model, engine, workers, backend, executor, n_threads, seed
+        As in `distributed_counts`.
+    n_bins : int, default=1000
+        Number of composition bins over [0, 1].
+    length_edges : array_like, optional
+        Chain-length bin edges. Default: `log_length_edges()`.
+
+    Returns
+    -------
+    w_hist : WHistogramAccumulator
+    length_hist : LengthHistogramAccumulator
+    """
+    seeds = _shard_seeds(num_chains, engine, seed)
+    w_hist = WHistogramAccumulator(n_bins=n_bins, n_monomers=model.n_monomers)
+    length_hist = LengthHistogramAccumulator(length_edges)
+
+    with _pool(workers, backend, executor) as (pool, n_workers):
+        n_threads = _worker_threads(n_threads, n_workers, executor)
+        futures = [pool.submit(_histogram_shard, engine, model, num_chains, a, seeds[a:b], n_threads, n_bins,
+                               length_hist.edges)
+                   for a, b in _tasks(num_chains, TASKS_PER_WORKER * n_workers)]
+        for future in futures:
+            shard_w_hist, shard_length_hist = future.result()
+            w_hist.merge(shard_w_hist)
+            length_hist.merge(shard_length_hist)
+    return w_hist, length_hist
@@ -0,0 +1,234 @@
+import numpy as np
+from montecarlo.accumulators import composition_bins
+
+def default_n_bins(n_chains):
+    """Default number of W bins: one per 10 chains."""
+    return max(int(np.ceil(n_chains / 10)), 1)
+
+
+class WDistribution:
+    """
+    Length-weighted composition distributions (W) of every monomer on shared bins.
+
+    All monomers are binned in a single vectorized pass over bins spanning
+    [0, 1] (a fraction of exactly 1 falls in the last bin). The normalized
+    curves and their smoothed versions are computed once and cached, so
+    plotting, CSV export and smoothing all read the same result.
+
+    Parameters
+    ----------
+    weights : array_like
+        Summed chain lengths per bin, shape ``(n_monomers, n_bins)``.
+    names : sequence of str, optional
+        Monomer labels. Default: "A", "B", "C", ...
+    """
+
+    def __init__(self, weights, names=None):
+        self.weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        n_monomers, n_bins = self.weights.shape
+        if names is None:
+            names = [chr(ord("A") + i) for i in range(n_monomers)]
+        if len(names) != n_monomers:
+            raise ValueError(f"names must have {n_monomers} entries")
+        self.names = tuple(names)
+        self.bin_edges = np.linspace(0, 1, n_bins + 1)
+        self._density = None
+        self._smoothed = {}
+
+    @classmethod
+    def from_fractions(cls, chain_lengths, *fractions, n_bins=None, names=None):
+        """
+        Bin per-chain monomer fractions.
+
+        Bins are ``floor(fraction * n_bins)`` in floating point. When the
+        integer counts are available, prefer `from_counts`: it uses the exact
+        ``count * n_bins // length`` rule of the kernel histograms and the
+        accumulators, which can differ for fractions on a bin boundary.
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain (the weights).
+        *fractions : np.ndarray
+            One fraction array per monomer (e.g. freq_A, freq_B, freq_C).
+        n_bins : int, optional
+            Number of bins over [0, 1]. Default: ``ceil(len(chain_lengths) / 10)``.
+        names : sequence of str, optional
+            Monomer labels.
+
+        Returns
+        -------
+        WDistribution
+        """
+        if n_bins is None:
+            n_bins = default_n_bins(len(chain_lengths))
+        fractions = np.atleast_2d(np.asarray(fractions, dtype=np.float64))
+        bin_indices = np.clip((fractions * n_bins).astype(np.int64), 0, n_bins - 1)
+        return cls(cls._bin(bin_indices, chain_lengths, n_bins), names)
+
+    @classmethod
+    def from_counts(cls, chain_lengths, counts, n_bins=None, names=None):
+        """
+        Bin per-chain monomer counts (exact integer bin assignment).
+
+        Parameters
+        ----------
+        chain_lengths : np.ndarray
+            Length of each chain.
+        counts : np.ndarray
+            Number of monomers of each type per chain, shape ``(n_monomers, n_chains)``.
+        n_bins, names
+            As in `from_fractions`.
+
+        Returns
+        -------
+        WDistribution
+        """
+        if n_bins is None:
+            n_bins = default_n_bins(len(chain_lengths))
+        return cls(cls._bin(composition_bins(chain_lengths, counts, n_bins), chain_lengths, n_bins), names)
+
+    @classmethod
+    def from_histogram(cls, w_hist, names=None):
+        """
+        Wrap the weights of a `WHistogramAccumulator` (e.g. from `histogram_chains`).
+
+        Returns
+        -------
+        WDistribution
+        """
+        return cls(w_hist.weights, names)
+
+    @staticmethod
+    def _bin(bin_indices, chain_lengths, n_bins):
+        """One `np.bincount` over all monomers, each offset to its own block of bins."""
+        n_monomers = bin_indices.shape[0]
+        offsets = np.arange(n_monomers)[:, np.newaxis] * n_bins
+        weights = np.broadcast_to(np.asarray(chain_lengths, dtype=np.float64), bin_indices.shape)
+        flat = np.bincount((bin_indices + offsets).ravel(), weights=weights.ravel(), minlength=n_monomers * n_bins)
+        return flat.reshape(n_monomers, n_bins)
+
+    @property
+    def n_bins(self):
+        """Number of bins."""
+        return self.weights.shape[1]
+
+    @property
+    def bin_centers(self):
+        """Center of each bin."""
+        return (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+
+    def _index(self, monomer):
+        """Row of a monomer given by index or name."""
+        return self.names.index(monomer) if isinstance(monomer, str) else int(monomer)
+
+    def density(self, monomer=None):
+        """
+        W normalized so that the area under each curve is 1.
+
+        Parameters
+        ----------
+        monomer : int or str, optional
+            Monomer index or name. Default: all monomers.
+
+        Returns
+        -------
+        np.ndarray
+            Shape ``(n_bins,)`` for one monomer, ``(n_monomers, n_bins)`` otherwise.
+        """
+        if self._density is None:
+            dx = self.bin_edges[1] - self.bin_edges[0]
+            totals = self.weights.sum(axis=1, keepdims=True)
+            self._density = self.weights / (np.where(totals > 0, totals, 1.0) * dx)
+        return self._density if monomer is None else self._density[self._index(monomer)]
+
+    def smoothed(self, monomer, smooth_window=51, poly_order=3):
+        """
+        Savitzky-Golay smoothed W of one monomer (cached per window and order).
+
+        The window is reduced to the largest odd value below the number of
+        bins when needed.
+
+        Parameters
+        ----------
+        monomer : int or str
+            Monomer index or name.
+        smooth_window : int
+            Window size (must be odd).
+        poly_order : int
+            Polynomial order.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        from scipy.signal import savgol_filter
+        index = self._index(monomer)
+        if smooth_window >= self.n_bins:
+            smooth_window = self.n_bins - 1
+            if smooth_window % 2 == 0:
+                smooth_window -= 1  # window must be odd
+        key = (index, smooth_window, poly_order)
+        if key not in self._smoothed:
+            self._smoothed[key] = savgol_filter(self.density(index), smooth_window, poly_order)
+        return self._smoothed[key]
+
+    def to_frame(self, monomer=None):
+        """
+        Table of the normalized distributions.
+
+        Parameters
+        ----------
+        monomer : int or str, optional
+            If given, columns ``bin_center`` and ``W`` for that monomer;
+            otherwise ``bin_center`` and one ``W_<name>`` column per monomer.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        import pandas as pd
+        if monomer is not None:
+            return pd.DataFrame({"bin_center": self.bin_centers, "W": self.density(monomer)})
+        columns = {"bin_center": self.bin_centers}
+        columns.update({f"W_{name}": w for name, w in zip(self.names, self.density())})
+        return pd.DataFrame(columns)
+
+    def to_csv(self, filename, monomer=None):
+        """
+        Save `to_frame(monomer)` to a CSV file.
+
+        Parameters
+        ----------
+        filename : str
+            Output CSV file path.
+        monomer : int or str, optional
+            Monomer to save. Default: all monomers.
+        """
+        self.to_frame(monomer).to_csv(filename, index=False)
+
+    def plot(self, monomer, smooth_window=51, poly_order=3, label=None, color=None):
+        """
+        Plot the W of one monomer with points and smoothed line.
+
+        Parameters
+        ----------
+        monomer : int or str
+            Monomer index or name.
+        smooth_window : int
+            Window size for Savitzky-Golay smoothing (must be odd).
+        poly_order : int
+            Polynomial order for Savitzky-Golay smoothing.
+        label : str
+            Label for the plot.
+        color : str
+            Color for points and line.
+        """
+        import matplotlib.pyplot as plt
+        w = self.density(monomer)
+        w_smooth = self.smoothed(monomer, smooth_window, poly_order)
+        plt.scatter(self.bin_centers, w, s=10, label=f"{label} points" if label else None, color=color, alpha=0.6)
+        plt.plot(self.bin_centers, w_smooth, label=f"{label} smooth" if label else None, color=color, linewidth=2)
+        plt.xlabel("Monomer fraction")
+        plt.ylabel("wX (normalized)")
+        plt.legend()
@@ -0,0 +1,249 @@
+import numpy as np
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import iter_chains, DEFAULT_CHUNK_SIZE, DEFAULT_MODEL
+from montecarlo.sorting_algorithms import co_sort
+
+COUNT_DTYPES = (np.uint16, np.uint32, np.uint64)
+
+def compact_count_dtype(max_count):
+    """
+    Smallest unsigned integer dtype holding counts up to `max_count`.
+
+    Parameters
+    ----------
+    max_count : int
+        Largest monomer count.
+
+    Returns
+    -------
+    np.dtype
+        uint16, uint32 or uint64.
+    """
+    for dtype in COUNT_DTYPES:
+        if max_count <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise OverflowError(f"count {max_count} does not fit in uint64")
+
+
+class ChainEnsemble:
+    """
+    Compact chain ensemble: per-monomer counts stored as small unsigned integers.
+
+    Only the counts are stored (2 or 4 bytes per monomer and chain instead of an
+    int64 length plus one float64 fraction per monomer); chain lengths and
+    fractions are derived on demand, in float64 or float32.
+
+    Parameters
+    ----------
+    counts : array_like
+        Number of monomers of each type per chain, shape ``(n_monomers, n_chains)``.
+    names : sequence of str, optional
+        Monomer labels. Default: "A", "B", "C", ...
+    dtype : np.dtype, optional
+        Storage dtype of the counts. Default: the smallest of uint16/uint32/uint64
+        that holds the largest count.
+    """
+
+    __slots__ = ("counts", "names", "_chain_lengths")
+
+    def __init__(self, counts, names=None, dtype=None):
+        counts = np.asarray(counts)
+        if counts.ndim != 2:
+            raise ValueError("counts must have shape (n_monomers, n_chains)")
+        if dtype is None:
+            dtype = compact_count_dtype(int(counts.max()) if counts.size else 0)
+        self.counts = np.ascontiguousarray(counts, dtype=dtype)
+        if names is None:
+            names = [chr(ord("A") + i) for i in range(len(counts))]
+        if len(names) != len(counts):
+            raise ValueError(f"names must have {len(counts)} entries")
+        self.names = tuple(names)
+        self._chain_lengths = None
+
+    def __len__(self):
+        return self.counts.shape[1]
+
+    def __repr__(self):
+        return f"ChainEnsemble(n_chains={len(self)}, names={self.names}, dtype={self.counts.dtype})"
+
+    @property
+    def n_monomers(self):
+        """Number of monomer types."""
+        return self.counts.shape[0]
+
+    @property
+    def nbytes(self):
+        """Memory used by the stored counts, in bytes."""
+        return self.counts.nbytes
+
+    @property
+    def chain_lengths(self):
+        """Length of each chain (int64, computed on first access)."""
+        if self._chain_lengths is None:
+            self._chain_lengths = self.counts.sum(axis=0, dtype=np.int64)
+        return self._chain_lengths
+
+    def _index(self, monomer):
+        """Row of a monomer given by index or name."""
+        return self.names.index(monomer) if isinstance(monomer, str) else int(monomer)
+
+    def fraction(self, monomer, dtype=np.float64):
+        """
+        Fraction of one monomer in each chain.
+
+        Parameters
+        ----------
+        monomer : int or str
+            Monomer index or name.
+        dtype : np.dtype, default=np.float64
+            Output dtype (e.g. np.float32 to halve the memory).
+
+        Returns
+        -------
+        np.ndarray
+        """
+        counts = self.counts[self._index(monomer)]
+        return np.divide(counts, self.chain_lengths, dtype=dtype)
+
+    def fractions(self, dtype=np.float64):
+        """
+        Fractions of every monomer, shape ``(n_monomers, n_chains)``.
+
+        Parameters
+        ----------
+        dtype : np.dtype, default=np.float64
+            Output dtype.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return np.divide(self.counts, self.chain_lengths, dtype=dtype)
+
+    def sort(self, by=0):
+        """
+        Stable in-place sort of the chains by the fraction of one monomer.
+
+        Parameters
+        ----------
+        by : int or str, default=0
+            Monomer index or name.
+
+        Returns
+        -------
+        ChainEnsemble
+            The ensemble itself.
+        """
+        key = self.fraction(by)
+        co_sort(key, *self.counts)
+        self._chain_lengths = None
+        return self
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Yield the ensemble as ``(chain_lengths, counts)`` chunks.
+
+        The chunks feed the accumulators of `montecarlo.accumulators` (e.g. with
+        `accumulate`) exactly like the chunks of `iter_chains`.
+
+        Parameters
+        ----------
+        chunk_size : int, default=DEFAULT_CHUNK_SIZE
+            Number of chains per chunk.
+
+        Yields
+        ------
+        chain_lengths : np.ndarray
+        counts : np.ndarray
+        """
+        chain_lengths = self.chain_lengths
+        for start in range(0, len(self), chunk_size):
+            stop = start + chunk_size
+            yield chain_lengths[start:stop], self.counts[:, start:stop]
+
+    def to_records(self, dtype=np.float64):
+        """
+        Structured array with one ``length`` field and one ``freq_<name>`` field per monomer.
+
+        Parameters
+        ----------
+        dtype : np.dtype, default=np.float64
+            Dtype of the fraction fields.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        records = np.empty(len(self), dtype=[("length", np.int64)] + [(f"freq_{name}", dtype)
+                                                                      for name in self.names])
+        records["length"] = self.chain_lengths
+        for m, name in enumerate(self.names):
+            records[f"freq_{name}"] = self.fraction(m, dtype)
+        return records
+
+    def save(self, path):
+        """
+        Save the counts and monomer names to a ``.npz`` file.
+
+        Parameters
+        ----------
+        path : str or Path
+            Output file.
+        """
+        np.savez(path, counts=self.counts, names=np.array(self.names))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an ensemble saved with `save`.
+
+        Parameters
+        ----------
+        path : str or Path
+            ``.npz`` file.
+
+        Returns
+        -------
+        ChainEnsemble
+        """
+        with np.load(path) as data:
+            return cls(data["counts"], names=[str(name) for name in data["names"]], dtype=data["counts"].dtype)
+
+
+def generate_ensemble(num_chains: int, use_numba: bool = False, n_threads: int = None, seed: int = None,
+                      engine: str = None, model: KineticModel = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Generate chains directly into a compact `ChainEnsemble`.
+
+    The chains are streamed through `iter_chains`, so no full-size int64 or
+    float64 array is allocated. For a given seed the ensemble holds the same
+    chains as `generate_chains`.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains`.
+    chunk_size : int, default=DEFAULT_CHUNK_SIZE
+        Number of chains generated per chunk (see `iter_chains`).
+
+    Returns
+    -------
+    ChainEnsemble
+    """
+    if model is None:
+        model = DEFAULT_MODEL
+    counts = np.empty((model.n_monomers, num_chains), dtype=np.uint32)
+    max_count = 0
+    start = 0
+    for _, chunk_counts in iter_chains(num_chains, chunk_size=chunk_size, use_numba=use_numba,
+                                       n_threads=n_threads, seed=seed, engine=engine, model=model):
+        max_count = max(max_count, int(chunk_counts.max()))
+        if max_count > np.iinfo(counts.dtype).max:
+            counts = counts.astype(np.uint64)
+        counts[:, start:start + chunk_counts.shape[1]] = chunk_counts
+        start += chunk_counts.shape[1]
+
+    dtype = compact_count_dtype(max_count)
+    return ChainEnsemble(counts if dtype == counts.dtype else counts.astype(dtype), names=model.names, dtype=dtype)
@@ -0,0 +1,443 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+from math import comb
+import numpy as np
+from numba import njit, prange
+from montecarlo.kinetics import KineticModel
+from montecarlo.accumulators import log_length_edges
+
+# Default probability mass of the chains longer than the dynamic-programming cutoff.
+DEFAULT_TAIL_TOLERANCE = 1e-9
+
+
+def _absorbing_chain(model: KineticModel):
+    """
+    Transient transition matrix and termination probabilities of the chain model.
+
+    Returns
+    -------
+    propagation : np.ndarray
+        ``Q[s, j] = p_s * P_sj``, probability that monomer ``j`` follows ``s``.
+    termination : np.ndarray
+        ``1 - p_s``, probability that the chain ends after ``s``.
+    """
+    propagation = model.propagate_probs[:, np.newaxis] * model.transition_matrix
+    return propagation, 1.0 - model.propagate_probs
+
+
+def _eulerian_polynomial(k, matrix):
+    """Eulerian polynomial ``A_k`` evaluated at a square matrix (``sum_n n**k x**(n-1) = A_k(x) / (1-x)**(k+1)``)."""
+    result = np.zeros_like(matrix)
+    power = np.eye(len(matrix))
+    for i in range(k):
+        coefficient = sum((-1) ** j * comb(k + 1, j) * (i + 1 - j) ** k for j in range(i + 1))
+        result += coefficient * power
+        power = power @ matrix
+    return result
+
+
+def length_power_moments(model: KineticModel, max_order=3):
+    """
+    Exact moments ``E[L**k]`` of the chain length, ``k = 1 .. max_order``.
+
+    With ``N = (I - Q)**-1`` the fundamental matrix of the absorbing chain,
+    ``E[L**k] = e A_k(Q) N**k 1`` where ``e`` selects the start monomer and
+    ``A_k`` is the Eulerian polynomial.
+
+    Parameters
+    ----------
+    model : KineticModel
+        Kinetic parameters.
+    max_order : int, default=3
+        Highest moment.
+
+    Returns
+    -------
+    np.ndarray
+        ``max_order`` moments.
+    """
+    propagation, _ = _absorbing_chain(model)
+    fundamental = np.linalg.inv(np.eye(model.n_monomers) - propagation)
+    ones = np.ones(model.n_monomers)
+    moments = np.empty(max_order)
+    fundamental_power = np.eye(model.n_monomers)
+    for k in range(1, max_order + 1):
+        fundamental_power = fundamental_power @ fundamental
+        moments[k - 1] = (_eulerian_polynomial(k, propagation) @ fundamental_power @ ones)[model.start_monomer]
+    return moments
+
+
+def expected_counts(model: KineticModel):
+    """
+    Exact expected number of monomers of each type per chain (row of the fundamental matrix).
+
+    Returns
+    -------
+    np.ndarray
+    """
+    propagation, _ = _absorbing_chain(model)
+    fundamental = np.linalg.inv(np.eye(model.n_monomers) - propagation)
+    return fundamental[model.start_monomer].copy()
+
+
+def length_cutoff(model: KineticModel, tol=DEFAULT_TAIL_TOLERANCE):
+    """
+    Chain length beyond which the probability mass is below about `tol`.
+
+    Uses the spectral radius ``rho`` of ``Q``: ``P(L > n)`` decays as ``rho**n``.
+
+    Returns
+    -------
+    int
+    """
+    propagation, _ = _absorbing_chain(model)
+    rho = max(abs(np.linalg.eigvals(propagation)))
+    if rho == 0:
+        return 1
+    return int(np.ceil(np.log(tol) / np.log(rho))) + 1
+
+
+@njit(cache=True)
+def _length_probabilities(propagation, termination, start_monomer, max_length):
+    """
+    ``P(L = n)`` for ``n = 0 .. max_length`` and the mass of longer chains.
+
+    ``P(L = n) = e Q**(n-1) r``, iterated on the state distribution.
+    """
+    probabilities = np.zeros(max_length + 1)
+    state = np.zeros(len(termination))
+    state[start_monomer] = 1.0
+    for n in range(1, max_length + 1):
+        probabilities[n] = state @ termination
+        state = state @ propagation
+    return probabilities, state.sum()
+
+
+@njit(cache=True)
+def _composition_dp(propagation, termination, start_monomer, monomer, max_length, n_bins, length_edges, prune):
+    """
+    Joint distribution of chain length and count of one monomer, by dynamic programming.
+
+    ``f[c, s]`` is the probability that a growing chain has reached length
+    ``n`` with ``c`` units of `monomer` and last monomer ``s``. At every length
+    the terminating mass is binned like the Monte Carlo histograms, then ``f``
+    is propagated one monomer. Only the band of counts holding mass is
+    visited: edge counts whose probability falls below `prune` are dropped,
+    which keeps the band ``O(sqrt(n))`` wide instead of ``O(n)``.
+
+    Returns
+    -------
+    w_weights : np.ndarray
+        Expected length-weighted composition histogram per chain, shape ``(n_bins,)``.
+    joint : np.ndarray
+        Probability per (length bin, composition bin), shape ``(len(length_edges) - 1, n_bins)``.
+    mean_fraction : float
+        Expected fraction of `monomer` per chain (number average).
+    pruned : float
+        Total probability dropped from the band.
+    """
+    n_monomers = len(termination)
+    n_length_bins = len(length_edges) - 1
+    f = np.zeros((max_length + 2, n_monomers))
+    g = np.zeros((max_length + 2, n_monomers))
+    lo = hi = 1 if start_monomer == monomer else 0
+    f[lo, start_monomer] = 1.0
+    w_weights = np.zeros(n_bins)
+    joint = np.zeros((n_length_bins, n_bins))
+    mean_fraction = 0.0
+    pruned = 0.0
+
+    for n in range(1, max_length + 1):
+        length_bin = np.searchsorted(length_edges, n, side="right") - 1
+        length_bin = min(max(length_bin, 0), n_length_bins - 1)
+        for c in range(lo, hi + 1):
+            p = 0.0
+            for s in range(n_monomers):
+                p += f[c, s] * termination[s]
+            if p > 0.0:
+                bin_index = min(c * n_bins // n, n_bins - 1)
+                w_weights[bin_index] += n * p
+                joint[length_bin, bin_index] += p
+                mean_fraction += p * c / n
+
+        if n == max_length:
+            break
+        g[lo:hi + 2] = 0.0
+        for c in range(lo, hi + 1):
+            for s in range(n_monomers):
+                x = f[c, s]
+                if x == 0.0:
+                    continue
+                for t in range(n_monomers):
+                    if t == monomer:
+                        g[c + 1, t] += x * propagation[s, t]
+                    else:
+                        g[c, t] += x * propagation[s, t]
+        f, g = g, f
+        # Shrink the band to the counts still holding mass
+        hi += 1
+        while lo < hi and f[lo].sum() < prune:
+            pruned += f[lo].sum()
+            f[lo] = 0.0
+            lo += 1
+        while hi > lo and f[hi].sum() < prune:
+            pruned += f[hi].sum()
+            f[hi] = 0.0
+            hi -= 1
+
+    return w_weights, joint, mean_fraction, pruned
+
+
+@njit(parallel=True, cache=True)
+def _composition_dp_all(propagation, termination, start_monomer, max_length, n_bins, length_edges, prune):
+    """Run `_composition_dp` for every monomer in parallel."""
+    n_monomers = len(termination)
+    w_weights = np.zeros((n_monomers, n_bins))
+    joint = np.zeros((n_monomers, len(length_edges) - 1, n_bins))
+    mean_fractions = np.zeros(n_monomers)
+    pruned = np.zeros(n_monomers)
+    for monomer in prange(n_monomers):
+        w_weights[monomer], joint[monomer], mean_fractions[monomer], pruned[monomer] = _composition_dp(
+            propagation, termination, start_monomer, monomer, max_length, n_bins, length_edges, prune)
+    return w_weights, joint, mean_fractions, pruned
+
+
+class _ExactAverages:
+    """Averages shared by `ExactMoments` and `ExactDistribution` (zero errors, `MomentAccumulator` layout)."""
+
+    @property
+    def pdi(self):
+        """Polydispersity index Mw / Mn."""
+        return self.mw / self.mn
+
+    def standard_errors(self):
+        """Zero standard errors (same keys as `MomentAccumulator.standard_errors`)."""
+        zeros = np.zeros(len(self.names))
+        return {"mn": 0.0, "mw": 0.0, "mz": 0.0, "pdi": 0.0, "composition": zeros,
+                "mean_fractions": zeros.copy()}
+
+    def to_frame(self):
+        """
+        Table of the exact averages, in the layout of `MomentAccumulator.to_frame`.
+
+        Returns
+        -------
+        pd.DataFrame
+            quantity | value | standard_error
+        """
+        import pandas as pd
+        rows = [("Mn", self.mn), ("Mw", self.mw), ("Mz", self.mz), ("PDI", self.pdi)]
+        rows += [(f"composition_{name}", value) for name, value in zip(self.names, self.composition)]
+        rows += [(f"mean_fraction_{name}", value) for name, value in zip(self.names, self.mean_fractions)]
+        return pd.DataFrame([(quantity, value, 0.0) for quantity, value in rows],
+                            columns=["quantity", "value", "standard_error"])
+
+
+@dataclass
+class ExactMoments(_ExactAverages):
+    """
+    Closed-form averages of a `KineticModel` (what ``chain_moments(engine="exact")`` returns).
+
+    Mn, Mw, Mz and the overall composition come from the fundamental matrix
+    alone, in milliseconds. The number-average fractions need the composition
+    dynamic programming and are computed on first access only.
+
+    Attributes
+    ----------
+    names : tuple of str
+        Monomer labels.
+    mn, mw, mz : float
+        Number-, weight- and z-average chain lengths.
+    composition : np.ndarray
+        Overall fraction of each monomer (weight average).
+    model : KineticModel
+        Model the averages belong to.
+    """
+
+    names: tuple
+    mn: float
+    mw: float
+    mz: float
+    composition: np.ndarray
+    model: KineticModel = field(repr=False)
+
+    @cached_property
+    def mean_fractions(self):
+        """Expected per-chain fraction of each monomer (number average), by dynamic programming."""
+        return exact_mean_fractions(self.model)
+
+
+@dataclass
+class ExactDistribution(_ExactAverages):
+    """
+    Exact chain statistics of a `KineticModel`, computed without sampling.
+
+    The moments and the weight-average composition are closed-form; the
+    length distribution, W histograms, joint distribution and number-average
+    fractions are exact up to the chains longer than `max_length`, whose total
+    probability is `tail_probability`. Histograms are per chain: multiply by
+    the number of chains to compare with a Monte Carlo ensemble.
+
+    Attributes
+    ----------
+    names : tuple of str
+        Monomer labels.
+    mn, mw, mz : float
+        Number-, weight- and z-average chain lengths.
+    composition : np.ndarray
+        Overall fraction of each monomer (weight average).
+    mean_fractions : np.ndarray
+        Expected per-chain fraction of each monomer (number average).
+    length_probabilities : np.ndarray
+        ``P(L = n)`` for ``n = 0 .. max_length``.
+    tail_probability : float
+        ``P(L > max_length)``.
+    pruned_probability : float
+        Largest probability (over monomers) dropped by the band pruning of the
+        composition dynamic programming; bounded by about ``tail_probability / 1000``.
+    w_weights : np.ndarray
+        Expected length-weighted composition histograms, shape ``(n_monomers, n_bins)``.
+    joint : np.ndarray
+        Probability per (monomer, length bin, composition bin).
+    length_edges : np.ndarray
+        Chain-length bin edges of `joint`.
+    """
+
+    names: tuple
+    mn: float
+    mw: float
+    mz: float
+    composition: np.ndarray
+    mean_fractions: np.ndarray
+    length_probabilities: np.ndarray
+    tail_probability: float
+    pruned_probability: float
+    w_weights: np.ndarray
+    joint: np.ndarray
+    length_edges: np.ndarray
+
+    @property
+    def max_length(self):
+        """Longest chain length covered by the distributions."""
+        return len(self.length_probabilities) - 1
+
+    @property
+    def bin_edges(self):
+        """Composition bin edges over [0, 1]."""
+        return np.linspace(0, 1, self.w_weights.shape[1] + 1)
+
+    def length_histogram(self, edges=None):
+        """
+        Probability of each chain-length bin (as in `LengthHistogramAccumulator`).
+
+        Parameters
+        ----------
+        edges : array_like, optional
+            Increasing bin edges. Default: `length_edges`.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        edges = self.length_edges if edges is None else np.asarray(edges)
+        lengths = np.arange(len(self.length_probabilities))
+        bins = np.clip(np.searchsorted(edges, lengths, side="right") - 1, 0, len(edges) - 2)
+        return np.bincount(bins[1:], weights=self.length_probabilities[1:], minlength=len(edges) - 1)
+
+    def w_distribution(self):
+        """
+        The W histograms as a `WDistribution` (normalized curves, plotting, CSV).
+
+        Returns
+        -------
+        WDistribution
+        """
+        from montecarlo.distribution import WDistribution
+        return WDistribution(self.w_weights, self.names)
+
+
+def exact_moments(model: KineticModel = None):
+    """
+    Closed-form Mn, Mw, Mz and overall composition of a `KineticModel` (no dynamic programming).
+
+    Parameters
+    ----------
+    model : KineticModel, optional
+        Kinetic parameters. Default: the A/B/C terpolymer of the reference paper.
+
+    Returns
+    -------
+    ExactMoments
+    """
+    model = KineticModel() if model is None else model
+    m1, m2, m3 = length_power_moments(model, 3)
+    return ExactMoments(names=model.names, mn=m1, mw=m2 / m1, mz=m3 / m2,
+                        composition=expected_counts(model) / m1, model=model)
+
+
+def exact_mean_fractions(model: KineticModel, max_length: int = None, tol: float = DEFAULT_TAIL_TOLERANCE):
+    """
+    Expected per-chain fraction of each monomer, by the composition dynamic programming.
+
+    Parameters
+    ----------
+    model : KineticModel
+        Kinetic parameters.
+    max_length, tol
+        As in `exact_distribution`.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if max_length is None:
+        max_length = length_cutoff(model, tol)
+    propagation, termination = _absorbing_chain(model)
+    # One composition bin and one length bin: only the fractions are kept
+    _, _, mean_fractions, _ = _composition_dp_all(propagation, termination, model.start_monomer, max_length, 1,
+                                                  np.array([1, max_length + 1], dtype=np.int64),
+                                                  tol * 1e-3 / max_length)
+    return mean_fractions
+
+
+def exact_distribution(model: KineticModel = None, n_bins: int = 100, length_edges=None, max_length: int = None,
+                       tol: float = DEFAULT_TAIL_TOLERANCE):
+    """
+    Exact chain statistics of the absorbing Markov chain of a `KineticModel`.
+
+    Parameters
+    ----------
+    model : KineticModel, optional
+        Kinetic parameters. Default: the A/B/C terpolymer of the reference paper.
+    n_bins : int, default=100
+        Number of composition bins over [0, 1].
+    length_edges : array_like, optional
+        Chain-length bin edges of the joint distribution. Default: `log_length_edges()`.
+    max_length : int, optional
+        Cutoff of the distributions. Default: `length_cutoff(model, tol)`.
+    tol : float, default=DEFAULT_TAIL_TOLERANCE
+        Target probability of the chains longer than the default cutoff.
+
+    Returns
+    -------
+    ExactDistribution
+    """
+    model = KineticModel() if model is None else model
+    length_edges = log_length_edges() if length_edges is None else np.asarray(length_edges, dtype=np.int64)
+    if max_length is None:
+        max_length = length_cutoff(model, tol)
+    propagation, termination = _absorbing_chain(model)
+
+    moments = exact_moments(model)
+    probabilities, tail = _length_probabilities(propagation, termination, model.start_monomer, max_length)
+
+    # Pruned mass summed over all lengths stays well below the length tail
+    prune = max(tol, tail) * 1e-3 / max_length
+    w_weights, joint, mean_fractions, pruned = _composition_dp_all(
+        propagation, termination, model.start_monomer, max_length, n_bins, length_edges, prune)
+
+    return ExactDistribution(names=model.names, mn=moments.mn, mw=moments.mw, mz=moments.mz,
+                             composition=moments.composition, mean_fractions=mean_fractions,
+                             length_probabilities=probabilities, tail_probability=float(tail),
+                             pruned_probability=float(pruned.max()), w_weights=w_weights, joint=joint,
+                             length_edges=length_edges)
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class KineticModel:
+    """
+    Steady-state kinetic model of a multicomponent (co-, ter-, tetra-...) polymerization.
+
+    The model is described by the feed composition, the reactivity ratios and the
+    propagation/termination factors of each monomer. From them it precomputes the
+    arrays consumed by the generation kernels:
+
+    - ``propagate_probs[i]``: probability that a chain ending in monomer ``i``
+      propagates instead of terminating,
+    - ``transition_matrix[i, j]``: probability that monomer ``j`` is added after
+      monomer ``i``,
+    - ``cumulative_transitions``: row-wise cumulative sum of ``transition_matrix``.
+
+    Defaults reproduce the A/B/C terpolymer of the reference paper.
+
+    Parameters
+    ----------
+    feed : array_like
+        Propagation weight (feed fraction) of each monomer, shape ``(n_monomers,)``.
+    reactivity_ratios : array_like
+        ``reactivity_ratios[i, j]`` is the rate ratio k_ii / k_ij, shape
+        ``(n_monomers, n_monomers)``. The diagonal must be 1.
+    propagation_factors : array_like
+        Relative propagation frequency of each monomer, shape ``(n_monomers,)``.
+    termination_factors : array_like
+        Relative termination weight of each monomer, shape ``(n_monomers,)``.
+    total_random_events : float, default=1000
+        Normalization factor between propagation and termination events.
+    start_monomer : int, default=0
+        Index of the monomer every chain starts with.
+    names : sequence of str, optional
+        Monomer labels. Default: "A", "B", "C", ...
+    """
+
+    def __init__(self,
+                 feed=(0.6, 0.2, 0.2),
+                 reactivity_ratios=((1.0, 5.0, 10.0),
+                                    (0.2, 1.0, 2.0),
+                                    (0.1, 0.5, 1.0)),
+                 propagation_factors=(0.9091, 0.0606, 0.0303),
+                 termination_factors=(0.33, 0.33, 0.34),
+                 total_random_events=1000,
+                 start_monomer=0,
+                 names=None):
+        self.feed = np.asarray(feed, dtype=np.float64)
+        self.reactivity_ratios = np.asarray(reactivity_ratios, dtype=np.float64)
+        self.propagation_factors = np.asarray(propagation_factors, dtype=np.float64)
+        self.termination_factors = np.asarray(termination_factors, dtype=np.float64)
+        self.total_random_events = float(total_random_events)
+        self.start_monomer = int(start_monomer)
+
+        n = len(self.feed)
+        if self.reactivity_ratios.shape != (n, n):
+            raise ValueError(f"reactivity_ratios must have shape ({n}, {n})")
+        if self.propagation_factors.shape != (n,) or self.termination_factors.shape != (n,):
+            raise ValueError(f"propagation_factors and termination_factors must have shape ({n},)")
+        if not 0 <= self.start_monomer < n:
+            raise ValueError(f"start_monomer must be in [0, {n})")
+        if names is None:
+            names = [chr(ord("A") + i) for i in range(n)]
+        if len(names) != n:
+            raise ValueError(f"names must have {n} entries")
+        self.names = tuple(names)
+
+        weighted = self.propagation_factors * self.total_random_events
+        self.propagate_probs = weighted / (weighted + self.termination_factors)
+
+        weights = self.feed[np.newaxis, :] / self.reactivity_ratios
+        self.transition_matrix = weights / weights.sum(axis=1, keepdims=True)
+        self.cumulative_transitions = np.cumsum(self.transition_matrix, axis=1)
+        self.cumulative_transitions[:, -1] = 1.0
+
+    @property
+    def n_monomers(self):
+        """Number of monomer types."""
+        return len(self.feed)
+
+    def __repr__(self):
+        return f"KineticModel(n_monomers={self.n_monomers}, names={self.names})"
@@ -1,15 +1,16 @@
-import time
 import numpy as np
-from montecarlo.sorting_algorithms import (
-    bubble_sort, bubble_sort_numba,
-    insertion_sort, insertion_sort_numba,
-    selection_sort, selection_sort_numba,
-    tim_sort
-)
+from montecarlo.sorting_algorithms import QUADRATIC_SIZE_LIMIT, select_algorithms
+from montecarlo.timing import measure
 
-def benchmark_sorting_algorithms(chains_array, freq_A):
+def benchmark_sorting_algorithms(chains_array, freq_A, max_quadratic_size=QUADRATIC_SIZE_LIMIT, n_repeats=5,
+                                 return_compile_times=False):
     '''
-    Compares execution times of different sorting algorithms (pure Python and Numba).
+    Compares execution times of the registered sorting algorithms (pure Python and Numba).
+
+    Each algorithm is timed with `montecarlo.timing.measure`: a warm-up call
+    (which includes the JIT compilation of the Numba variants) is excluded,
+    then fresh copies of the arrays are sorted repeatedly with
+    `time.perf_counter_ns`.
 
     Parameters
     ----------
@@ -17,31 +18,30 @@ def benchmark_sorting_algorithms(chains_array, freq_A):
         Array of the polymer chains.
     freq_A : np.ndarray
         Array of frequencies of A, same length as chain_lengths.
+    max_quadratic_size : int, default=QUADRATIC_SIZE_LIMIT
+        O(n^2) algorithms are skipped for arrays longer than this.
+    n_repeats : int, default=5
+        Maximum number of timed repeats per algorithm.
+    return_compile_times : bool, default=False
+        Also return the compile time (warm-up excess) of each algorithm.
 
     Returns
     -------
     dict
-        Execution times for each algorithm.
+        Median execution time of each algorithm.
+    dict
+        Compile time of each algorithm (only if `return_compile_times`).
     '''
     results = {}
-    algorithms = {
-        "bubble_sort": bubble_sort,
-        "bubble_sort_numba": bubble_sort_numba,
-        "insertion_sort": insertion_sort,
-        "insertion_sort_numba": insertion_sort_numba,
-        "selection_sort": selection_sort,
-        "selection_sort_numba": selection_sort_numba,
-        "tim_sort": tim_sort
-    }
-
-    for name, func in algorithms.items():
-        cl_copy = chains_array.copy()
-        fa_copy = freq_A.copy()
-
-        start_time = time.perf_counter()
-        func(cl_copy, fa_copy)
-        elapsed = time.perf_counter() - start_time
+    compile_times = {}
+    algorithms = select_algorithms(n=len(freq_A), max_quadratic_size=max_quadratic_size)
 
-        results[name] = elapsed
+    for name, algorithm in algorithms.items():
+        timing = measure(algorithm.func, setup=lambda: (chains_array.copy(), freq_A.copy()),
+                         min_repeats=min(3, n_repeats), max_repeats=n_repeats)
+        results[name] = float(np.median(timing["times"]))
+        compile_times[name] = timing["compile_time"]
 
-    return results
\ No newline at end of file
+    if return_compile_times:
+        return results, compile_times
+    return results
@@ -0,0 +1,196 @@
+import numpy as np
+from numba import njit, prange
+
+# Number of uniforms generated at once by the counter-based generator (per block of chains).
+RNG_BUFFER_SIZE = 1024
+
+# SplitMix64 increment (odd, 2**64 / golden ratio) and conversion of the top 53 bits to [0, 1).
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_TO_UNIT = 1.0 / 9007199254740992.0
+
+
+@njit(cache=True)
+def _splitmix64(z):
+    """SplitMix64 output function (a bijective 64-bit mixer)."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+@njit(cache=True)
+def _fill_uniforms(key, counter, out):
+    """
+    Fill `out` with the counter-based uniforms ``counter + 1, counter + 2, ...`` of stream `key`.
+
+    Uniform ``i`` of a stream is ``splitmix64(key + i * GAMMA)`` (the SplitMix64
+    sequence started at `key`), so it depends only on the key and the counter
+    and the loop has no serial dependency.
+    """
+    for i in range(len(out)):
+        z = _splitmix64(key + np.uint64(counter + i + 1) * _GAMMA)
+        out[i] = (z >> np.uint64(11)) * _TO_UNIT
+
+
+@njit(cache=True)
+def _stream_key(seed):
+    """64-bit key of the counter-based stream of a uint32 block seed."""
+    return _splitmix64(np.uint64(seed) * _GAMMA)
+
+
+@njit(cache=True)
+def _draw(use_counter, key, buffer, state):
+    """
+    Next uniform of the selected generator.
+
+    With `use_counter`, read `buffer` and refill it from the counter-based
+    stream when it is exhausted (``state`` = [counter, position]); otherwise
+    call ``np.random.rand()`` (Numba's per-thread MT19937).
+    """
+    if not use_counter:
+        return np.random.rand()
+    if state[1] == len(buffer):
+        _fill_uniforms(key, state[0], buffer)
+        state[0] += len(buffer)
+        state[1] = 0
+    u = buffer[state[1]]
+    state[1] += 1
+    return u
+
+
+def counter_uniforms(seed, n, start=0):
+    """
+    Uniforms ``start:start + n`` of the counter-based stream of a uint32 seed.
+
+    Parameters
+    ----------
+    seed : int
+        Block seed.
+    n : int
+        Number of uniforms.
+    start : int, default=0
+        Position of the first uniform in the stream (random access).
+
+    Returns
+    -------
+    np.ndarray
+    """
+    out = np.empty(n)
+    # Numba returns the key as a Python int: keep it uint64 (int64 would promote to float64)
+    _fill_uniforms(np.uint64(_stream_key(seed)), start, out)
+    return out
+
+
+@njit(cache=True)
+def _joint_transitions(propagate_probs, cumulative_transitions):
+    """
+    Single-uniform partition of [0, 1] after each monomer.
+
+    ``u <= joint[s, j]`` (first such ``j``) adds monomer ``j`` with probability
+    ``p_s * P_sj``; ``u > p_s = joint[s, -1]`` terminates the chain.
+    """
+    n_monomers = len(propagate_probs)
+    joint = np.empty((n_monomers, n_monomers))
+    for s in range(n_monomers):
+        for j in range(n_monomers):
+            joint[s, j] = propagate_probs[s] * cumulative_transitions[s, j]
+        joint[s, n_monomers - 1] = propagate_probs[s]
+    return joint
+
+
+@njit(cache=True)
+def _rng_chain(propagate_probs, cumulative_transitions, joint, start_monomer, chain_counts, use_counter,
+               single_uniform, key, buffer, state):
+    """
+    Grow one chain monomer by monomer with the selected generator and draw scheme.
+
+    Parameters
+    ----------
+    propagate_probs, cumulative_transitions : np.ndarray
+        Arrays of the `KineticModel`.
+    joint : np.ndarray
+        Table of `_joint_transitions`.
+    start_monomer : int
+        Index of the first monomer of the chain.
+    chain_counts : np.ndarray
+        Output, number of monomers of each type in the chain.
+    use_counter : bool
+        Counter-based uniforms instead of MT19937.
+    single_uniform : bool
+        One uniform per monomer (termination and monomer choice from the same
+        draw) instead of two.
+    key, buffer, state
+        Stream of the counter-based generator (see `_draw`).
+
+    Returns
+    -------
+    int
+        Chain length.
+    """
+    chain_counts[:] = 0
+    chain_counts[start_monomer] = 1
+    chain_length = 1
+    last_monomer = start_monomer
+
+    while True:
+        u = _draw(use_counter, key, buffer, state)
+        if u > propagate_probs[last_monomer]:
+            break
+
+        if not single_uniform:
+            u = _draw(use_counter, key, buffer, state)
+            nxt = 0
+            while u > cumulative_transitions[last_monomer, nxt]:
+                nxt += 1
+        else:
+            nxt = 0
+            while u > joint[last_monomer, nxt]:
+                nxt += 1
+        chain_length += 1
+        chain_counts[nxt] += 1
+        last_monomer = nxt
+
+    return chain_length
+
+
+@njit(parallel=True, cache=True)
+def _generate_chain_rng(block_seeds, block_size, propagate_probs, cumulative_transitions, start_monomer,
+                        use_counter, single_uniform, buffer_size, chain_lengths, counts):
+    """
+    Generate chains in parallel over blocks with a selectable uniform source.
+
+    Each block draws from its own stream: MT19937 seeded with the block seed,
+    or the counter-based stream keyed by it, read through a private buffer of
+    `buffer_size` uniforms. The ensemble is independent of the thread count.
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
+    propagate_probs, cumulative_transitions : np.ndarray
+        Arrays of the `KineticModel`.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    use_counter, single_uniform : bool
+        Generator and draw scheme (see `_rng_chain`).
+    buffer_size : int
+        Uniforms per refill of the counter-based generator.
+    chain_lengths : np.ndarray
+        Output, length of each chain, shape ``(num_chains,)``.
+    counts : np.ndarray
+        Output, number of monomers of each type per chain, shape ``(n_monomers, num_chains)``.
+    """
+    num_chains = len(chain_lengths)
+    joint = _joint_transitions(propagate_probs, cumulative_transitions)
+
+    for block in prange(len(block_seeds)):
+        key = _stream_key(block_seeds[block])
+        buffer = np.empty(buffer_size)
+        state = np.zeros(2, dtype=np.int64)
+        state[1] = buffer_size  # fill on the first draw
+        if not use_counter:
+            np.random.seed(block_seeds[block])
+        for i in range(block * block_size, min((block + 1) * block_size, num_chains)):
+            chain_lengths[i] = _rng_chain(propagate_probs, cumulative_transitions, joint, start_monomer,
+                                          counts[:, i], use_counter, single_uniform, key, buffer, state)
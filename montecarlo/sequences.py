@@ -0,0 +1,795 @@
+import numpy as np
+import numba
+from numba import njit, prange, types
+from numba.typed import List
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import (
+    BLOCK_SIZE, KERNEL_ENGINES, _block_seeds, _numba_threads, _resolve_engine, _skip_tables
+)
+
+# Chains decoded at once by the vectorized decoders (bounds their temporary arrays).
+DECODE_CHUNK_SIZE = 2**16
+
+
+def bits_per_monomer(n_monomers):
+    """
+    Width of a packed monomer code: 2 bits up to 4 monomer types, 4 bits up to 16.
+
+    Parameters
+    ----------
+    n_monomers : int
+        Number of monomer types.
+
+    Returns
+    -------
+    int
+    """
+    if n_monomers <= 4:
+        return 2
+    if n_monomers <= 16:
+        return 4
+    raise ValueError("sequence recording supports at most 16 monomer types")
+
+
+@njit(cache=True)
+def _put(packed, offset, position, code, bits):
+    """Write the code of the monomer at `position` of the chain starting at byte `offset`."""
+    per_byte = 8 // bits
+    packed[offset + position // per_byte] |= code << ((position % per_byte) * bits)
+
+
+@njit(cache=True)
+def _reserve(packed, offset, length, bits):
+    """
+    Make room for a chain of `length` monomers starting at byte `offset`.
+
+    Returns
+    -------
+    np.ndarray
+        `packed`, or a zero-filled copy at least twice as large.
+    """
+    size = offset + (length + 8 // bits - 1) // (8 // bits)
+    if size <= len(packed):
+        return packed
+    grown = np.zeros(max(2 * len(packed), size), dtype=np.uint8)
+    grown[:len(packed)] = packed
+    return grown
+
+
+@njit(cache=True)
+def _numba_sequence(propagate_probs, cumulative_transitions, start_monomer, packed, offset, bits):
+    """
+    Grow one chain monomer by monomer and write its sequence.
+
+    Same random draws as `montecarlo.simulation._numba_chain`, so for a given
+    RNG state the chain is the same.
+
+    Returns
+    -------
+    packed : np.ndarray
+        The buffer (grown if the chain did not fit).
+    chain_length : int
+    """
+    capacity = (len(packed) - offset) * (8 // bits)
+    if capacity < 1:
+        packed = _reserve(packed, offset, 1, bits)
+        capacity = (len(packed) - offset) * (8 // bits)
+    _put(packed, offset, 0, start_monomer, bits)
+    chain_length = 1
+    last_monomer = start_monomer
+
+    while True:
+        if np.random.rand() > propagate_probs[last_monomer]:
+            break
+
+        rnd = np.random.rand()
+        nxt = 0
+        while rnd > cumulative_transitions[last_monomer, nxt]:
+            nxt += 1
+        if chain_length == capacity:
+            packed = _reserve(packed, offset, chain_length + 1, bits)
+            capacity = (len(packed) - offset) * (8 // bits)
+        _put(packed, offset, chain_length, nxt, bits)
+        chain_length += 1
+        last_monomer = nxt
+
+    return packed, chain_length
+
+
+@njit(cache=True)
+def _skip_sequence(log_stay, terminate_given_exit, switch_cum, start_monomer, packed, offset, bits):
+    """
+    Grow one chain run by run and write its sequence.
+
+    Same random draws as `montecarlo.simulation._skip_chain`.
+
+    Returns
+    -------
+    packed : np.ndarray
+        The buffer (grown if the chain did not fit).
+    chain_length : int
+    """
+    packed = _reserve(packed, offset, 1, bits)
+    _put(packed, offset, 0, start_monomer, bits)
+    chain_length = 1
+    state = start_monomer
+
+    while True:
+        run = int(np.log(1.0 - np.random.rand()) / log_stay[state])
+        # Room for the run and the switch that may follow it
+        packed = _reserve(packed, offset, chain_length + run + 1, bits)
+        for position in range(chain_length, chain_length + run):
+            _put(packed, offset, position, state, bits)
+        chain_length += run
+
+        if np.random.rand() < terminate_given_exit[state]:
+            break
+
+        rnd = np.random.rand()
+        nxt = 0
+        while nxt == state or rnd >= switch_cum[state, nxt]:
+            nxt += 1
+        _put(packed, offset, chain_length, nxt, bits)
+        chain_length += 1
+        state = nxt
+
+    return packed, chain_length
+
+
+@njit(parallel=True, cache=True)
+def _record_sequences_kernel(block_seeds, block_size, use_skip, propagate_probs, cumulative_transitions,
+                             transition_matrix, start_monomer, bits, chain_lengths):
+    """
+    Generate the chains and write their packed sequences, in parallel over blocks of chains.
+
+    Each block writes its chains one after the other, every chain starting
+    on a byte boundary, into a private buffer grown by doubling. The block
+    buffers are then concatenated at the prefix sum of their sizes, so the
+    chains are generated once and no two threads ever write the same byte.
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
+    use_skip : bool
+        If True, grow chains with the run-length engine, else monomer by monomer.
+    propagate_probs, cumulative_transitions, transition_matrix : np.ndarray
+        Arrays of the `KineticModel`.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    bits : int
+        Bits per monomer code (2 or 4).
+    chain_lengths : np.ndarray
+        Output, length of each chain.
+
+    Returns
+    -------
+    np.ndarray
+        The packed sequences (uint8), chain after chain.
+    """
+    num_chains = len(chain_lengths)
+    n_blocks = len(block_seeds)
+    per_byte = 8 // bits
+    log_stay, terminate_given_exit, switch_cum = _skip_tables(propagate_probs, transition_matrix)
+
+    buffers = List.empty_list(types.uint8[::1])
+    for block in range(n_blocks):
+        buffers.append(np.empty(0, dtype=np.uint8))
+    block_bytes = np.zeros(n_blocks, dtype=np.int64)
+
+    for block in prange(n_blocks):
+        np.random.seed(block_seeds[block])
+        buffer = np.zeros(block_size, dtype=np.uint8)
+        used = 0
+        for i in range(block * block_size, min((block + 1) * block_size, num_chains)):
+            if use_skip:
+                buffer, length = _skip_sequence(log_stay, terminate_given_exit, switch_cum, start_monomer,
+                                                buffer, used, bits)
+            else:
+                buffer, length = _numba_sequence(propagate_probs, cumulative_transitions, start_monomer,
+                                                 buffer, used, bits)
+            chain_lengths[i] = length
+            used += (length + per_byte - 1) // per_byte
+        buffers[block] = buffer
+        block_bytes[block] = used
+
+    block_offsets = np.zeros(n_blocks + 1, dtype=np.int64)
+    block_offsets[1:] = np.cumsum(block_bytes)
+    packed = np.empty(block_offsets[-1], dtype=np.uint8)
+    for block in prange(n_blocks):
+        start, size = block_offsets[block], block_bytes[block]
+        packed[start:start + size] = buffers[np.int64(block)][:size]
+    return packed
+
+
+@njit(cache=True)
+def _emit(monomer, count, history, dyads, triads):
+    """
+    Count the dyads and triads formed by appending `count` copies of `monomer`.
+
+    ``history`` holds the two previous monomers (-1 before the chain start)
+    and is updated in place.
+    """
+    before_last, last = history[0], history[1]
+    if last >= 0:
+        dyads[last, monomer] += 1
+        if before_last >= 0:
+            triads[before_last, last, monomer] += 1
+    if count >= 2:
+        dyads[monomer, monomer] += count - 1
+        if last >= 0:
+            triads[last, monomer, monomer] += 1
+        if count >= 3:
+            triads[monomer, monomer, monomer] += count - 2
+        history[0] = monomer
+    else:
+        history[0] = last
+    history[1] = monomer
+
+
+@njit(cache=True)
+def _count_run(run_hist, run_sums, monomer, length):
+    """Add one run to the block-length histogram (the last bin collects longer runs)."""
+    run_hist[monomer, min(length, run_hist.shape[1] - 1)] += 1
+    run_sums[monomer] += length
+
+
+@njit(cache=True)
+def _numba_chain_statistics(propagate_probs, cumulative_transitions, start_monomer, history, dyads, triads,
+                            run_hist, run_sums):
+    """
+    Grow one chain monomer by monomer, counting its dyads, triads and runs.
+
+    Same random draws as `montecarlo.simulation._numba_chain`.
+
+    Returns
+    -------
+    int
+        Chain length.
+    """
+    history[0] = history[1] = -1
+    _emit(start_monomer, 1, history, dyads, triads)
+    chain_length = 1
+    run = 1
+    last_monomer = start_monomer
+
+    while True:
+        if np.random.rand() > propagate_probs[last_monomer]:
+            break
+
+        rnd = np.random.rand()
+        nxt = 0
+        while rnd > cumulative_transitions[last_monomer, nxt]:
+            nxt += 1
+        _emit(nxt, 1, history, dyads, triads)
+        chain_length += 1
+        if nxt == last_monomer:
+            run += 1
+        else:
+            _count_run(run_hist, run_sums, last_monomer, run)
+            run = 1
+        last_monomer = nxt
+
+    _count_run(run_hist, run_sums, last_monomer, run)
+    return chain_length
+
+
+@njit(cache=True)
+def _skip_chain_statistics(log_stay, terminate_given_exit, switch_cum, start_monomer, history, dyads, triads,
+                           run_hist, run_sums):
+    """
+    Grow one chain run by run, counting its dyads, triads and runs.
+
+    Same random draws as `montecarlo.simulation._skip_chain`; every run is
+    counted in O(1) whatever its length.
+
+    Returns
+    -------
+    int
+        Chain length.
+    """
+    history[0] = history[1] = -1
+    chain_length = 0
+    state = start_monomer
+
+    while True:
+        run = 1 + int(np.log(1.0 - np.random.rand()) / log_stay[state])
+        _emit(state, run, history, dyads, triads)
+        _count_run(run_hist, run_sums, state, run)
+        chain_length += run
+
+        if np.random.rand() < terminate_given_exit[state]:
+            break
+
+        rnd = np.random.rand()
+        nxt = 0
+        while nxt == state or rnd >= switch_cum[state, nxt]:
+            nxt += 1
+        state = nxt
+
+    return chain_length
+
+
+@njit(parallel=True, cache=True)
+def _sequence_statistics_kernel(block_seeds, block_size, num_chains, use_skip, propagate_probs,
+                                cumulative_transitions, transition_matrix, start_monomer, max_run, n_slots):
+    """
+    Generate chains and count their dyads, triads and runs without storing them.
+
+    The blocks are dealt round-robin to `n_slots` parallel workers, each with
+    its own integer counters, summed at the end (exact and independent of the
+    thread count).
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
+    num_chains : int
+        Number of chains to generate.
+    use_skip : bool
+        If True, grow chains with the run-length engine, else monomer by monomer.
+    propagate_probs, cumulative_transitions, transition_matrix : np.ndarray
+        Arrays of the `KineticModel`.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    max_run : int
+        Last bin of the block-length histograms (longer runs are counted there).
+    n_slots : int
+        Number of private counter sets.
+
+    Returns
+    -------
+    dyads : np.ndarray
+        Shape ``(n_monomers, n_monomers)``.
+    triads : np.ndarray
+        Shape ``(n_monomers, n_monomers, n_monomers)``.
+    run_hist : np.ndarray
+        Number of runs of each length per monomer, shape ``(n_monomers, max_run + 1)``.
+    run_sums : np.ndarray
+        Total length of the runs of each monomer.
+    """
+    m = len(propagate_probs)
+    slot_dyads = np.zeros((n_slots, m, m), dtype=np.int64)
+    slot_triads = np.zeros((n_slots, m, m, m), dtype=np.int64)
+    slot_run_hist = np.zeros((n_slots, m, max_run + 1), dtype=np.int64)
+    slot_run_sums = np.zeros((n_slots, m), dtype=np.int64)
+    log_stay, terminate_given_exit, switch_cum = _skip_tables(propagate_probs, transition_matrix)
+
+    for slot in prange(n_slots):
+        history = np.empty(2, dtype=np.int64)
+        for block in range(slot, len(block_seeds), n_slots):
+            np.random.seed(block_seeds[block])
+            for _ in range(block * block_size, min((block + 1) * block_size, num_chains)):
+                if use_skip:
+                    _skip_chain_statistics(log_stay, terminate_given_exit, switch_cum, start_monomer, history,
+                                           slot_dyads[slot], slot_triads[slot], slot_run_hist[slot],
+                                           slot_run_sums[slot])
+                else:
+                    _numba_chain_statistics(propagate_probs, cumulative_transitions, start_monomer, history,
+                                            slot_dyads[slot], slot_triads[slot], slot_run_hist[slot],
+                                            slot_run_sums[slot])
+
+    return slot_dyads.sum(axis=0), slot_triads.sum(axis=0), slot_run_hist.sum(axis=0), slot_run_sums.sum(axis=0)
+
+
+class ChainSequences:
+    """
+    Monomer sequences of a chain ensemble, bit-packed in CSR layout.
+
+    Chain ``i`` occupies the bytes ``packed[offsets[i]:offsets[i + 1]]``, with
+    ``8 // bits`` monomer codes per byte (first monomer in the lowest bits);
+    the unused codes of its last byte are padding. Decoding is vectorized and
+    done `DECODE_CHUNK_SIZE` chains at a time.
+
+    Parameters
+    ----------
+    packed : np.ndarray
+        uint8 buffer of packed monomer codes.
+    offsets : np.ndarray
+        Byte offset of each chain, ``n_chains + 1`` entries.
+    chain_lengths : np.ndarray
+        Number of monomers of each chain.
+    bits : int
+        Bits per monomer code (2 or 4).
+    names : sequence of str
+        Monomer labels; the code of a monomer is its index.
+    """
+
+    def __init__(self, packed, offsets, chain_lengths, bits, names):
+        self.packed = np.asarray(packed, dtype=np.uint8)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.chain_lengths = np.asarray(chain_lengths, dtype=np.int64)
+        self.bits = int(bits)
+        self.names = tuple(names)
+        if len(self.offsets) != len(self.chain_lengths) + 1:
+            raise ValueError("offsets must have one more entry than chain_lengths")
+
+    def __len__(self):
+        return len(self.chain_lengths)
+
+    def __repr__(self):
+        return f"ChainSequences(n_chains={len(self)}, bits={self.bits}, nbytes={self.nbytes})"
+
+    @property
+    def nbytes(self):
+        """Memory used by the packed sequences and the offsets, in bytes."""
+        return self.packed.nbytes + self.offsets.nbytes
+
+    def _code(self, monomer):
+        """Code of a monomer given by index or name."""
+        return self.names.index(monomer) if isinstance(monomer, str) else int(monomer)
+
+    def decode(self, start=0, stop=None):
+        """
+        Monomer codes of the chains ``start:stop``, concatenated.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            Chain range. Default: all chains.
+
+        Returns
+        -------
+        codes : np.ndarray
+            uint8 monomer codes.
+        chain_offsets : np.ndarray
+            Start of each chain in `codes`, ``stop - start + 1`` entries.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        per_byte = 8 // self.bits
+        first, last = self.offsets[start], self.offsets[stop]
+        shifts = np.arange(0, 8, self.bits, dtype=np.uint8)
+        slots = ((self.packed[first:last, np.newaxis] >> shifts) & ((1 << self.bits) - 1)).ravel()
+
+        lengths = self.chain_lengths[start:stop]
+        chain_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=chain_offsets[1:])
+        # Drop the padding codes at the end of each chain's last byte
+        n_slots = np.diff(self.offsets[start:stop + 1]) * per_byte
+        position = np.arange(len(slots)) - np.repeat((self.offsets[start:stop] - first) * per_byte, n_slots)
+        return slots[position < np.repeat(lengths, n_slots)], chain_offsets
+
+    def sequence(self, index):
+        """
+        Monomer codes of one chain.
+
+        Returns
+        -------
+        np.ndarray
+            uint8 codes (indices into `names`).
+        """
+        return self.decode(index, index + 1)[0]
+
+    def _chunks(self):
+        """Yield ``(start, codes, chain_offsets)`` for consecutive ranges of chains."""
+        for start in range(0, len(self), DECODE_CHUNK_SIZE):
+            yield (start, *self.decode(start, start + DECODE_CHUNK_SIZE))
+
+    def counts(self):
+        """
+        Number of monomers of each type per chain.
+
+        Returns
+        -------
+        np.ndarray
+            Shape ``(n_monomers, n_chains)``.
+        """
+        counts = np.zeros((len(self.names), len(self)), dtype=np.int64)
+        for start, codes, chain_offsets in self._chunks():
+            n = len(chain_offsets) - 1
+            chain_index = np.repeat(np.arange(n), np.diff(chain_offsets))
+            flat = np.bincount(codes.astype(np.int64) * n + chain_index, minlength=len(self.names) * n)
+            counts[:, start:start + n] = flat.reshape(len(self.names), n)
+        return counts
+
+    @staticmethod
+    def _run_starts(codes, chain_offsets):
+        """Index of the first monomer of every run (a new chain always starts a run)."""
+        is_start = np.ones(len(codes), dtype=bool)
+        is_start[1:] = codes[1:] != codes[:-1]
+        is_start[chain_offsets[:-1]] = True
+        return np.flatnonzero(is_start)
+
+    def runs(self):
+        """
+        Run-length encoding of every chain (runs never span two chains).
+
+        Returns
+        -------
+        monomers : np.ndarray
+            Monomer code of each run.
+        lengths : np.ndarray
+            Number of monomers of each run.
+        chains : np.ndarray
+            Chain index of each run.
+        """
+        all_monomers, all_lengths, all_chains = [], [], []
+        for start, codes, chain_offsets in self._chunks():
+            run_starts = self._run_starts(codes, chain_offsets)
+            all_monomers.append(codes[run_starts])
+            all_lengths.append(np.diff(np.append(run_starts, len(codes))))
+            all_chains.append(np.searchsorted(chain_offsets, run_starts, side="right") - 1 + start)
+        if not all_monomers:
+            return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(all_monomers), np.concatenate(all_lengths), np.concatenate(all_chains)
+
+    def block_lengths(self, monomer):
+        """
+        Block-length distribution of one monomer: number of runs of each length.
+
+        Parameters
+        ----------
+        monomer : int or str
+            Monomer index or name.
+
+        Returns
+        -------
+        np.ndarray
+            Entry ``k`` is the number of runs of exactly ``k`` monomers.
+        """
+        code = self._code(monomer)
+        histogram = np.zeros(1, dtype=np.int64)
+        for _, codes, chain_offsets in self._chunks():
+            run_starts = self._run_starts(codes, chain_offsets)
+            lengths = np.diff(np.append(run_starts, len(codes)))[codes[run_starts] == code]
+            chunk_histogram = np.bincount(lengths)
+            if len(chunk_histogram) > len(histogram):
+                histogram = np.pad(histogram, (0, len(chunk_histogram) - len(histogram)))
+            histogram[:len(chunk_histogram)] += chunk_histogram
+        return histogram
+
+    def count_pattern(self, pattern):
+        """
+        Number of occurrences of a monomer pattern in each chain (overlaps counted).
+
+        Parameters
+        ----------
+        pattern : str or sequence
+            Monomer names (e.g. "ABA" with single-letter names) or codes.
+
+        Returns
+        -------
+        np.ndarray
+            Occurrences per chain.
+        """
+        codes_pattern = [self._code(monomer) for monomer in pattern]
+        k = len(codes_pattern)
+        occurrences = np.zeros(len(self), dtype=np.int64)
+        for start, codes, chain_offsets in self._chunks():
+            n_positions = len(codes) - k + 1
+            if n_positions <= 0:
+                continue
+            match = np.ones(n_positions, dtype=bool)
+            for j, code in enumerate(codes_pattern):
+                match &= codes[j:j + n_positions] == code
+            positions = np.flatnonzero(match)
+            chains = np.searchsorted(chain_offsets, positions, side="right") - 1
+            # The whole pattern must lie in the chain where it starts
+            positions = positions[positions + k <= chain_offsets[chains + 1]]
+            chains = np.searchsorted(chain_offsets, positions, side="right") - 1
+            n = len(chain_offsets) - 1
+            occurrences[start:start + n] += np.bincount(chains, minlength=n)
+        return occurrences
+
+    def statistics(self, max_run=1000):
+        """
+        Dyad, triad and block-length counts of the recorded chains.
+
+        Parameters
+        ----------
+        max_run : int, default=1000
+            Last bin of the block-length histograms.
+
+        Returns
+        -------
+        SequenceStatistics
+        """
+        m = len(self.names)
+        statistics = SequenceStatistics(m, max_run, self.names)
+        for _, codes, chain_offsets in self._chunks():
+            codes = codes.astype(np.int64)
+            # Windows starting at position i are valid if they end in the same chain
+            chain_end = np.repeat(chain_offsets[1:], np.diff(chain_offsets))
+            for order, counts in ((2, statistics.dyads), (3, statistics.triads)):
+                valid = np.flatnonzero(np.arange(len(codes)) + order <= chain_end)
+                index = np.zeros(len(valid), dtype=np.int64)
+                for j in range(order):
+                    index = index * m + codes[valid + j]
+                counts += np.bincount(index, minlength=m ** order).reshape(counts.shape)
+            run_starts = self._run_starts(codes, chain_offsets)
+            lengths = np.diff(np.append(run_starts, len(codes)))
+            monomers = codes[run_starts]
+            np.add.at(statistics.run_hist, (monomers, np.minimum(lengths, max_run)), 1)
+            statistics.run_sums += np.bincount(monomers, weights=lengths, minlength=m).astype(np.int64)
+        return statistics
+
+    def save(self, path):
+        """
+        Save the packed sequences to a ``.npz`` file.
+
+        Parameters
+        ----------
+        path : str or Path
+            Output file.
+        """
+        np.savez(path, packed=self.packed, offsets=self.offsets, chain_lengths=self.chain_lengths,
+                 bits=self.bits, names=np.array(self.names))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load sequences saved with `save`.
+
+        Returns
+        -------
+        ChainSequences
+        """
+        with np.load(path) as data:
+            return cls(data["packed"], data["offsets"], data["chain_lengths"], int(data["bits"]),
+                       [str(name) for name in data["names"]])
+
+
+class SequenceStatistics:
+    """
+    Dyad, triad and block-length (run-length) counts of a chain ensemble.
+
+    These are the quantities measured by 13C NMR. All counts are int64, so
+    partial statistics (per thread, chunk or run) merge exactly.
+
+    Parameters
+    ----------
+    n_monomers : int, default=3
+        Number of monomer types.
+    max_run : int, default=1000
+        Last bin of the block-length histograms; it also counts longer runs.
+    names : sequence of str, optional
+        Monomer labels. Default: "A", "B", "C", ...
+    """
+
+    def __init__(self, n_monomers=3, max_run=1000, names=None):
+        m = n_monomers
+        self.names = tuple(names) if names is not None else tuple(chr(ord("A") + i) for i in range(m))
+        self.dyads = np.zeros((m, m), dtype=np.int64)
+        self.triads = np.zeros((m, m, m), dtype=np.int64)
+        self.run_hist = np.zeros((m, max_run + 1), dtype=np.int64)
+        self.run_sums = np.zeros(m, dtype=np.int64)
+
+    def merge(self, other):
+        """Add the counts of another `SequenceStatistics` with the same bins."""
+        if other.run_hist.shape != self.run_hist.shape:
+            raise ValueError("cannot merge statistics with different shapes")
+        self.dyads += other.dyads
+        self.triads += other.triads
+        self.run_hist += other.run_hist
+        self.run_sums += other.run_sums
+        return self
+
+    def fractions(self, order=2, symmetric=False):
+        """
+        Dyad (``order=2``) or triad (``order=3``) fractions.
+
+        Parameters
+        ----------
+        order : {2, 3}
+            Length of the sequences.
+        symmetric : bool, default=False
+            Add each sequence to its reverse (AB + BA, AAB + BAA), as resolved by NMR.
+
+        Returns
+        -------
+        dict
+            Sequence label (e.g. "AB") mapped to its fraction.
+        """
+        counts = {2: self.dyads, 3: self.triads}[order]
+        total = counts.sum()
+        fractions = {}
+        for index in np.ndindex(counts.shape):
+            if symmetric and index[::-1] < index:
+                continue
+            count = counts[index]
+            if symmetric and index[::-1] != index:
+                count += counts[index[::-1]]
+            fractions["".join(self.names[i] for i in index)] = float(count / total) if total else 0.0
+        return fractions
+
+    @property
+    def mean_block_lengths(self):
+        """Number-average run length of each monomer."""
+        n_runs = self.run_hist.sum(axis=1)
+        return self.run_sums / np.where(n_runs > 0, n_runs, 1)
+
+    def to_frame(self, symmetric=False):
+        """
+        Table of the dyad and triad fractions.
+
+        Returns
+        -------
+        pd.DataFrame
+            order | sequence | fraction
+        """
+        import pandas as pd
+        rows = [(order, sequence, fraction) for order in (2, 3)
+                for sequence, fraction in self.fractions(order, symmetric).items()]
+        return pd.DataFrame(rows, columns=["order", "sequence", "fraction"])
+
+
+def sequence_statistics(num_chains: int, max_run: int = 1000, use_numba: bool = True, n_threads: int = None,
+                        seed: int = None, engine: str = None, model: KineticModel = None):
+    """
+    Generate chains and return only their dyad, triad and block-length counts.
+
+    The counts are updated inside the Numba kernel as each chain grows (the
+    skip engine counts a whole run in O(1)), so no sequence is stored. For a
+    given seed they are those of ``record_sequences(...).statistics()``.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    max_run : int, default=1000
+        Last bin of the block-length histograms.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains` (here `use_numba` defaults to True). Only the
+        `KERNEL_ENGINES` ("numba", "skip") are supported.
+
+    Returns
+    -------
+    SequenceStatistics
+    """
+    engine, model = _resolve_engine(engine, use_numba, model)
+    if engine not in KERNEL_ENGINES:
+        raise ValueError(f"sequence statistics need one of the engines {list(KERNEL_ENGINES)}")
+    statistics = SequenceStatistics(model.n_monomers, max_run, model.names)
+    with _numba_threads(n_threads):
+        dyads, triads, run_hist, run_sums = _sequence_statistics_kernel(
+            _block_seeds(num_chains, seed), BLOCK_SIZE, num_chains, engine == "skip", model.propagate_probs,
+            model.cumulative_transitions, model.transition_matrix, model.start_monomer, max_run,
+            4 * numba.get_num_threads())
+    statistics.dyads += dyads
+    statistics.triads += triads
+    statistics.run_hist += run_hist
+    statistics.run_sums += run_sums
+    return statistics
+
+
+def record_sequences(num_chains: int, use_numba: bool = True, n_threads: int = None, seed: int = None,
+                     engine: str = None, model: KineticModel = None):
+    """
+    Generate chains and record their full monomer sequences.
+
+    Every chain is generated once: each block of chains writes its codes
+    into its own growable buffer, and the buffers are concatenated at the
+    end (so memory briefly peaks at twice the packed size). For a given seed
+    the chains are those of `generate_chains`.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains` (here `use_numba` defaults to True). Only the
+        `KERNEL_ENGINES` ("numba", "skip") record sequences.
+
+    Returns
+    -------
+    ChainSequences
+    """
+    engine, model = _resolve_engine(engine, use_numba, model)
+    if engine not in KERNEL_ENGINES:
+        raise ValueError(f"sequence recording needs one of the engines {list(KERNEL_ENGINES)}")
+    bits = bits_per_monomer(model.n_monomers)
+    per_byte = 8 // bits
+
+    block_seeds = _block_seeds(num_chains, seed)
+    chain_lengths = np.empty(num_chains, dtype=np.int64)
+    with _numba_threads(n_threads):
+        packed = _record_sequences_kernel(block_seeds, BLOCK_SIZE, engine == "skip", model.propagate_probs,
+                                          model.cumulative_transitions, model.transition_matrix,
+                                          model.start_monomer, bits, chain_lengths)
+    offsets = np.zeros(num_chains + 1, dtype=np.int64)
+    np.cumsum(-(-chain_lengths // per_byte), out=offsets[1:])
+    return ChainSequences(packed, offsets, chain_lengths, bits, model.names)
@@ -1,246 +1,833 @@
+from contextlib import contextmanager
 import numpy as np
+import numba
 from numba import njit, prange
+from montecarlo.kinetics import KineticModel
+from montecarlo.rng import RNG_BUFFER_SIZE, _generate_chain_rng
+from montecarlo.accumulators import (
+    WHistogramAccumulator, LengthHistogramAccumulator, MomentAccumulator, accumulate, LENGTH_MOMENT_ORDER
+)
 
-def _generate_chain_python(num_chains: int):
+# Number of chains generated from one RNG stream by the parallel Numba kernel.
+# It is fixed (not derived from the thread count) so that a given seed always
+# produces the same ensemble, whatever the number of threads.
+BLOCK_SIZE = 4096
+
+# Default number of chains per chunk of `iter_chains` (64 blocks, ~8 MB of buffers
+# for three monomers).
+DEFAULT_CHUNK_SIZE = 64 * BLOCK_SIZE
+
+ENGINES = ("python", "numba", "skip", "numba-single", "counter")
+
+# Engines with in-kernel reductions (histograms, moments, sweeps, sequences);
+# the others are streamed through `iter_chains`.
+KERNEL_ENGINES = ("numba", "skip")
+
+BACKENDS = ("local", "process")
+
+# Number of partial moment accumulators of `chain_moments`. Blocks are dealt to
+# them round-robin and they are merged in order, so the floating-point result
+# does not depend on the thread count either.
+MOMENT_SLOTS = 64
+
+DEFAULT_MODEL = KineticModel()
+
+def _generate_chain_python(model: KineticModel, rng, chain_lengths, counts):
+    """
+    Generate stationary Monte Carlo polymer chains (pure Python).
+
+    The chains are written into the preallocated output arrays, one per entry
+    of `chain_lengths`.
+
+    Parameters
+    ----------
+    model : KineticModel
+        Kinetic parameters of the polymerization.
+    rng : np.random.RandomState or module
+        Source of uniform random numbers (must provide ``rand()``).
+    chain_lengths : np.ndarray
+        Output, length of each polymer chain, shape ``(num_chains,)``.
+    counts : np.ndarray
+        Output, number of monomers of each type per chain, shape ``(n_monomers, num_chains)``.
+    """
+    propagate_probs = model.propagate_probs
+    cumulative_transitions = model.cumulative_transitions
+    n_monomers = model.n_monomers
+
+    for i in range(len(chain_lengths)):
+        chain_length = 1  # start with first monomer
+        last_monomer = model.start_monomer
+        chain_counts = [0] * n_monomers
+        chain_counts[last_monomer] = 1
+
+        while True:
+            rnd = rng.rand()
+
+            if rnd > propagate_probs[last_monomer]:  # terminate chain
+                break
+
+            # --- Monomer generation ---
+            chain_length += 1
+            rnd = rng.rand()
+            row = cumulative_transitions[last_monomer]
+            last_monomer = 0
+            while rnd > row[last_monomer]:
+                last_monomer += 1
+            chain_counts[last_monomer] += 1
+
+        chain_lengths[i] = chain_length
+        counts[:, i] = chain_counts
+
+@njit(cache=True)
+def _numba_chain(propagate_probs, cumulative_transitions, start_monomer, chain_counts):
+    """
+    Grow one chain monomer by monomer (Numba).
+
+    Parameters
+    ----------
+    propagate_probs : np.ndarray
+        Propagation probability after each monomer, shape ``(n_monomers,)``.
+    cumulative_transitions : np.ndarray
+        Row-wise cumulative transition probabilities, shape ``(n_monomers, n_monomers)``.
+    start_monomer : int
+        Index of the first monomer of the chain.
+    chain_counts : np.ndarray
+        Output, number of monomers of each type in the chain, shape ``(n_monomers,)``.
+
+    Returns
+    -------
+    int
+        Chain length.
+    """
+    chain_counts[:] = 0
+    chain_counts[start_monomer] = 1
+    chain_length = 1
+    last_monomer = start_monomer
+
+    while True:
+        if np.random.rand() > propagate_probs[last_monomer]:
+            break
+
+        chain_length += 1
+        rnd = np.random.rand()
+        nxt = 0
+        while rnd > cumulative_transitions[last_monomer, nxt]:
+            nxt += 1
+        chain_counts[nxt] += 1
+        last_monomer = nxt
+
+    return chain_length
+
+
+@njit(cache=True)
+def _skip_tables(propagate_probs, transition_matrix):
     """
-    Generate stationary Monte Carlo polymer chains with three monomer types (A, B, C).
+    Precompute the run-length sampling tables of the skip engine.
+
+    A run of monomer ``s`` continues with probability ``p_s * P_ss``, so its length
+    is geometric. When the run stops, it is a termination with probability
+    ``(1 - p_s) / (1 - p_s * P_ss)``, otherwise a switch to ``j != s`` with
+    probability ``P_sj / (1 - P_ss)``. A run with ``p_s * P_ss == 1`` never ends
+    and raises ValueError.
+
+    Parameters
+    ----------
+    propagate_probs : np.ndarray
+        Propagation probability after each monomer, shape ``(n_monomers,)``.
+    transition_matrix : np.ndarray
+        Monomer transition probabilities, shape ``(n_monomers, n_monomers)``.
+
+    Returns
+    -------
+    log_stay : np.ndarray
+        Log of the run continuation probability of each monomer.
+    terminate_given_exit : np.ndarray
+        Probability that a run of each monomer ends by termination.
+    switch_cum : np.ndarray
+        Row-wise cumulative switch probabilities, shape ``(n_monomers, n_monomers)``.
+    """
+    n_monomers = len(propagate_probs)
+    log_stay = np.empty(n_monomers)
+    terminate_given_exit = np.empty(n_monomers)
+    switch_cum = np.zeros((n_monomers, n_monomers))
+    for s in range(n_monomers):
+        stay = propagate_probs[s] * transition_matrix[s, s]
+        if stay >= 1.0:
+            raise ValueError("a run that always continues never ends (propagate_probs * P_ss == 1)")
+        log_stay[s] = np.log(stay) if stay > 0.0 else -np.inf
+        terminate_given_exit[s] = (1.0 - propagate_probs[s]) / (1.0 - stay)
+        leave = 1.0 - transition_matrix[s, s]
+        acc = 0.0
+        for j in range(n_monomers):
+            if j != s and leave > 0.0:
+                acc += transition_matrix[s, j] / leave
+            switch_cum[s, j] = acc
+        # Close the row on its last column j != s (column s is never selected), so that
+        # rounding of the cumulative sum cannot send the switch search past the last monomer
+        last = n_monomers - 1 if s != n_monomers - 1 else n_monomers - 2
+        if last >= 0:
+            switch_cum[s, last:] = 1.0
+    return log_stay, terminate_given_exit, switch_cum
+
+
+@njit(cache=True)
+def _skip_chain(log_stay, terminate_given_exit, switch_cum, start_monomer, chain_counts):
+    """
+    Grow one chain run by run (Numba), see `_skip_tables`.
 
     Parameters
     ----------
+    log_stay, terminate_given_exit, switch_cum : np.ndarray
+        Tables from `_skip_tables`.
+    start_monomer : int
+        Index of the first monomer of the chain.
+    chain_counts : np.ndarray
+        Output, number of monomers of each type in the chain, shape ``(n_monomers,)``.
+
+    Returns
+    -------
+    int
+        Chain length.
+    """
+    chain_counts[:] = 0
+    chain_counts[start_monomer] = 1
+    chain_length = 1
+    state = start_monomer
+
+    while True:
+        run = int(np.log(1.0 - np.random.rand()) / log_stay[state])
+        chain_counts[state] += run
+        chain_length += run
+
+        if np.random.rand() < terminate_given_exit[state]:
+            break
+
+        rnd = np.random.rand()
+        nxt = 0
+        while nxt == state or rnd >= switch_cum[state, nxt]:
+            nxt += 1
+        chain_counts[nxt] += 1
+        chain_length += 1
+        state = nxt
+
+    return chain_length
+
+
+@njit(parallel=True, cache=True)
+def _generate_chain_numba(block_seeds, block_size, propagate_probs, cumulative_transitions,
+                          start_monomer, chain_lengths, counts):
+    """
+    Numba version of `_generate_chain_python`, parallelized over blocks of chains.
+
+    Each block of ``block_size`` chains reseeds the (thread-local) Numba RNG with
+    its own entry of ``block_seeds`` before generating, so the result only depends
+    on the seeds and never on which thread handled which block. The kinetic
+    parameters are passed as arrays, so the kernel compiles once per dtype
+    signature and serves any number of monomers.
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
+    propagate_probs : np.ndarray
+        Propagation probability after each monomer, shape ``(n_monomers,)``.
+    cumulative_transitions : np.ndarray
+        Row-wise cumulative transition probabilities, shape ``(n_monomers, n_monomers)``.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    chain_lengths : np.ndarray
+        Output, length of each chain, shape ``(num_chains,)``.
+    counts : np.ndarray
+        Output, number of monomers of each type per chain, shape ``(n_monomers, num_chains)``.
+    """
+    num_chains = len(chain_lengths)
+
+    for block in prange(len(block_seeds)):
+        np.random.seed(block_seeds[block])
+        for i in range(block * block_size, min((block + 1) * block_size, num_chains)):
+            chain_lengths[i] = _numba_chain(propagate_probs, cumulative_transitions, start_monomer,
+                                            counts[:, i])
+
+
+@njit(parallel=True, cache=True)
+def _generate_chain_skip(block_seeds, block_size, propagate_probs, transition_matrix,
+                         start_monomer, chain_lengths, counts):
+    """
+    Run-length ("skip-ahead") chain generation.
+
+    Instead of drawing every monomer, the number of further monomers of the
+    current type is drawn from its geometric distribution in one step; then a
+    single draw decides whether the run ends by termination or by a switch to
+    another monomer. The cost scales with the number of monomer transitions, not
+    with the chain length. Blocks and seeding work as in `_generate_chain_numba`.
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
+    propagate_probs : np.ndarray
+        Propagation probability after each monomer, shape ``(n_monomers,)``.
+    transition_matrix : np.ndarray
+        Monomer transition probabilities, shape ``(n_monomers, n_monomers)``.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    chain_lengths : np.ndarray
+        Output, length of each chain, shape ``(num_chains,)``.
+    counts : np.ndarray
+        Output, number of monomers of each type per chain, shape ``(n_monomers, num_chains)``.
+    """
+    num_chains = len(chain_lengths)
+    log_stay, terminate_given_exit, switch_cum = _skip_tables(propagate_probs, transition_matrix)
+
+    for block in prange(len(block_seeds)):
+        np.random.seed(block_seeds[block])
+        for i in range(block * block_size, min((block + 1) * block_size, num_chains)):
+            chain_lengths[i] = _skip_chain(log_stay, terminate_given_exit, switch_cum, start_monomer,
+                                           counts[:, i])
+
+
+@njit(parallel=True, cache=True)
+def _histogram_chains_kernel(block_seeds, block_size, num_chains, use_skip, propagate_probs,
+                             cumulative_transitions, transition_matrix, start_monomer, n_bins, length_edges,
+                             n_slots):
+    """
+    Generate chains and bin them on the fly, without storing them.
+
+    The blocks are dealt round-robin to `n_slots` parallel workers, each filling
+    its own W and length histograms (integer weights, so the reduction is exact
+    and independent of the thread count); they are summed at the end.
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
     num_chains : int
         Number of chains to generate.
+    use_skip : bool
+        If True, grow chains with the run-length engine, else monomer by monomer.
+    propagate_probs, cumulative_transitions, transition_matrix : np.ndarray
+        Arrays of the `KineticModel`.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    n_bins : int
+        Number of composition bins over [0, 1].
+    length_edges : np.ndarray
+        Increasing chain-length bin edges.
+    n_slots : int
+        Number of private histograms (at least the number of threads).
 
     Returns
     -------
+    w_hist : np.ndarray
+        Length-weighted composition histograms, shape ``(n_monomers, n_bins)``.
+    length_hist : np.ndarray
+        Number of chains per length bin, shape ``(len(length_edges) - 1,)``.
+    """
+    n_monomers = len(propagate_probs)
+    n_length_bins = len(length_edges) - 1
+    slot_w_hist = np.zeros((n_slots, n_monomers, n_bins), dtype=np.int64)
+    slot_length_hist = np.zeros((n_slots, n_length_bins), dtype=np.int64)
+    log_stay, terminate_given_exit, switch_cum = _skip_tables(propagate_probs, transition_matrix)
+
+    for slot in prange(n_slots):
+        chain_counts = np.empty(n_monomers, dtype=np.int64)
+        for block in range(slot, len(block_seeds), n_slots):
+            np.random.seed(block_seeds[block])
+            for _ in range(block * block_size, min((block + 1) * block_size, num_chains)):
+                if use_skip:
+                    chain_length = _skip_chain(log_stay, terminate_given_exit, switch_cum, start_monomer,
+                                               chain_counts)
+                else:
+                    chain_length = _numba_chain(propagate_probs, cumulative_transitions, start_monomer,
+                                                chain_counts)
+
+                for m in range(n_monomers):
+                    bin_index = min(chain_counts[m] * n_bins // chain_length, n_bins - 1)
+                    slot_w_hist[slot, m, bin_index] += chain_length
+
+                length_bin = np.searchsorted(length_edges, chain_length, side="right") - 1
+                length_bin = min(max(length_bin, 0), n_length_bins - 1)
+                slot_length_hist[slot, length_bin] += 1
+
+    return slot_w_hist.sum(axis=0), slot_length_hist.sum(axis=0)
+
+
+@njit(cache=True)
+def _neumaier(sums, comps, index, value):
+    """Add `value` to ``sums[index]``, accumulating the rounding error in ``comps[index]``."""
+    total = sums[index] + value
+    if abs(sums[index]) >= abs(value):
+        comps[index] += (sums[index] - total) + value
+    else:
+        comps[index] += (value - total) + sums[index]
+    sums[index] = total
+
+
+@njit(parallel=True, cache=True)
+def _moment_chains_kernel(block_seeds, block_size, num_chains, use_skip, propagate_probs,
+                          cumulative_transitions, transition_matrix, start_monomer, n_slots):
+    """
+    Generate chains and reduce them on the fly to the state of `MomentAccumulator`.
+
+    The blocks are dealt round-robin to `n_slots` parallel workers, each keeping
+    its own compensated power sums and Welford statistics (see `MomentAccumulator`).
+
+    Parameters
+    ----------
+    block_seeds : np.ndarray
+        One uint32 seed per block, ``ceil(num_chains / block_size)`` entries.
+    block_size : int
+        Number of chains per block.
+    num_chains : int
+        Number of chains to generate.
+    use_skip : bool
+        If True, grow chains with the run-length engine, else monomer by monomer.
+    propagate_probs, cumulative_transitions, transition_matrix : np.ndarray
+        Arrays of the `KineticModel`.
+    start_monomer : int
+        Index of the first monomer of every chain.
+    n_slots : int
+        Number of partial states.
+
+    Returns
+    -------
+    n_chains : np.ndarray
+        Shape ``(n_slots,)``.
+    count_sums : np.ndarray
+        Shape ``(n_slots, n_monomers)``.
+    sums, comps : np.ndarray
+        Compensated sums, shape ``(n_slots, LENGTH_MOMENT_ORDER + 2 * n_monomers)``.
+    fraction_means, fraction_m2 : np.ndarray
+        Shape ``(n_slots, n_monomers)``.
+    """
+    n_monomers = len(propagate_probs)
+    n_sums = LENGTH_MOMENT_ORDER + 2 * n_monomers
+    slot_n = np.zeros(n_slots, dtype=np.int64)
+    slot_count_sums = np.zeros((n_slots, n_monomers), dtype=np.int64)
+    slot_sums = np.zeros((n_slots, n_sums))
+    slot_comps = np.zeros((n_slots, n_sums))
+    slot_means = np.zeros((n_slots, n_monomers))
+    slot_m2 = np.zeros((n_slots, n_monomers))
+    log_stay, terminate_given_exit, switch_cum = _skip_tables(propagate_probs, transition_matrix)
+
+    for slot in prange(n_slots):
+        chain_counts = np.empty(n_monomers, dtype=np.int64)
+        sums = slot_sums[slot]
+        comps = slot_comps[slot]
+        for block in range(slot, len(block_seeds), n_slots):
+            np.random.seed(block_seeds[block])
+            for _ in range(block * block_size, min((block + 1) * block_size, num_chains)):
+                if use_skip:
+                    chain_length = _skip_chain(log_stay, terminate_given_exit, switch_cum, start_monomer,
+                                               chain_counts)
+                else:
+                    chain_length = _numba_chain(propagate_probs, cumulative_transitions, start_monomer,
+                                                chain_counts)
+
+                slot_n[slot] += 1
+                power = 1.0
+                for k in range(LENGTH_MOMENT_ORDER):
+                    power *= chain_length
+                    _neumaier(sums, comps, k, power)
+                for m in range(n_monomers):
+                    count = chain_counts[m]
+                    slot_count_sums[slot, m] += count
+                    _neumaier(sums, comps, LENGTH_MOMENT_ORDER + m, float(count) * count)
+                    _neumaier(sums, comps, LENGTH_MOMENT_ORDER + n_monomers + m, float(count) * chain_length)
+                    fraction = count / chain_length
+                    delta = fraction - slot_means[slot, m]
+                    slot_means[slot, m] += delta / slot_n[slot]
+                    slot_m2[slot, m] += delta * (fraction - slot_means[slot, m])
+
+    return slot_n, slot_count_sums, slot_sums, slot_comps, slot_means, slot_m2
+
+
+def _block_seeds(num_chains: int, seed=None, block_size: int = BLOCK_SIZE):
+    """
+    Derive one independent uint32 seed per block of chains from a single seed.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    seed : int, optional
+        Root seed. If None, fresh entropy is drawn from the operating system.
+    block_size : int
+        Number of chains per block.
+
+    Returns
+    -------
+    np.ndarray
+        Array of ``ceil(num_chains / block_size)`` uint32 seeds.
+    """
+    n_blocks = -(-num_chains // block_size)
+    return np.random.SeedSequence(seed).generate_state(n_blocks, dtype=np.uint32)
+
+
+@contextmanager
+def _numba_threads(n_threads: int = None):
+    """
+    Temporarily set the number of Numba threads (capped at ``NUMBA_NUM_THREADS``).
+
+    Parameters
+    ----------
+    n_threads : int, optional
+        Number of threads. If None, Numba's current setting is kept.
+    """
+    previous_threads = numba.get_num_threads()
+    if n_threads is not None:
+        numba.set_num_threads(min(n_threads, numba.config.NUMBA_NUM_THREADS))
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous_threads)
+
+
+def _resolve_engine(engine: str, use_numba: bool, model: KineticModel):
+    """
+    Apply the defaults for `engine` and `model` and validate the engine name.
+
+    Returns
+    -------
+    engine : str
+    model : KineticModel
+    """
+    if engine is None:
+        engine = "numba" if use_numba else "python"
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {list(ENGINES)}")
+    if model is None:
+        model = DEFAULT_MODEL
+    return engine, model
+
+
+def _resolve_backend(backend: str, workers: int, executor):
+    """
+    Apply the default backend ("process" when workers or an executor are given).
+
+    Returns
+    -------
+    str
+        "local", "process" or "executor".
+    """
+    if executor is not None:
+        return "executor"
+    if backend is None:
+        backend = "local" if workers is None else "process"
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {list(BACKENDS)}")
+    return backend
+
+
+def _run_engine(engine: str, model: KineticModel, chain_lengths, counts, rng=None, block_seeds=None):
+    """
+    Fill `chain_lengths` and `counts` with chains from the given engine.
+
+    Parameters
+    ----------
+    engine : str
+        Generation engine (one of `ENGINES`).
+    model : KineticModel
+        Kinetic parameters of the polymerization.
     chain_lengths : np.ndarray
-        Array containing the length of each polymer chain.
-    freq_A : np.ndarray
-        Fraction of monomer A in each chain.
-    freq_B : np.ndarray
-        Fraction of monomer B in each chain.
-    freq_C : np.ndarray
-        Fraction of monomer C in each chain.
-    """
-    
-    # --- Fixed parameters ---
-    total_random_events = 1000  # Normalization factor
-    prob_propagate_A = 0.6
-    prob_propagate_B = 0.2
-    prob_propagate_C = 0.2
-
-    rate_AB = 5.0
-    rate_AC = 10.0
-    rate_BA = 0.2
-    rate_BC = 2.0
-    rate_CA = 0.1
-    rate_CB = 0.5
-
-    init_prob_A = 0.33
-    init_prob_B = 0.33
-    init_prob_C = 0.34
-
-    freq_factor_A = 0.9091
-    freq_factor_B = 0.0606
-    freq_factor_C = 0.0303
-
-    # Probabilities for starting a chain with each monomer
-    start_prob_A = (freq_factor_A * total_random_events) / (freq_factor_A * total_random_events + init_prob_A)
-    start_prob_B = (freq_factor_B * total_random_events) / (freq_factor_B * total_random_events + init_prob_B)
-    start_prob_C = (freq_factor_C * total_random_events) / (freq_factor_C * total_random_events + init_prob_C)
-
-    # Transition probabilities for monomer after last monomer
-    P_AA = prob_propagate_A / (prob_propagate_A + prob_propagate_B / rate_AB + prob_propagate_C / rate_AC)
-    P_AB = (prob_propagate_B / rate_AB) / (prob_propagate_A + prob_propagate_B / rate_AB + prob_propagate_C / rate_AC)
-    P_AC = (prob_propagate_C / rate_AC) / (prob_propagate_A + prob_propagate_B / rate_AB + prob_propagate_C / rate_AC)
-
-    P_BA = (prob_propagate_A / rate_BA) / (prob_propagate_B + prob_propagate_A / rate_BA + prob_propagate_C / rate_BC)
-    P_BB = prob_propagate_B / (prob_propagate_B + prob_propagate_A / rate_BA + prob_propagate_C / rate_BC)
-    P_BC = (prob_propagate_C / rate_BC) / (prob_propagate_B + prob_propagate_A / rate_BA + prob_propagate_C / rate_BC)
-
-    P_CA = (prob_propagate_A / rate_CA) / (prob_propagate_C + prob_propagate_A / rate_CA + prob_propagate_B / rate_CB)
-    P_CB = (prob_propagate_B / rate_CB) / (prob_propagate_C + prob_propagate_A / rate_CA + prob_propagate_B / rate_CB)
-    P_CC = prob_propagate_C / (prob_propagate_C + prob_propagate_A / rate_CA + prob_propagate_B / rate_CB)
-
-    # --- Initialization ---
-    #np.random.seed(0)
-    chain_lengths = []
-    freq_A = []
-    freq_B = []
-    freq_C = []
-
-    for _ in range(num_chains):
-        chain_length = 1  # start with first monomer
-        count_A = 1
-        count_B = 0
-        count_C = 0
-        last_monomer = 1  # 1=A, 2=B, 3=C
-        propagate_prob = start_prob_A
+        Output, length of each chain, shape ``(num_chains,)``.
+    counts : np.ndarray
+        Output, C-contiguous, shape ``(n_monomers, num_chains)``.
+    rng : np.random.RandomState or module, optional
+        Random source of the Python engine.
+    block_seeds : np.ndarray, optional
+        Per-block seeds of the Numba engines.
+    """
+    if engine == "python":
+        _generate_chain_python(model, rng, chain_lengths, counts)
+    elif engine == "numba":
+        _generate_chain_numba(block_seeds, BLOCK_SIZE, model.propagate_probs, model.cumulative_transitions,
+                              model.start_monomer, chain_lengths, counts)
+    elif engine == "skip":
+        _generate_chain_skip(block_seeds, BLOCK_SIZE, model.propagate_probs, model.transition_matrix,
+                             model.start_monomer, chain_lengths, counts)
+    else:
+        _generate_chain_rng(block_seeds, BLOCK_SIZE, model.propagate_probs, model.cumulative_transitions,
+                            model.start_monomer, engine == "counter", True, RNG_BUFFER_SIZE, chain_lengths,
+                            counts)
 
-        while True:
-            rnd = np.random.rand()
 
-            if rnd > propagate_prob:  # terminate chain
-                chain_lengths.append(chain_length)
-                freq_A.append(count_A / chain_length)
-                freq_B.append(count_B / chain_length)
-                freq_C.append(count_C / chain_length)
-                break
-            else:  # propagate chain
-                chain_length += 1
-                rnd = np.random.rand()
-
-                # --- Monomer generation ---
-                if last_monomer == 1:  # last was A
-                    if rnd <= P_AA:
-                        count_A += 1
-                        last_monomer = 1
-                        propagate_prob = start_prob_A
-                    elif rnd <= P_AA + P_AB:
-                        count_B += 1
-                        last_monomer = 2
-                        propagate_prob = start_prob_B
-                    else:
-                        count_C += 1
-                        last_monomer = 3
-                        propagate_prob = start_prob_C
-
-                elif last_monomer == 2:  # last was B
-                    if rnd <= P_BA:
-                        count_A += 1
-                        last_monomer = 1
-                        propagate_prob = start_prob_A
-                    elif rnd <= P_BA + P_BB:
-                        count_B += 1
-                        last_monomer = 2
-                        propagate_prob = start_prob_B
-                    else:
-                        count_C += 1
-                        last_monomer = 3
-                        propagate_prob = start_prob_C
-
-                elif last_monomer == 3:  # last was C
-                    if rnd <= P_CA:
-                        count_A += 1
-                        last_monomer = 1
-                        propagate_prob = start_prob_A
-                    elif rnd <= P_CA + P_CB:
-                        count_B += 1
-                        last_monomer = 2
-                        propagate_prob = start_prob_B
-                    else:
-                        count_C += 1
-                        last_monomer = 3
-                        propagate_prob = start_prob_C
-
-    return np.array(chain_lengths), np.array(freq_A), np.array(freq_B), np.array(freq_C)
-
-@njit
-def _generate_chain_numba(num_chains):
-    chain_lengths = np.zeros(num_chains, dtype=np.int64)
-    freq_A = np.zeros(num_chains, dtype=np.float64)
-    freq_B = np.zeros(num_chains, dtype=np.float64)
-    freq_C = np.zeros(num_chains, dtype=np.float64)
-
-    total_random_events = 1000
-    prob_propagate_A, prob_propagate_B, prob_propagate_C = 0.6, 0.2, 0.2
-    rate_AB, rate_AC, rate_BA, rate_BC, rate_CA, rate_CB = 5.0, 10.0, 0.2, 2.0, 0.1, 0.5
-    start_prob_A, start_prob_B, start_prob_C = 0.33, 0.33, 0.34
-    freq_factor_A, freq_factor_B, freq_factor_C = 0.9091, 0.0606, 0.0303
-
-    Pa = (freq_factor_A * total_random_events) / (freq_factor_A * total_random_events + start_prob_A)
-    Pb = (freq_factor_B * total_random_events) / (freq_factor_B * total_random_events + start_prob_B)
-    Pc = (freq_factor_C * total_random_events) / (freq_factor_C * total_random_events + start_prob_C)
-
-    P_AA = prob_propagate_A / (prob_propagate_A + prob_propagate_B / rate_AB + prob_propagate_C / rate_AC)
-    P_AB = (prob_propagate_B / rate_AB) / (prob_propagate_A + prob_propagate_B / rate_AB + prob_propagate_C / rate_AC)
-    P_AC = (prob_propagate_C / rate_AC) / (prob_propagate_A + prob_propagate_B / rate_AB + prob_propagate_C / rate_AC)
-
-    P_BA = (prob_propagate_A / rate_BA) / (prob_propagate_B + prob_propagate_A / rate_BA + prob_propagate_C / rate_BC)
-    P_BB = prob_propagate_B / (prob_propagate_B + prob_propagate_A / rate_BA + prob_propagate_C / rate_BC)
-    P_BC = (prob_propagate_C / rate_BC) / (prob_propagate_B + prob_propagate_A / rate_BA + prob_propagate_C / rate_BC)
-
-    P_CA = (prob_propagate_A / rate_CA) / (prob_propagate_C + prob_propagate_A / rate_CA + prob_propagate_B / rate_CB)
-    P_CB = (prob_propagate_B / rate_CB) / (prob_propagate_C + prob_propagate_A / rate_CA + prob_propagate_B / rate_CB)
-    P_CC = prob_propagate_C / (prob_propagate_C + prob_propagate_A / rate_CA + prob_propagate_B / rate_CB)
-
-    #np.random.seed(0)
-    for i in prange(num_chains):
-        chain_length = 1
-        count_A, count_B, count_C = 1, 0, 0
-        last_monomer = 1
-        propagate_prob = Pa
+def iter_chains(num_chains: int, chunk_size: int = DEFAULT_CHUNK_SIZE, use_numba: bool = False,
+                n_threads: int = None, seed: int = None, engine: str = None, model: KineticModel = None):
+    """
+    Generate chains in fixed-size chunks, reusing the same output buffers.
 
-        while True:
-            rnd = np.random.rand()
-            if rnd > propagate_prob:
-                chain_lengths[i] = chain_length
-                freq_A[i] = count_A / chain_length
-                freq_B[i] = count_B / chain_length
-                freq_C[i] = count_C / chain_length
-                break
-            else:
-                chain_length += 1
-                rnd = np.random.rand()
-
-                if last_monomer == 1:
-                    if rnd <= P_AA:
-                        count_A += 1
-                        last_monomer = 1
-                        propagate_prob = Pa
-                    elif rnd <= P_AA + P_AB:
-                        count_B += 1
-                        last_monomer = 2
-                        propagate_prob = Pb
-                    else:
-                        count_C += 1
-                        last_monomer = 3
-                        propagate_prob = Pc
-                elif last_monomer == 2:
-                    if rnd <= P_BA:
-                        count_A += 1
-                        last_monomer = 1
-                        propagate_prob = Pa
-                    elif rnd <= P_BA + P_BB:
-                        count_B += 1
-                        last_monomer = 2
-                        propagate_prob = Pb
-                    else:
-                        count_C += 1
-                        last_monomer = 3
-                        propagate_prob = Pc
-                else:  # last_monomer == 3
-                    if rnd <= P_CA:
-                        count_A += 1
-                        last_monomer = 1
-                        propagate_prob = Pa
-                    elif rnd <= P_CA + P_CB:
-                        count_B += 1
-                        last_monomer = 2
-                        propagate_prob = Pb
-                    else:
-                        count_C += 1
-                        last_monomer = 3
-                        propagate_prob = Pc
-
-    return chain_lengths, freq_A, freq_B, freq_C
-
-
-def generate_chains(num_chains: int, use_numba: bool = False):
+    Memory is bounded by `chunk_size` whatever `num_chains` is. For a given seed
+    the concatenation of all chunks equals the ensemble of `generate_chains`.
+    The yielded arrays are overwritten by the next chunk: consume them (e.g. with
+    the accumulators of `montecarlo.accumulators`) or copy them before advancing.
+
+    Parameters
+    ----------
+    num_chains : int
+        Total number of chains to generate.
+    chunk_size : int, default=DEFAULT_CHUNK_SIZE
+        Number of chains per chunk (the last chunk may be smaller). Must be a
+        multiple of `BLOCK_SIZE` for the Numba engines.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains`.
+
+    Yields
+    ------
+    chain_lengths : np.ndarray
+        Length of each chain of the chunk.
+    counts : np.ndarray
+        Number of monomers of each type per chain, shape ``(n_monomers, chunk)``.
+    """
+    engine, model = _resolve_engine(engine, use_numba, model)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if engine != "python" and chunk_size % BLOCK_SIZE:
+        raise ValueError(f"chunk_size must be a multiple of BLOCK_SIZE ({BLOCK_SIZE}) for the Numba engines")
+
+    rng = block_seeds = None
+    if engine == "python":
+        rng = np.random if seed is None else np.random.RandomState(seed)
+    else:
+        block_seeds = _block_seeds(num_chains, seed)
+    blocks_per_chunk = chunk_size // BLOCK_SIZE
+
+    buffer_size = min(chunk_size, num_chains)
+    length_buffer = np.empty(buffer_size, dtype=np.int64)
+    count_buffer = np.empty(model.n_monomers * buffer_size, dtype=np.int64)
+
+    for k, start in enumerate(range(0, num_chains, chunk_size)):
+        size = min(chunk_size, num_chains - start)
+        chain_lengths = length_buffer[:size]
+        counts = count_buffer[:model.n_monomers * size].reshape(model.n_monomers, size)
+        chunk_seeds = None
+        if block_seeds is not None:
+            chunk_seeds = block_seeds[k * blocks_per_chunk:(k + 1) * blocks_per_chunk]
+        with _numba_threads(n_threads):
+            _run_engine(engine, model, chain_lengths, counts, rng, chunk_seeds)
+        yield chain_lengths, counts
+
+
+def _generate_counts(num_chains: int, model: KineticModel, engine: str, n_threads: int = None, seed: int = None):
+    """
+    Run a generation engine and return raw per-chain monomer counts.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    model : KineticModel
+        Kinetic parameters of the polymerization.
+    engine : str
+        Generation engine (one of `ENGINES`).
+    n_threads : int, optional
+        Number of threads for the Numba engines.
+    seed : int, optional
+        Seed for reproducible ensembles.
+
+    Returns
+    -------
+    chain_lengths : np.ndarray
+        Length of each chain.
+    counts : np.ndarray
+        Number of monomers of each type per chain, shape ``(n_monomers, num_chains)``.
+    """
+    chain_lengths = np.empty(num_chains, dtype=np.int64)
+    counts = np.empty((model.n_monomers, num_chains), dtype=np.int64)
+    if engine == "python":
+        rng = np.random if seed is None else np.random.RandomState(seed)
+        _run_engine(engine, model, chain_lengths, counts, rng=rng)
+    else:
+        with _numba_threads(n_threads):
+            _run_engine(engine, model, chain_lengths, counts, block_seeds=_block_seeds(num_chains, seed))
+    return chain_lengths, counts
+
+
+def histogram_chains(num_chains: int, n_bins: int = 1000, length_edges=None, use_numba: bool = True,
+                     n_threads: int = None, seed: int = None, engine: str = None, model: KineticModel = None,
+                     workers: int = None, backend: str = None, executor=None):
+    """
+    Generate chains and return only their binned W and chain-length distributions.
+
+    With the "numba" and "skip" engines the chains are binned inside the kernel,
+    so no per-chain arrays are stored or sorted and memory does not grow with
+    `num_chains`. The other engines stream through `iter_chains` instead.
+    ``engine="exact"`` generates nothing: the histograms hold the expected
+    (float) counts of `num_chains` chains, from `montecarlo.exact`.
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    n_bins : int, default=1000
+        Number of composition bins over [0, 1].
+    length_edges : array_like, optional
+        Chain-length bin edges. Default: `log_length_edges()`.
+    use_numba, n_threads, seed, engine, model, workers, backend, executor
+        As in `generate_chains` (here `use_numba` defaults to True), plus the
+        "exact" engine. With several workers, each returns partial histograms
+        that are merged.
+
+    Returns
+    -------
+    w_hist : WHistogramAccumulator
+        Length-weighted composition histograms of every monomer.
+    length_hist : LengthHistogramAccumulator
+        Number distribution of chain lengths.
+    """
+    if engine == "exact":
+        return _exact_histograms(num_chains, n_bins, length_edges, model)
+    engine, model = _resolve_engine(engine, use_numba, model)
+    backend = _resolve_backend(backend, workers, executor)
+    if backend != "local":
+        from montecarlo.distributed import distributed_histograms
+        return distributed_histograms(num_chains, model, engine, n_bins, length_edges, workers, backend,
+                                      executor, n_threads, seed)
+
+    w_hist = WHistogramAccumulator(n_bins=n_bins, n_monomers=model.n_monomers)
+    length_hist = LengthHistogramAccumulator(length_edges)
+
+    if engine not in KERNEL_ENGINES:
+        return accumulate(iter_chains(num_chains, n_threads=n_threads, seed=seed, engine=engine, model=model),
+                          w_hist, length_hist)
+
+    with _numba_threads(n_threads):
+        w_weights, length_counts = _histogram_chains_kernel(
+            _block_seeds(num_chains, seed), BLOCK_SIZE, num_chains, engine == "skip", model.propagate_probs,
+            model.cumulative_transitions, model.transition_matrix, model.start_monomer, n_bins,
+            length_hist.edges, 4 * numba.get_num_threads())
+    w_hist.weights += w_weights
+    length_hist.counts += length_counts
+    return w_hist, length_hist
+
+
+def _exact_histograms(num_chains, n_bins, length_edges, model):
+    """
+    Expected W and chain-length histograms of `num_chains` chains (``engine="exact"``).
+
+    Returns
+    -------
+    w_hist : WHistogramAccumulator
+    length_hist : LengthHistogramAccumulator
+        Same layout as the sampled histograms, with float counts.
+    """
+    from montecarlo.exact import exact_distribution
+    model = DEFAULT_MODEL if model is None else model
+    length_hist = LengthHistogramAccumulator(length_edges)
+    exact = exact_distribution(model, n_bins=n_bins, length_edges=length_hist.edges)
+    w_hist = WHistogramAccumulator(n_bins=n_bins, n_monomers=model.n_monomers)
+    w_hist.weights = num_chains * exact.w_weights
+    length_hist.counts = num_chains * exact.length_histogram()
+    return w_hist, length_hist
+
+
+def chain_moments(num_chains: int, use_numba: bool = True, n_threads: int = None, seed: int = None,
+                  engine: str = None, model: KineticModel = None):
+    """
+    Generate chains and return only their moments (Mn, Mw, Mz, PDI, composition).
+
+    With the "numba" and "skip" engines every chain is folded into running
+    compensated sums inside the kernel, so memory is O(1) in `num_chains`; for
+    a given seed the result is identical whatever the number of threads. The
+    other engines stream through `iter_chains` instead. ``engine="exact"``
+    returns the closed-form averages of the model in milliseconds (`num_chains`
+    is ignored; ``mean_fractions`` is computed on first access).
+
+    Parameters
+    ----------
+    num_chains : int
+        Number of chains to generate.
+    use_numba, n_threads, seed, engine, model
+        As in `generate_chains` (here `use_numba` defaults to True), plus the
+        "exact" engine.
+
+    Returns
+    -------
+    MomentAccumulator or ExactMoments
+        Averages via ``mn``, ``mw``, ``mz``, ``pdi``, ``composition`` and
+        ``mean_fractions``; their errors via ``standard_errors()`` (zero for
+        the "exact" engine).
+    """
+    if engine == "exact":
+        from montecarlo.exact import exact_moments
+        return exact_moments(DEFAULT_MODEL if model is None else model)
+    engine, model = _resolve_engine(engine, use_numba, model)
+    moments = MomentAccumulator(n_monomers=model.n_monomers)
+
+    if engine not in KERNEL_ENGINES:
+        return accumulate(iter_chains(num_chains, n_threads=n_threads, seed=seed, engine=engine, model=model),
+                          moments)[0]
+
+    with _numba_threads(n_threads):
+        slot_states = _moment_chains_kernel(
+            _block_seeds(num_chains, seed), BLOCK_SIZE, num_chains, engine == "skip", model.propagate_probs,
+            model.cumulative_transitions, model.transition_matrix, model.start_monomer, MOMENT_SLOTS)
+    for state in zip(*slot_states):
+        moments._add(*state)
+    return moments
+
+
+def generate_chains(num_chains: int, use_numba: bool = False, n_threads: int = None, seed: int = None,
+                    engine: str = None, model: KineticModel = None, workers: int = None, backend: str = None,
+                    executor=None):
     """
     Generate Monte Carlo chains with option to use Numba acceleration.
 
+    The Numba engines run in parallel over blocks of `BLOCK_SIZE` chains, each
+    with its own RNG stream, so for a given ``seed`` the ensemble is identical
+    whatever the number of threads.
+
     Parameters
     ----------
     num_chains : int
         Number of chains to generate.
     use_numba : bool
         If True, use Numba JIT compilation for faster execution.
+    n_threads : int, optional
+        Number of threads for the Numba engine (capped at
+        ``numba.config.NUMBA_NUM_THREADS``). Default: Numba's current setting.
+        Ignored by the pure Python engine.
+    seed : int, optional
+        Seed for reproducible ensembles. If None, the Numba engines draw fresh
+        entropy and the Python engine uses the global NumPy random state.
+    engine : {"python", "numba", "skip", "numba-single", "counter"}, optional
+        Generation engine. "skip" samples whole runs of the same monomer from
+        their geometric distribution (same statistics, cost proportional to the
+        number of monomer transitions). "numba-single" draws one uniform per
+        monomer instead of two (termination and monomer choice from a partition
+        of [0, 1]); "counter" does the same with buffered counter-based uniforms
+        (see `montecarlo.rng`). Default: "numba" if `use_numba` else "python".
+    model : KineticModel, optional
+        Kinetic parameters. Default: the A/B/C terpolymer of the reference paper.
+    workers : int, optional
+        Number of worker processes of the "process" backend. Default: ``os.cpu_count()``.
+    backend : {"local", "process"}, optional
+        "local" runs in this process; "process" splits the ensemble over a
+        `ProcessPoolExecutor` whose workers write into shared memory (see
+        `montecarlo.distributed`). With several workers the Python engine draws
+        one `SeedSequence.spawn` stream per block, so its ensemble differs from
+        the local one. Default: "process" if `workers` is given, else "local".
+    executor : concurrent.futures.Executor, optional
+        Pluggable executor (e.g. a cluster client) running the blocks instead of
+        the built-in backends.
 
     Returns
     -------
     chain_lengths, freq_A, freq_B, freq_C : np.ndarray
+        Chain lengths followed by one fraction array per monomer of `model`.
     """
-    if use_numba:
-        return _generate_chain_numba(num_chains)
+    engine, model = _resolve_engine(engine, use_numba, model)
+    backend = _resolve_backend(backend, workers, executor)
+    if backend == "local":
+        chain_lengths, counts = _generate_counts(num_chains, model, engine, n_threads, seed)
     else:
-        return _generate_chain_python(num_chains)
\ No newline at end of file
+        from montecarlo.distributed import distributed_counts
+        chain_lengths, counts = distributed_counts(num_chains, model, engine, workers, backend, executor,
+                                                   n_threads, seed)
+    return (chain_lengths, *(counts / chain_lengths))
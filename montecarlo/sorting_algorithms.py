@@ -1,5 +1,7 @@
+from dataclasses import dataclass
 import numpy as np
-from numba import njit, prange
+import numba
+from numba import njit, prange, literal_unroll
 
 
 # ---------------- Bubble Sort ----------------
@@ -33,7 +35,7 @@ def bubble_sort(array1, array2):
                 array2[i+1] = temp
     return array1, array2
 
-@njit
+@njit(cache=True)
 def bubble_sort_numba(array1, array2):
     '''
     Bubble Sort implementation (Numba)
@@ -94,7 +96,7 @@ def insertion_sort(array1, array2):
         array1[position] = current_val1
     return array1, array2
 
-@njit
+@njit(cache=True)
 def insertion_sort_numba(array1, array2):
     '''
     Insertion Sort (Numba)
@@ -157,7 +159,7 @@ def selection_sort(array1, array2):
         array1[min_idx] = temp1
     return array1, array2
 
-@njit
+@njit(cache=True)
 def selection_sort_numba(array1, array2):
     '''
     Selection Sort (Numba)
@@ -210,3 +212,569 @@ def tim_sort(array1, array2):
     paired = sorted(zip(array2, array1))
     sorted_array2, sorted_array1 = zip(*paired)
     return list(sorted_array1), list(sorted_array2)
+
+
+# ---------------- Radix Sort ----------------
+RADIX_BITS = 11
+RADIX_PASSES = 6  # ceil(64 / RADIX_BITS)
+
+@njit(cache=True)
+def radix_sort_numba(array1, array2):
+    '''
+    LSD radix sort on the float64 bit patterns of `array2` (Numba), O(n).
+
+    Keys are mapped to unsigned integers that sort in the same order as the
+    floats (sign bit flipped for positives, all bits flipped for negatives) and
+    sorted 11 bits at a time. Digits shared by all keys, such as most exponent
+    bits of fractions in [0, 1], are skipped. The sort is stable.
+
+    Parameters
+    ----------
+    array1 : np.ndarray
+        Array to sort.
+    array2 : np.ndarray
+        Array to sort.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted arrays.
+    '''
+    n = len(array2)
+    n_buckets = 1 << RADIX_BITS
+    mask = np.uint64(n_buckets - 1)
+    sign = np.uint64(1) << np.uint64(63)
+
+    keys = array2.astype(np.float64).view(np.uint64)
+    for i in range(n):
+        if keys[i] & sign:
+            keys[i] = ~keys[i]
+        else:
+            keys[i] = keys[i] | sign
+
+    # Histogram of every digit in a single pass over the keys
+    histograms = np.zeros((RADIX_PASSES, n_buckets), dtype=np.int64)
+    for i in range(n):
+        k = keys[i]
+        for d in range(RADIX_PASSES):
+            histograms[d, np.int64((k >> np.uint64(d * RADIX_BITS)) & mask)] += 1
+
+    order = np.arange(n)
+    keys_out = np.empty_like(keys)
+    order_out = np.empty_like(order)
+    offsets = np.empty(n_buckets, dtype=np.int64)
+    for d in range(RADIX_PASSES):
+        shift = np.uint64(d * RADIX_BITS)
+        if n == 0 or histograms[d, np.int64((keys[0] >> shift) & mask)] == n:
+            continue  # every key has the same digit
+
+        total = 0
+        for b in range(n_buckets):
+            offsets[b] = total
+            total += histograms[d, b]
+
+        for i in range(n):
+            b = np.int64((keys[i] >> shift) & mask)
+            keys_out[offsets[b]] = keys[i]
+            order_out[offsets[b]] = order[i]
+            offsets[b] += 1
+        keys, keys_out = keys_out, keys
+        order, order_out = order_out, order
+
+    sorted_array1 = array1[order]
+    sorted_array2 = array2[order]
+    array1[:] = sorted_array1
+    array2[:] = sorted_array2
+    return array1, array2
+
+# ---------------- Parallel Merge Sort / Introsort ----------------
+MERGE_RUN_SIZE = 32
+INTROSORT_CHUNK_SIZE = 65536
+
+@njit(cache=True)
+def _insertion_sort_range(array1, array2, lo, hi):
+    # Stable insertion sort of [lo, hi) by array2
+    for index in range(lo + 1, hi):
+        current_val2 = array2[index]
+        current_val1 = array1[index]
+        position = index
+        while position > lo and array2[position-1] > current_val2:
+            array2[position] = array2[position-1]
+            array1[position] = array1[position-1]
+            position -= 1
+        array2[position] = current_val2
+        array1[position] = current_val1
+
+@njit(cache=True)
+def _merge_range(src1, src2, dst1, dst2, lo, mid, hi):
+    # Stable merge of the sorted runs [lo, mid) and [mid, hi) of src into dst
+    i, j = lo, mid
+    for k in range(lo, hi):
+        if i < mid and (j >= hi or src2[i] <= src2[j]):
+            dst2[k] = src2[i]
+            dst1[k] = src1[i]
+            i += 1
+        else:
+            dst2[k] = src2[j]
+            dst1[k] = src1[j]
+            j += 1
+
+@njit(parallel=True, cache=True)
+def _merge_sorted_runs(array1, array2, run_size):
+    # Bottom-up merging of sorted runs of length run_size, every level in parallel,
+    # ping-ponging between the arrays and one scratch buffer per array.
+    n = len(array2)
+    scratch1 = np.empty_like(array1)
+    scratch2 = np.empty_like(array2)
+    in_scratch = False
+    width = run_size
+    while width < n:
+        n_pairs = (n + 2 * width - 1) // (2 * width)
+        for p in prange(n_pairs):
+            lo = p * 2 * width
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if in_scratch:
+                _merge_range(scratch1, scratch2, array1, array2, lo, mid, hi)
+            else:
+                _merge_range(array1, array2, scratch1, scratch2, lo, mid, hi)
+        in_scratch = not in_scratch
+        width *= 2
+    if in_scratch:
+        array1[:] = scratch1
+        array2[:] = scratch2
+
+@njit(parallel=True, cache=True)
+def merge_sort_numba(array1, array2):
+    '''
+    Parallel Merge Sort (Numba)
+
+    Runs of 32 elements are insertion-sorted in parallel, then merged bottom-up,
+    each level of merges running in parallel, with one scratch buffer per array.
+    The sort is stable and the result is written back into the input arrays.
+
+    Parameters
+    ----------
+    array1 : np.ndarray
+        Array to sort.
+    array2 : np.ndarray
+        Array to sort.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted arrays.
+    '''
+    n = len(array2)
+    n_runs = (n + MERGE_RUN_SIZE - 1) // MERGE_RUN_SIZE
+    for r in prange(n_runs):
+        _insertion_sort_range(array1, array2, r * MERGE_RUN_SIZE, min((r + 1) * MERGE_RUN_SIZE, n))
+    _merge_sorted_runs(array1, array2, MERGE_RUN_SIZE)
+    return array1, array2
+
+@njit(cache=True)
+def _swap(array1, array2, i, j):
+    temp = array1[i]
+    array1[i] = array1[j]
+    array1[j] = temp
+    temp2 = array2[i]
+    array2[i] = array2[j]
+    array2[j] = temp2
+
+@njit(cache=True)
+def _heap_sort_range(array1, array2, lo, hi):
+    # Heap sort of [lo, hi) by array2 (introsort fallback)
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(array1, array2, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        _swap(array1, array2, lo, lo + end)
+        _sift_down(array1, array2, lo, 0, end)
+
+@njit(cache=True)
+def _sift_down(array1, array2, lo, root, size):
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        if child + 1 < size and array2[lo + child] < array2[lo + child + 1]:
+            child += 1
+        if array2[lo + root] >= array2[lo + child]:
+            return
+        _swap(array1, array2, lo + root, lo + child)
+        root = child
+
+@njit(cache=True)
+def _introsort_range(array1, array2, lo, hi):
+    # Iterative introsort of [lo, hi): median-of-3 quicksort (Hoare partition),
+    # heap sort once the depth limit is reached, insertion sort for small ranges.
+    if hi - lo < 2:
+        return
+    max_depth = 2 * int(np.log2(hi - lo))
+    stack_lo = np.empty(128, dtype=np.int64)
+    stack_hi = np.empty(128, dtype=np.int64)
+    stack_depth = np.empty(128, dtype=np.int64)
+    stack_lo[0], stack_hi[0], stack_depth[0] = lo, hi, max_depth
+    top = 1
+    while top > 0:
+        top -= 1
+        lo, hi, depth = stack_lo[top], stack_hi[top], stack_depth[top]
+        while hi - lo > 16:
+            if depth == 0:
+                _heap_sort_range(array1, array2, lo, hi)
+                break
+            depth -= 1
+
+            mid = lo + (hi - lo) // 2
+            if array2[mid] < array2[lo]:
+                _swap(array1, array2, mid, lo)
+            if array2[hi - 1] < array2[lo]:
+                _swap(array1, array2, hi - 1, lo)
+            if array2[hi - 1] < array2[mid]:
+                _swap(array1, array2, hi - 1, mid)
+            pivot = array2[mid]
+
+            i, j = lo - 1, hi
+            while True:
+                i += 1
+                while array2[i] < pivot:
+                    i += 1
+                j -= 1
+                while array2[j] > pivot:
+                    j -= 1
+                if i >= j:
+                    break
+                _swap(array1, array2, i, j)
+
+            # Push the larger side, keep looping on the smaller one
+            if j + 1 - lo > hi - (j + 1):
+                stack_lo[top], stack_hi[top], stack_depth[top] = lo, j + 1, depth
+                lo = j + 1
+            else:
+                stack_lo[top], stack_hi[top], stack_depth[top] = j + 1, hi, depth
+                hi = j + 1
+            top += 1
+        else:
+            _insertion_sort_range(array1, array2, lo, hi)
+
+@njit(parallel=True, cache=True)
+def introsort_numba(array1, array2):
+    '''
+    Parallel Introsort (Numba)
+
+    Chunks of 65536 elements are sorted in place by introsort (quicksort with a
+    heap sort fallback and insertion sort for small ranges) in parallel, then
+    merged bottom-up in parallel like `merge_sort_numba`. The sort is not stable.
+
+    Parameters
+    ----------
+    array1 : np.ndarray
+        Array to sort.
+    array2 : np.ndarray
+        Array to sort.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted arrays.
+    '''
+    n = len(array2)
+    n_chunks = (n + INTROSORT_CHUNK_SIZE - 1) // INTROSORT_CHUNK_SIZE
+    for c in prange(n_chunks):
+        _introsort_range(array1, array2, c * INTROSORT_CHUNK_SIZE, min((c + 1) * INTROSORT_CHUNK_SIZE, n))
+    _merge_sorted_runs(array1, array2, INTROSORT_CHUNK_SIZE)
+    return array1, array2
+
+# ---------------- Co-sort ----------------
+def _check_same_length(key, payloads):
+    for payload in payloads:
+        if len(payload) != len(key):
+            raise ValueError("all payload arrays must have the same length as the key")
+
+def co_sort(key, *payloads):
+    '''
+    Stable co-sort (NumPy): sorts `key` and applies the same permutation to every payload.
+
+    The permutation is computed once with ``np.argsort(kind="stable")``; the
+    payloads are permuted through a single scratch buffer per dtype, so the
+    arrays stay aligned and sorting by one fraction never misaligns the others.
+
+    Parameters
+    ----------
+    key : np.ndarray
+        Array to sort by.
+    *payloads : np.ndarray
+        Arrays of the same length as `key`, permuted alongside it.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Sorted key followed by the payloads (all sorted in place).
+    '''
+    _check_same_length(key, payloads)
+    order = np.argsort(key, kind="stable")
+    scratch = {}
+    for array in (key, *payloads):
+        if array.dtype not in scratch:
+            scratch[array.dtype] = np.empty(len(order), dtype=array.dtype)
+        np.take(array, order, out=scratch[array.dtype])
+        array[...] = scratch[array.dtype]
+    return (key, *payloads)
+
+def co_sort_records(records, field):
+    '''
+    Stable sort of a structured (record) array by one of its fields, in place.
+
+    Parameters
+    ----------
+    records : np.ndarray
+        Structured array, e.g. with fields ``length``, ``freq_A``, ``freq_B``, ``freq_C``.
+    field : str
+        Name of the field to sort by.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted records.
+    '''
+    order = np.argsort(records[field], kind="stable")
+    records[...] = records[order]
+    return records
+
+@njit(cache=True)
+def _apply_permutation(array, order, visited):
+    '''
+    Permute `array` in place so that ``array[j]`` becomes ``array[order[j]]``,
+    following the cycles of the permutation (no copy of `array`).
+    '''
+    visited[:] = False
+    for start in range(len(order)):
+        if visited[start]:
+            continue
+        temp = array[start]
+        j = start
+        while True:
+            visited[j] = True
+            k = order[j]
+            if k == start:
+                array[j] = temp
+                break
+            array[j] = array[k]
+            j = k
+
+@njit(cache=True)
+def _co_sort_numba(key, payloads):
+    order = np.argsort(key, kind="mergesort")
+    visited = np.empty(len(key), dtype=np.bool_)
+    _apply_permutation(key, order, visited)
+    for payload in literal_unroll(payloads):
+        _apply_permutation(payload, order, visited)
+
+def co_sort_numba(key, *payloads):
+    '''
+    Stable co-sort (Numba): sorts `key` and applies the same permutation to every payload.
+
+    The permutation is computed once (stable merge sort) and applied to each
+    array in place by following its cycles, without copying the arrays.
+
+    Parameters
+    ----------
+    key : np.ndarray
+        Array to sort by.
+    *payloads : np.ndarray
+        Arrays of the same length as `key`, permuted alongside it.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Sorted key followed by the payloads (all sorted in place).
+    '''
+    _check_same_length(key, payloads)
+    if payloads:
+        _co_sort_numba(key, payloads)
+    else:
+        key.sort(kind="stable")
+    return (key, *payloads)
+
+
+# ---------------- Registry ----------------
+@dataclass(frozen=True)
+class SortingAlgorithm:
+    '''
+    A registered sorting algorithm and its capabilities.
+
+    Every ``func`` has the same interface as the sorts above: ``func(array1, array2)``
+    sorts by `array2`, permutes `array1` alongside and returns both.
+
+    Attributes
+    ----------
+    name : str
+        Registry key.
+    func : callable
+        Sorting function.
+    family : str
+        Algorithm name shared by the Python and Numba variants (e.g. "bubble_sort").
+    compiled : bool
+        Whether it is Numba-compiled.
+    stable : bool
+        Whether equal keys keep their relative order.
+    in_place : bool
+        Whether the input arrays are sorted in place (otherwise new arrays are returned).
+    parallel : bool
+        Whether it uses several threads.
+    complexity : str
+        Worst-case time complexity: "O(n^2)", "O(n log n)" or "O(n)".
+    '''
+    name: str
+    func: object
+    family: str
+    compiled: bool
+    stable: bool
+    in_place: bool
+    parallel: bool
+    complexity: str
+
+    @property
+    def quadratic(self):
+        return self.complexity == "O(n^2)"
+
+
+SORTING_ALGORITHMS = {}
+
+# Quadratic algorithms are skipped by the benchmarks above this number of chains
+QUADRATIC_SIZE_LIMIT = 10_000
+# Arrays up to this size are insertion-sorted by the "auto" dispatcher
+SMALL_ARRAY_SIZE = 64
+# The "auto" dispatcher treats arrays with fewer than n / PRESORTED_RUN_RATIO
+# descents (i.e. long ascending runs) as presorted
+PRESORTED_RUN_RATIO = 64
+
+def register_algorithm(name, func, family, compiled, stable, in_place, parallel, complexity):
+    '''
+    Add a sorting algorithm to `SORTING_ALGORITHMS`.
+
+    Parameters
+    ----------
+    name, func, family, compiled, stable, in_place, parallel, complexity
+        See `SortingAlgorithm`.
+
+    Returns
+    -------
+    SortingAlgorithm
+        The registered entry.
+    '''
+    algorithm = SortingAlgorithm(name, func, family, compiled, stable, in_place, parallel, complexity)
+    SORTING_ALGORITHMS[name] = algorithm
+    return algorithm
+
+register_algorithm("bubble_sort", bubble_sort, "bubble_sort", False, True, True, False, "O(n^2)")
+register_algorithm("bubble_sort_numba", bubble_sort_numba, "bubble_sort", True, True, True, False, "O(n^2)")
+register_algorithm("insertion_sort", insertion_sort, "insertion_sort", False, True, True, False, "O(n^2)")
+register_algorithm("insertion_sort_numba", insertion_sort_numba, "insertion_sort", True, True, True, False, "O(n^2)")
+register_algorithm("selection_sort", selection_sort, "selection_sort", False, False, True, False, "O(n^2)")
+register_algorithm("selection_sort_numba", selection_sort_numba, "selection_sort", True, False, True, False, "O(n^2)")
+register_algorithm("tim_sort", tim_sort, "tim_sort", False, True, False, False, "O(n log n)")
+register_algorithm("radix_sort_numba", radix_sort_numba, "radix_sort", True, True, True, False, "O(n)")
+register_algorithm("merge_sort_numba", merge_sort_numba, "merge_sort", True, True, True, True, "O(n log n)")
+register_algorithm("introsort_numba", introsort_numba, "introsort", True, False, True, True, "O(n log n)")
+register_algorithm("co_sort", lambda array1, array2: co_sort(array2, array1)[::-1],
+                   "co_sort", False, True, True, False, "O(n log n)")
+register_algorithm("co_sort_numba", lambda array1, array2: co_sort_numba(array2, array1)[::-1],
+                   "co_sort", True, True, True, False, "O(n log n)")
+
+def select_algorithms(use_numba=None, n=None, max_quadratic_size=QUADRATIC_SIZE_LIMIT):
+    '''
+    Registered algorithms to benchmark.
+
+    Parameters
+    ----------
+    use_numba : bool, optional
+        If given, keep one variant per family: the compiled one when True (when
+        available), the pure Python one when False (when available). If None,
+        keep every registered algorithm.
+    n : int, optional
+        Array size; quadratic algorithms are dropped when ``n > max_quadratic_size``.
+    max_quadratic_size : int
+        Size limit for O(n^2) algorithms.
+
+    Returns
+    -------
+    dict
+        Selected `SortingAlgorithm` entries, keyed by family name when `use_numba`
+        is given and by registry name otherwise.
+    '''
+    selected = {}
+    for name, algorithm in SORTING_ALGORITHMS.items():
+        if n is not None and algorithm.quadratic and n > max_quadratic_size:
+            continue
+        if use_numba is None:
+            selected[name] = algorithm
+        elif algorithm.family not in selected or algorithm.compiled == use_numba:
+            selected[algorithm.family] = algorithm
+    return selected
+
+def choose_algorithm(array2, stable=False):
+    '''
+    Pick the registered algorithm expected to be fastest for a key array.
+
+    The choice depends on the array size, its presortedness (number of descents,
+    i.e. of ascending runs minus one) and the number of Numba threads:
+
+    - already sorted: None (nothing to do),
+    - small arrays: insertion sort (Numba),
+    - long ascending runs: NumPy's adaptive stable sort (`co_sort`),
+    - several threads: parallel merge sort (stable) or introsort,
+    - otherwise: radix sort (Numba, O(n)).
+
+    Parameters
+    ----------
+    array2 : np.ndarray
+        Array to sort by.
+    stable : bool, default=False
+        Require a stable algorithm.
+
+    Returns
+    -------
+    SortingAlgorithm or None
+    '''
+    n = len(array2)
+    if n <= SMALL_ARRAY_SIZE:
+        return SORTING_ALGORITHMS["insertion_sort_numba"]
+    descents = np.count_nonzero(array2[1:] < array2[:-1])
+    if descents == 0:
+        return None
+    if descents <= n // PRESORTED_RUN_RATIO:
+        return SORTING_ALGORITHMS["co_sort"]
+    if numba.get_num_threads() > 1:
+        return SORTING_ALGORITHMS["merge_sort_numba" if stable else "introsort_numba"]
+    return SORTING_ALGORITHMS["radix_sort_numba"]
+
+def sort(array1, array2, algorithm="auto", stable=False):
+    '''
+    Sort `array2` and permute `array1` alongside with a registered algorithm.
+
+    Parameters
+    ----------
+    array1 : np.ndarray
+        Array to sort.
+    array2 : np.ndarray
+        Array to sort.
+    algorithm : str, default="auto"
+        Registry name, or "auto" to let `choose_algorithm` pick one.
+    stable : bool, default=False
+        With "auto", require a stable algorithm.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted arrays.
+    '''
+    if algorithm == "auto":
+        chosen = choose_algorithm(array2, stable)
+        if chosen is None:
+            return array1, array2
+    elif algorithm in SORTING_ALGORITHMS:
+        chosen = SORTING_ALGORITHMS[algorithm]
+    else:
+        raise ValueError(f"algorithm must be 'auto' or one of {list(SORTING_ALGORITHMS)}")
+    return chosen.func(array1, array2)
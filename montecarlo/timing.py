@@ -0,0 +1,91 @@
+import time
+import numpy as np
+
+def measure(func, setup=None, min_repeats=3, max_repeats=20, rel_tolerance=0.02, max_time=30.0):
+    """
+    Times a function with a separate warm-up call and adaptive stopping.
+
+    The first (warm-up) call is timed on its own: for Numba functions it includes
+    the JIT compilation, and its excess over the median of the timed calls is
+    reported as ``compile_time``. The timed calls then repeat until the relative
+    standard error of their mean falls below `rel_tolerance` (after at least
+    `min_repeats` calls), `max_repeats` is reached or `max_time` seconds of timed
+    calls have elapsed.
+
+    Parameters
+    ----------
+    func : callable
+        Function to time, called as ``func(*setup())``.
+    setup : callable, optional
+        Returns the argument tuple of each call (e.g. fresh copies of the arrays
+        to sort). It is not timed. Default: no arguments.
+    min_repeats : int, default=3
+        Minimum number of timed calls.
+    max_repeats : int, default=20
+        Maximum number of timed calls.
+    rel_tolerance : float, default=0.02
+        Target relative standard error of the mean time.
+    max_time : float, default=30.0
+        Time budget in seconds for the timed calls.
+
+    Returns
+    -------
+    dict
+        ``result`` (return value of the warm-up call), ``times`` (np.ndarray,
+        seconds of each timed call), ``first_call_time`` and ``compile_time`` (seconds).
+    """
+    if setup is None:
+        setup = tuple
+
+    args = setup()
+    start = time.perf_counter_ns()
+    result = func(*args)
+    first_call_ns = time.perf_counter_ns() - start
+
+    times_ns = []
+    while len(times_ns) < max(max_repeats, 1):
+        args = setup()
+        start = time.perf_counter_ns()
+        func(*args)
+        times_ns.append(time.perf_counter_ns() - start)
+
+        n = len(times_ns)
+        if n >= min_repeats:
+            mean = np.mean(times_ns)
+            if n > 1 and mean > 0 and np.std(times_ns, ddof=1) / np.sqrt(n) / mean <= rel_tolerance:
+                break
+            if sum(times_ns) >= max_time * 1e9:
+                break
+
+    times = np.array(times_ns) * 1e-9
+    first_call_time = first_call_ns * 1e-9
+    return {
+        "result": result,
+        "times": times,
+        "first_call_time": first_call_time,
+        "compile_time": max(first_call_time - float(np.median(times)), 0.0),
+    }
+
+def summarize_times(times):
+    """
+    Robust statistics of repeated timings.
+
+    Parameters
+    ----------
+    times : array_like
+        Timings in seconds.
+
+    Returns
+    -------
+    dict
+        ``median``, ``iqr``, ``min``, ``mean`` and ``n_repeats``.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {
+        "median": median,
+        "iqr": q3 - q1,
+        "min": times.min(),
+        "mean": times.mean(),
+        "n_repeats": len(times),
+    }
@@ -1,20 +1,20 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-from scipy.signal import savgol_filter
+from montecarlo.distribution import WDistribution
 
-def plot_w_distribution(freq_X, chain_lengths, smooth_window=51, poly_order=3, label=None, color=None):
+def plot_w_distribution(freq_X, chain_lengths, smooth_window=51, poly_order=3, label=None, color=None,
+                        n_bins=None, counts=None):
     """
     Plot wX distribution with points and smoothed line.
 
+    To plot several monomers of the same ensemble, build one `WDistribution`
+    and call its `plot` method instead: the binning is then done only once.
+
     Parameters
     ----------
     freq_X : np.ndarray
         Monomer fraction array (freq_A, freq_B, or freq_C).
     chain_lengths : np.ndarray
         Corresponding chain lengths.
-    n_bins : int, default=1000
-        Number of bins for the distribution.
     smooth_window : int
         Window size for Savitzky-Golay smoothing (must be odd).
     poly_order : int
@@ -23,39 +23,31 @@ def plot_w_distribution(freq_X, chain_lengths, smooth_window=51, poly_order=3, l
         Label for the plot.
     color : str
         Color for points and line.
+    n_bins : int, optional
+        Number of bins over [0, 1]. Default: ceil(len(chain_lengths) / 10)
+    counts : np.ndarray, optional
+        Number of units of the monomer in each chain. If given, the chains are
+        binned exactly from the counts (`WDistribution.from_counts`), like the
+        kernel histograms, and `freq_X` is not used.
     """
-    n_bins = int(np.ceil(len(chain_lengths) / 10))
-    # Compute the w distribution
-    bins = np.linspace(0, 1, n_bins + 1)
-    bin_centers = (bins[:-1] + bins[1:]) / 2
-
-    wX = np.zeros(n_bins)
-    bin_indices = np.digitize(freq_X, bins) - 1
-    for idx, L in zip(bin_indices, chain_lengths):
-        if 0 <= idx < n_bins:
-            wX[idx] += L
+    distribution = _distribution(freq_X, chain_lengths, n_bins, counts)
+    distribution.plot(0, smooth_window, poly_order, label=label, color=color)
 
-    dx = bins[1] - bins[0]
-    wX /= wX.sum() * dx
+def _distribution(fractions, chain_lengths, n_bins, counts):
+    """W distribution of one monomer, from its counts when available, else from its fractions."""
+    if counts is not None:
+        return WDistribution.from_counts(chain_lengths, np.atleast_2d(counts), n_bins=n_bins)
+    return WDistribution.from_fractions(chain_lengths, fractions, n_bins=n_bins)
 
-    # Smooth curve using Savitzky-Golay
-    if smooth_window >= len(wX):
-        smooth_window = len(wX) - 1
-        if smooth_window % 2 == 0:
-            smooth_window -= 1  # window must be odd
-    wX_smooth = savgol_filter(wX, smooth_window, poly_order)
-
-    # Plot
-    plt.scatter(bin_centers, wX, s=10, label=f"{label} points" if label else None, color=color, alpha=0.6)
-    plt.plot(bin_centers, wX_smooth, label=f"{label} smooth" if label else None, color=color, linewidth=2)
-    plt.xlabel("Monomer fraction")
-    plt.ylabel("wX (normalized)")
-    plt.legend()
-
-def save_w_distribution_csv(monomer_fractions, chain_lengths, filename="w_distribution.csv", n_bins=None):
+def save_w_distribution_csv(monomer_fractions, chain_lengths, filename="w_distribution.csv", n_bins=None,
+                            counts=None):
     """
     Save the W distribution data for a monomer fraction to a CSV file.
 
+    The bins span [0, 1] and W is normalized so that the area under the curve
+    is 1 (not the sum of the values, as in earlier versions), exactly as in
+    `plot_w_distribution`.
+
     Parameters
     ----------
     monomer_fractions : np.ndarray
@@ -66,22 +58,7 @@ def save_w_distribution_csv(monomer_fractions, chain_lengths, filename="w_distri
         Output CSV file path.
     n_bins : int, optional
         Number of bins. Default: ceil(len(chain_lengths) / 10)
+    counts : np.ndarray, optional
+        Number of units of the monomer in each chain; as in `plot_w_distribution`.
     """
-    if n_bins is None:
-        n_bins = int(np.ceil(len(chain_lengths) / 10))
-    
-    # Create bins and W values
-    bins = np.linspace(np.min(monomer_fractions), np.max(monomer_fractions), n_bins+1)
-    W_values, _ = np.histogram(monomer_fractions, bins=bins, weights=chain_lengths, density=False)
-    
-    # Normalize so the area under the curve is 1
-    W_values = W_values / W_values.sum()
-    
-    bin_centers = (bins[:-1] + bins[1:]) / 2
-    
-    df = pd.DataFrame({
-        "bin_center": bin_centers,
-        "W": W_values
-    })
-    
-    df.to_csv(filename, index=False)
\ No newline at end of file
+    _distribution(monomer_fractions, chain_lengths, n_bins, counts).to_csv(filename, monomer=0)
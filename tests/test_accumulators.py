@@ -0,0 +1,151 @@
+import numpy as np
+from montecarlo.accumulators import (
+    CountAccumulator, WHistogramAccumulator, LengthHistogramAccumulator,
+    JointHistogramAccumulator, MomentAccumulator, accumulate, log_length_edges
+)
+from montecarlo.simulation import iter_chains, BLOCK_SIZE
+from montecarlo.kinetics import KineticModel
+from montecarlo.exact import exact_moments
+
+chain_lengths = np.array([1, 2, 4, 5])
+counts = np.array([
+    [1, 1, 4, 2],
+    [0, 1, 0, 2],
+    [0, 0, 0, 1],
+])
+
+def test_count_accumulator():
+    acc = CountAccumulator()
+    acc.update(chain_lengths, counts)
+    acc.update(chain_lengths, counts)
+
+    assert acc.n_chains == 8
+    assert np.array_equal(acc.monomer_counts, [16, 6, 2])
+    assert acc.n_units == 2 * chain_lengths.sum()
+
+def test_w_histogram_accumulator():
+    acc = WHistogramAccumulator(n_bins=4)
+    acc.update(chain_lengths, counts)
+
+    # Fractions of A: 1.0, 0.5, 1.0, 0.4 -> bins 3, 2, 3, 1
+    assert np.array_equal(acc.weights[0], [0, 5, 2, 5])
+    assert np.allclose(acc.distribution().sum(axis=1) * 0.25, 1.0)
+
+def test_accumulators_merge_matches_single_pass():
+    single = WHistogramAccumulator(n_bins=10)
+    single.update(chain_lengths, counts)
+
+    first, second = WHistogramAccumulator(n_bins=10), WHistogramAccumulator(n_bins=10)
+    first.update(chain_lengths[:1], counts[:, :1])
+    second.update(chain_lengths[1:], counts[:, 1:])
+
+    assert np.array_equal(first.merge(second).weights, single.weights)
+
+def test_accumulate_streamed_chains():
+    counter, averages = accumulate(iter_chains(1000, chunk_size=300, seed=0),
+                                   CountAccumulator(), MomentAccumulator())
+
+    assert counter.n_chains == 1000
+    assert averages.n_chains == 1000
+    assert np.isclose(averages.mean_fractions.sum(), 1.0)
+
+def test_length_histogram_accumulator():
+    acc = LengthHistogramAccumulator(edges=[1, 2, 4])
+    acc.update(chain_lengths)
+
+    # 1 -> [1, 2); 2 -> [2, 4); 4 and 5 are past the last edge -> last bin
+    assert np.array_equal(acc.counts, [1, 3])
+
+def test_log_length_edges():
+    edges = log_length_edges(max_length=1000, bins_per_decade=5)
+    assert edges[0] == 1 and edges[-1] == 1000
+    assert np.all(np.diff(edges) > 0)
+
+def test_joint_histogram_accumulator():
+    acc = JointHistogramAccumulator(length_edges=[1, 2, 4], n_bins=4)
+    acc.update(chain_lengths, counts)
+
+    # A: (length bin, fraction bin) = (0, 3), (1, 2), (1, 3), (1, 1)
+    assert np.array_equal(acc.counts[0], [[0, 0, 0, 1], [0, 1, 1, 1]])
+    assert np.array_equal(acc.weights[0], [[0, 0, 0, 1], [0, 5, 2, 4]])
+    assert np.array_equal(acc.counts.sum(axis=(1, 2)), [4, 4, 4])
+
+def test_joint_histogram_marginals_match_1d_histograms():
+    chunks = list((lengths.copy(), chunk_counts.copy())
+                  for lengths, chunk_counts in iter_chains(4096, chunk_size=4096, use_numba=True, seed=1))
+    edges = log_length_edges(10**5)
+    joint, w_hist, length_hist = accumulate(chunks, JointHistogramAccumulator(edges, n_bins=20),
+                                            WHistogramAccumulator(n_bins=20), LengthHistogramAccumulator(edges))
+
+    assert np.array_equal(joint.marginal_w(), w_hist.weights)
+    assert np.array_equal(joint.marginal_lengths(), length_hist.counts)
+
+def test_joint_histogram_merge_save_load(tmp_path):
+    single = JointHistogramAccumulator(length_edges=[1, 2, 4], n_bins=4)
+    single.update(chain_lengths, counts)
+    first = JointHistogramAccumulator(length_edges=[1, 2, 4], n_bins=4)
+    second = JointHistogramAccumulator(length_edges=[1, 2, 4], n_bins=4)
+    first.update(chain_lengths[:2], counts[:, :2])
+    second.update(chain_lengths[2:], counts[:, 2:])
+    merged = first.merge(second)
+
+    assert np.array_equal(merged.counts, single.counts)
+    merged.save(tmp_path / "joint.npz")
+    loaded = JointHistogramAccumulator.load(tmp_path / "joint.npz")
+    assert np.array_equal(loaded.counts, single.counts)
+    assert np.array_equal(loaded.weights, single.weights)
+    assert loaded.to_frame()["n_chains"].sum() == 3 * len(chain_lengths)
+
+def test_moment_accumulator():
+    acc = MomentAccumulator()
+    acc.update(chain_lengths[:3], counts[:, :3])
+    acc.update(chain_lengths[3:], counts[:, 3:])
+    lengths = chain_lengths.astype(float)
+
+    assert acc.n_chains == 4
+    assert acc.mn == 3.0
+    assert np.isclose(acc.mw, (lengths ** 2).sum() / lengths.sum())
+    assert np.isclose(acc.mz, (lengths ** 3).sum() / (lengths ** 2).sum())
+    assert np.isclose(acc.pdi, acc.mw / acc.mn)
+    assert np.allclose(acc.composition, counts.sum(axis=1) / chain_lengths.sum())
+    assert np.allclose(acc.mean_fractions, (counts / chain_lengths).mean(axis=1))
+
+    errors = acc.standard_errors()
+    assert np.isclose(errors["mn"], lengths.std() / 2)
+    assert np.allclose(errors["mean_fractions"], (counts / chain_lengths).std(axis=1, ddof=1) / 2)
+
+def test_moment_accumulator_merge_matches_single_pass():
+    single = MomentAccumulator()
+    single.update(chain_lengths, counts)
+
+    first, second = MomentAccumulator(), MomentAccumulator()
+    first.update(chain_lengths[:1], counts[:, :1])
+    second.update(chain_lengths[1:], counts[:, 1:])
+    merged = first.merge(second)
+
+    assert merged.n_chains == single.n_chains
+    assert np.allclose(merged.sums + merged.comps, single.sums + single.comps)
+    assert np.allclose(merged.fraction_m2, single.fraction_m2)
+    assert merged.to_frame()["quantity"].tolist()[:4] == ["Mn", "Mw", "Mz", "PDI"]
+
+def test_moment_accumulator_compensated_sums():
+    acc = MomentAccumulator(n_monomers=1)
+    acc.update(np.array([10**16]), np.array([[10**16]]))
+    for _ in range(1000):
+        acc.update(np.array([1]), np.array([[1]]))
+
+    # Adding 1 to 1e16 is lost in a plain float64 sum, not with the compensation
+    assert acc.sums[0] == 1e16
+    assert acc.comps[0] == 1000.0
+
+def test_moment_accumulator_matches_exact_moments():
+    model = KineticModel(total_random_events=100)
+    acc, = accumulate(iter_chains(50 * BLOCK_SIZE, chunk_size=10 * BLOCK_SIZE, engine="skip", seed=5, model=model),
+                      MomentAccumulator())
+    exact = exact_moments(model)
+    se = acc.standard_errors()
+
+    for key in ["mn", "mw", "mz", "pdi"]:
+        assert abs(getattr(acc, key) - getattr(exact, key)) < 5 * se[key]
+    assert np.all(np.abs(acc.composition - exact.composition) < 5 * se["composition"])
+    assert np.all(np.abs(acc.mean_fractions - exact.mean_fractions) < 5 * se["mean_fractions"])
@@ -1,6 +1,11 @@
+import subprocess
+import sys
 import numpy as np
 import pandas as pd
-from montecarlo.analysis import run_scaling_benchmark, save_results_to_csv
+from montecarlo.analysis import (
+    run_scaling_benchmark, run_thread_scaling_benchmark, run_generation_benchmark, summarize_benchmark,
+    run_startup_benchmark, run_rng_benchmark, save_results_to_csv
+)
 
 def test_run_scaling_benchmark():
     n_chains_list = [10, 20]
@@ -30,4 +35,60 @@ def test_save_results_to_csv(tmp_path):
 
     df_loaded = pd.read_csv(csv_file)
     assert not df_loaded.empty
-    assert set(df_loaded.columns) == {"number_of_chains", "algorithm", "use_numba", "generation_time", "sorting_time", "repeat"}
\ No newline at end of file
+    assert set(df_loaded.columns) == {"number_of_chains", "algorithm", "use_numba", "generation_time",
+                                      "generation_compile_time", "sorting_time", "sorting_compile_time", "repeat",
+                                      "total_time"}
+    assert np.allclose(df_loaded["total_time"], df_loaded["generation_time"] + df_loaded["sorting_time"])
+
+def test_run_thread_scaling_benchmark():
+    df = run_thread_scaling_benchmark(1000, thread_counts=[1, 2], n_repeats=1)
+
+    assert set(df.columns) == {"number_of_chains", "algorithm", "n_threads", "sorting_time",
+                               "sorting_compile_time", "repeat"}
+    assert 1 in set(df["n_threads"]) and set(df["n_threads"]) <= {1, 2}
+    assert {"merge_sort", "introsort", "numpy_stable_argsort"} <= set(df["algorithm"])
+    assert (df["sorting_time"] > 0).all()
+
+
+def test_summarize_benchmark():
+    df = run_scaling_benchmark([200], n_repeats=4, use_numba=True)
+    summary = summarize_benchmark(df)
+
+    assert len(summary) == df["algorithm"].nunique()
+    for col in ["sorting_time_median", "sorting_time_iqr", "sorting_time_min",
+                "sorting_compile_time", "chains_per_s", "elements_sorted_per_s"]:
+        assert col in summary.columns
+    assert (summary["sorting_time_min"] <= summary["sorting_time_median"]).all()
+    assert (summary["n_repeats"] <= 4).all()
+    assert (summary["elements_sorted_per_s"] > 0).all()
+
+
+def test_run_generation_benchmark():
+    df = run_generation_benchmark([100], engines=("numba", "skip"), n_repeats=2)
+
+    assert set(df["algorithm"]) == {"numba", "skip"}
+    assert (df["generation_time"] > 0).all()
+    assert "generation_compile_time" in df.columns
+
+def test_run_startup_benchmark():
+    df = run_startup_benchmark(script="import montecarlo.kinetics", import_script="import montecarlo.kinetics",
+                               n_repeats=1)
+
+    assert list(df.columns) == ["mode", "launch_time", "repeat"]
+    assert list(df["mode"]) == ["import", "cold", "warm"]
+    assert (df["launch_time"] > 0).all()
+
+def test_analysis_imports_plotting_lazily():
+    code = "import sys, montecarlo.analysis; print('matplotlib' in sys.modules, 'pandas' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert out.stdout.split() == ["False", "False"]
+
+def test_run_rng_benchmark():
+    df = run_rng_benchmark(n_chains=3000, n_repeats=1)
+
+    assert list(zip(df["generator"], df["uniforms_per_monomer"])) == [
+        ("mt19937", 2), ("mt19937", 1), ("counter", 2), ("counter", 1)]
+    assert df["speedup"].iloc[0] == 1.0
+    assert (df["ks_pvalue"] > 1e-4).all()
+    assert (df["max_count_z"] < 6).all()
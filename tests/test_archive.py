@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from montecarlo.archive import ChainArchive, ChainArchiveWriter, write_archive
+from montecarlo.accumulators import WHistogramAccumulator, accumulate
+from montecarlo.distribution import WDistribution
+from montecarlo.simulation import generate_chains, BLOCK_SIZE
+
+counts = np.array([
+    [1, 1, 4, 2],
+    [0, 1, 0, 2],
+    [0, 0, 0, 1],
+])
+chain_lengths = counts.sum(axis=0)
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_archive_append_and_read(tmp_path, compress):
+    path = tmp_path / "chains.npz"
+    with ChainArchiveWriter(path, n_bins=4, dtype=np.uint16, compress=compress, metadata={"seed": 7}) as writer:
+        writer.append(chain_lengths[:3], counts[:, :3])
+        writer.append(chain_lengths[3:], counts[:, 3:])
+    archive = ChainArchive(path)
+    lengths, read_counts = archive.read(1, 4)
+
+    assert len(archive) == 4
+    assert archive.segment_sizes == [3, 1]
+    assert archive.metadata["seed"] == 7
+    assert archive.mmap is not compress
+    assert read_counts.dtype == np.uint16
+    assert np.array_equal(lengths, chain_lengths[1:])
+    assert np.array_equal(read_counts, counts[:, 1:])
+    assert np.allclose(archive.w_distribution().weights,
+                       WDistribution.from_counts(chain_lengths, counts, n_bins=4).weights)
+
+def test_archive_segments_are_memory_maps(tmp_path):
+    path = tmp_path / "chains.npz"
+    with ChainArchiveWriter(path) as writer:
+        writer.append(chain_lengths, counts)
+    lengths, segment = next(ChainArchive(path).segments())
+
+    assert isinstance(segment, np.memmap)
+    assert not segment.flags.writeable
+    assert np.array_equal(segment, counts)
+    with np.load(path) as data:
+        assert np.array_equal(data["chains/000000/lengths"], chain_lengths)
+
+def test_archive_rejects_overflow(tmp_path):
+    with ChainArchiveWriter(tmp_path / "chains.npz", dtype=np.uint16) as writer:
+        with pytest.raises(OverflowError):
+            writer.append(np.array([70000]), np.array([[70000], [0], [0]]))
+
+def test_write_archive_matches_generate_chains(tmp_path):
+    num_chains = 2 * BLOCK_SIZE + 10
+    archive = write_archive(tmp_path / "chains.npz", num_chains, chunk_size=BLOCK_SIZE, n_bins=20, seed=4,
+                            engine="skip")
+    lengths, freq_A, freq_B, freq_C = generate_chains(num_chains, seed=4, engine="skip")
+    w_hist = accumulate(archive.segments(), WHistogramAccumulator(n_bins=20))[0]
+
+    assert archive.metadata["engine"] == "skip" and archive.metadata["n_chains"] == num_chains
+    assert archive.model().names == ("A", "B", "C")
+    assert np.array_equal(archive.read(0, num_chains)[0], lengths)
+    assert np.allclose(archive.to_ensemble().fraction(0), freq_A)
+    assert np.array_equal(w_hist.weights, archive.w_distribution().weights)
+
+@pytest.mark.parametrize("engine", ["numba", "python"])
+def test_write_archive_records_drawn_seed(tmp_path, engine):
+    archive = write_archive(tmp_path / "chains.npz", 100, chunk_size=BLOCK_SIZE, engine=engine)
+    repeat = write_archive(tmp_path / "repeat.npz", 100, chunk_size=BLOCK_SIZE, engine=engine,
+                           seed=archive.metadata["seed"])
+
+    assert archive.metadata["engine"] == engine
+    assert np.array_equal(archive.read(0, 100)[1], repeat.read(0, 100)[1])
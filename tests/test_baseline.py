@@ -0,0 +1,59 @@
+import pandas as pd
+from montecarlo.baseline import machine_fingerprint, save_run, load_baseline, compare_runs, main
+
+def make_run(times_by_algorithm):
+    return pd.DataFrame([
+        {"number_of_chains": 1000, "algorithm": algo, "sorting_time": t, "repeat": i + 1}
+        for algo, times in times_by_algorithm.items()
+        for i, t in enumerate(times)
+    ])
+
+def test_machine_fingerprint():
+    fingerprint = machine_fingerprint()
+    for key in ["git_commit", "cpu_model", "n_cores", "numpy_version", "numba_version", "machine_key"]:
+        assert key in fingerprint
+    assert machine_fingerprint()["machine_key"] == fingerprint["machine_key"]
+
+def test_save_and_load_baseline(tmp_path):
+    run = make_run({"merge_sort": [1.0, 1.1, 1.2]})
+    fingerprint = machine_fingerprint()
+
+    path = save_run(run, tmp_path, fingerprint)
+    assert path.parent.name == fingerprint["machine_key"]
+
+    loaded = load_baseline(tmp_path, machine_key=fingerprint["machine_key"])
+    assert list(loaded["sorting_time"]) == [1.0, 1.1, 1.2]
+    assert (loaded["git_commit"] == fingerprint["git_commit"]).all()
+    assert load_baseline(tmp_path, machine_key="nothing-here") is None
+
+def test_compare_runs_flags_regression():
+    baseline = make_run({"merge_sort": [1.0, 1.01, 0.99, 1.0, 1.02], "introsort": [1.0, 1.01, 0.99, 1.0, 1.02]})
+    current = make_run({"merge_sort": [1.5, 1.52, 1.49, 1.51, 1.5], "introsort": [1.0, 0.99, 1.01, 1.0, 1.0]})
+
+    result = compare_runs(current, baseline).set_index("algorithm")
+
+    assert result.loc["merge_sort", "regression"]
+    assert result.loc["merge_sort", "throughput_change"] < -0.3
+    assert not result.loc["introsort", "regression"]
+
+def test_compare_command(tmp_path):
+    baseline = make_run({"merge_sort": [1.0, 1.01, 0.99, 1.0, 1.02]})
+    current = make_run({"merge_sort": [2.0, 2.01, 1.99, 2.0, 2.02]})
+    save_run(baseline, tmp_path)
+    run_file = tmp_path / "current.csv"
+    current.to_csv(run_file, index=False)
+
+    assert main(["--store", str(tmp_path), "compare", str(run_file)]) == 1
+
+def test_compare_after_saving_current_run(tmp_path):
+    baseline = make_run({"merge_sort": [1.0, 1.01, 0.99, 1.0, 1.02]})
+    current = make_run({"merge_sort": [2.0, 2.01, 1.99, 2.0, 2.02]})
+    fingerprint = machine_fingerprint()
+    save_run(baseline, tmp_path, {**fingerprint, "timestamp": "20250101T000000Z"})
+    save_run(current, tmp_path, {**fingerprint, "timestamp": "20250102T000000Z"})
+    run_file = tmp_path / "current.csv"
+    current.assign(total_time=current["sorting_time"]).to_csv(run_file, index=False)
+
+    loaded = load_baseline(tmp_path, exclude=pd.read_csv(run_file))
+    assert list(loaded["sorting_time"]) == list(baseline["sorting_time"])
+    assert main(["--store", str(tmp_path), "compare", str(run_file)]) == 1
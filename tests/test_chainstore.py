@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from montecarlo.chainstore import ChainStore, generate_store, external_sort
+from montecarlo.accumulators import WHistogramAccumulator, accumulate
+from montecarlo.simulation import generate_chains, BLOCK_SIZE
+
+counts = np.array([
+    [1, 1, 4, 2],
+    [0, 1, 0, 2],
+    [0, 0, 0, 1],
+])
+
+def test_chain_store_append_and_reopen(tmp_path):
+    store = ChainStore(tmp_path / "store", dtype=np.uint16)
+    store.append(counts[:, :3])
+    store.append(counts[:, 3:])
+    reopened = ChainStore(tmp_path / "store")
+
+    assert len(reopened) == 4
+    assert reopened.dtype == np.uint16
+    assert np.array_equal(reopened.read(0, 4), counts)
+    assert np.array_equal(reopened.read(2, 4), counts[:, 2:])
+
+def test_chain_store_rejects_overflow(tmp_path):
+    store = ChainStore(tmp_path / "store", dtype=np.uint16)
+    with pytest.raises(OverflowError):
+        store.append(np.full((3, 2), 70000))
+
+def test_generate_store_matches_generate_chains(tmp_path):
+    num_chains = 2 * BLOCK_SIZE + 10
+    store = generate_store(tmp_path / "store", num_chains, chunk_size=BLOCK_SIZE, engine="skip", seed=4)
+    chain_lengths, freq_A, _, _ = generate_chains(num_chains, engine="skip", seed=4)
+    ensemble = store.to_ensemble()
+
+    assert len(store.segment_sizes) == 3
+    assert np.array_equal(ensemble.chain_lengths, chain_lengths)
+    assert np.allclose(ensemble.fraction("A"), freq_A)
+
+    with pytest.raises(FileExistsError):
+        generate_store(tmp_path / "store", 10, engine="skip")
+
+def test_external_sort(tmp_path):
+    num_chains = 3 * BLOCK_SIZE
+    store = generate_store(tmp_path / "store", num_chains, chunk_size=BLOCK_SIZE, engine="skip", seed=4)
+    sorted_store = external_sort(store, tmp_path / "sorted", by="B", run_size=1000, buffer_size=100)
+    ensemble = sorted_store.to_ensemble()
+    original = store.to_ensemble()
+
+    assert len(sorted_store) == num_chains
+    assert np.all(np.diff(ensemble.fraction("B")) >= 0)
+    assert np.array_equal(np.sort(ensemble.chain_lengths), np.sort(original.chain_lengths))
+    assert not (tmp_path / "sorted" / "runs").exists()
+
+    w_sorted, = accumulate(sorted_store.chunks(), WHistogramAccumulator(n_bins=50))
+    w_original, = accumulate(store.chunks(), WHistogramAccumulator(n_bins=50))
+    assert np.array_equal(w_sorted.weights, w_original.weights)
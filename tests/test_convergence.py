@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from montecarlo.convergence import distribution_distance, simulate_until_converged
+from montecarlo.simulation import BLOCK_SIZE
+
+def test_distribution_distance_metrics():
+    p = np.array([[1.0, 0.0, 0.0, 0.0]])
+    q = np.array([[0.0, 0.0, 0.0, 2.0]])
+
+    assert distribution_distance(p, p, "L1") == 0.0
+    assert np.isclose(distribution_distance(p, q, "L1"), 2.0)
+    assert np.isclose(distribution_distance(p, q, "KS"), 1.0)
+    assert np.isclose(distribution_distance(p, q, "Hellinger"), 1.0)
+
+def test_distribution_distance_takes_worst_monomer():
+    p = np.array([[1.0, 1.0], [1.0, 0.0]])
+    q = np.array([[1.0, 1.0], [1.0, 1.0]])
+
+    assert np.isclose(distribution_distance(p, q, "L1"), 1.0)
+
+def test_distribution_distance_invalid_metric():
+    with pytest.raises(ValueError):
+        distribution_distance(np.ones((1, 2)), np.ones((1, 2)), "L2")
+
+@pytest.mark.parametrize("metric", ["L1", "KS", "Hellinger", "moments"])
+def test_simulate_until_converged(metric):
+    result = simulate_until_converged(tolerance=0.05, metric=metric, batch=BLOCK_SIZE, n_bins=20,
+                                      engine="skip", seed=0)
+
+    assert result.converged
+    assert result.n_chains == result.averages.n_chains == len(result.trace) * BLOCK_SIZE
+    assert np.isnan(result.trace[0]["distance"])
+    assert all(entry["distance"] <= 0.05 for entry in result.trace[-2:])
+    assert np.isclose(result.w_hist.weights.sum(axis=1), result.averages.sum_lengths).all()
+
+def test_simulate_until_converged_stops_at_max_chains():
+    result = simulate_until_converged(tolerance=0.0, batch=BLOCK_SIZE, max_chains=3 * BLOCK_SIZE, engine="skip",
+                                      seed=0)
+
+    assert not result.converged
+    assert result.n_chains == 3 * BLOCK_SIZE
+    assert len(result.trace) == 3
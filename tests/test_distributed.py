@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from montecarlo.simulation import generate_chains, histogram_chains, BLOCK_SIZE
+from montecarlo.distributed import _tasks
+from montecarlo.kinetics import KineticModel
+
+def test_process_backend_matches_local_ensemble():
+    num_chains = 2 * BLOCK_SIZE + 100
+    local = generate_chains(num_chains, engine="skip", seed=5)
+    distributed = generate_chains(num_chains, engine="skip", seed=5, workers=2, backend="process")
+
+    for a, b in zip(local, distributed):
+        assert np.array_equal(a, b)
+
+def test_executor_backend_matches_local_ensemble():
+    num_chains = 3 * BLOCK_SIZE
+    local = generate_chains(num_chains, engine="numba", seed=5)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        distributed = generate_chains(num_chains, engine="numba", seed=5, executor=executor, workers=2)
+
+    for a, b in zip(local, distributed):
+        assert np.array_equal(a, b)
+
+def test_python_engine_independent_of_task_count():
+    num_chains = 3 * BLOCK_SIZE + 17  # four blocks, the last one ragged
+    model = KineticModel(total_random_events=10)  # short chains keep the Python engine fast
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = [generate_chains(num_chains, engine="python", seed=5, model=model, executor=executor,
+                                   workers=workers) for workers in (1, 2, 4)]
+
+    assert [len(_tasks(num_chains, workers)) for workers in (1, 2, 4)] == [1, 2, 4]
+    assert len(results[0][0]) == num_chains
+    for other in results[1:]:
+        for a, b in zip(results[0], other):
+            assert np.array_equal(a, b)
+
+def test_histogram_chains_merges_partial_histograms():
+    num_chains = 2 * BLOCK_SIZE + 100
+    w_hist, length_hist = histogram_chains(num_chains, n_bins=50, engine="skip", seed=5)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        w_dist, length_dist = histogram_chains(num_chains, n_bins=50, engine="skip", seed=5, executor=executor)
+
+    assert np.array_equal(w_hist.weights, w_dist.weights)
+    assert np.array_equal(length_hist.counts, length_dist.counts)
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        generate_chains(10, backend="cluster")
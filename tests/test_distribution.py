@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from montecarlo.distribution import WDistribution
+from montecarlo.accumulators import WHistogramAccumulator
+
+chain_lengths = np.array([1, 2, 4, 5])
+counts = np.array([
+    [1, 1, 4, 2],
+    [0, 1, 0, 2],
+    [0, 0, 0, 1],
+])
+
+def test_from_counts_matches_histogram_accumulator():
+    w_hist = WHistogramAccumulator(n_bins=10)
+    w_hist.update(chain_lengths, counts)
+    distribution = WDistribution.from_counts(chain_lengths, counts, n_bins=10)
+
+    assert np.array_equal(distribution.weights, w_hist.weights)
+    assert np.array_equal(WDistribution.from_histogram(w_hist).weights, w_hist.weights)
+
+def test_from_fractions_bins_all_monomers_on_shared_edges():
+    fractions = counts / chain_lengths
+    distribution = WDistribution.from_fractions(chain_lengths, *fractions, n_bins=4)
+
+    assert distribution.weights.shape == (3, 4)
+    assert np.array_equal(distribution.weights[0], [0, 5, 2, 5])  # a fraction of 1 falls in the last bin
+    assert np.allclose(distribution.weights.sum(axis=1), chain_lengths.sum())
+    assert np.allclose(distribution.density().sum(axis=1) * 0.25, 1.0)
+
+def test_density_and_smoothing_are_cached():
+    distribution = WDistribution.from_counts(chain_lengths, counts, n_bins=20)
+
+    assert distribution.density() is distribution.density()
+    assert distribution.smoothed("A", 5, 2) is distribution.smoothed(0, 5, 2)
+    assert distribution.smoothed("B", 51, 3).shape == (20,)
+
+def test_to_frame_and_csv(tmp_path):
+    distribution = WDistribution.from_counts(chain_lengths, counts, n_bins=10)
+    frame = distribution.to_frame()
+
+    assert list(frame.columns) == ["bin_center", "W_A", "W_B", "W_C"]
+    distribution.to_csv(tmp_path / "w_b.csv", monomer="B")
+    saved = pd.read_csv(tmp_path / "w_b.csv")
+    assert list(saved.columns) == ["bin_center", "W"]
+    assert np.allclose(saved["W"], distribution.density("B"))
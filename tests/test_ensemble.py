@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from montecarlo.ensemble import ChainEnsemble, compact_count_dtype, generate_ensemble
+from montecarlo.accumulators import WHistogramAccumulator, MomentAccumulator, accumulate
+from montecarlo.simulation import generate_chains, BLOCK_SIZE
+
+counts = np.array([
+    [1, 1, 4, 2],
+    [0, 1, 0, 2],
+    [0, 0, 0, 1],
+])
+
+def test_compact_count_dtype():
+    assert compact_count_dtype(65535) == np.uint16
+    assert compact_count_dtype(65536) == np.uint32
+    assert compact_count_dtype(2**40) == np.uint64
+
+def test_chain_ensemble_derived_arrays():
+    ensemble = ChainEnsemble(counts)
+
+    assert ensemble.counts.dtype == np.uint16
+    assert ensemble.nbytes == 3 * 4 * 2
+    assert np.array_equal(ensemble.chain_lengths, [1, 2, 4, 5])
+    assert np.allclose(ensemble.fraction("B"), [0, 0.5, 0, 0.4])
+    assert ensemble.fraction(0, dtype=np.float32).dtype == np.float32
+    assert np.allclose(ensemble.fractions().sum(axis=0), 1.0)
+
+def test_chain_ensemble_sort_keeps_chains_aligned():
+    ensemble = ChainEnsemble(counts).sort(by="A")
+    freq_A = ensemble.fraction("A")
+
+    assert np.all(np.diff(freq_A) >= 0)
+    assert np.array_equal(ensemble.chain_lengths, [5, 2, 1, 4])
+    assert np.array_equal(ensemble.counts[:, 0], [2, 2, 1])
+
+def test_chain_ensemble_chunks_feed_accumulators():
+    ensemble = ChainEnsemble(counts)
+    w_hist, averages = accumulate(ensemble.chunks(chunk_size=3), WHistogramAccumulator(n_bins=10),
+                                  MomentAccumulator())
+    reference = WHistogramAccumulator(n_bins=10)
+    reference.update(ensemble.chain_lengths, counts)
+
+    assert np.array_equal(w_hist.weights, reference.weights)
+    assert np.array_equal(averages.count_sums, counts.sum(axis=1))
+
+def test_chain_ensemble_records():
+    records = ChainEnsemble(counts).to_records(dtype=np.float32)
+
+    assert records.dtype.names == ("length", "freq_A", "freq_B", "freq_C")
+    assert records["freq_C"].dtype == np.float32
+
+def test_chain_ensemble_save_load(tmp_path):
+    ensemble = ChainEnsemble(counts, names=["X", "Y", "Z"])
+    ensemble.save(tmp_path / "ensemble.npz")
+    loaded = ChainEnsemble.load(tmp_path / "ensemble.npz")
+
+    assert loaded.names == ("X", "Y", "Z")
+    assert loaded.counts.dtype == ensemble.counts.dtype
+    assert np.array_equal(loaded.counts, ensemble.counts)
+
+def test_chain_ensemble_invalid_shape():
+    with pytest.raises(ValueError):
+        ChainEnsemble(np.arange(4))
+
+def test_generate_ensemble_matches_generate_chains():
+    num_chains = 2 * BLOCK_SIZE + 10
+    ensemble = generate_ensemble(num_chains, engine="skip", seed=2, chunk_size=BLOCK_SIZE)
+    chain_lengths, *fractions = generate_chains(num_chains, engine="skip", seed=2)
+
+    assert ensemble.counts.dtype in (np.uint16, np.uint32)
+    assert np.array_equal(ensemble.chain_lengths, chain_lengths)
+    assert np.allclose(ensemble.fractions(), fractions)
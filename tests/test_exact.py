@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from montecarlo.exact import exact_distribution, length_power_moments, length_cutoff
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import chain_moments, histogram_chains, generate_chains
+
+SHORT_MODEL = KineticModel(total_random_events=100)
+
+@pytest.fixture(scope="module")
+def exact():
+    return exact_distribution(SHORT_MODEL, n_bins=20)
+
+def test_length_probabilities_normalized(exact):
+    n = np.arange(len(exact.length_probabilities))
+
+    assert exact.length_probabilities[0] == 0.0
+    assert exact.length_probabilities.sum() + exact.tail_probability == pytest.approx(1.0, abs=1e-12)
+    assert exact.tail_probability < 1e-8
+    assert (n * exact.length_probabilities).sum() == pytest.approx(exact.mn, rel=1e-6)
+    assert exact.max_length == length_cutoff(SHORT_MODEL)
+
+def test_moments_of_single_monomer_geometric():
+    p = 0.9
+    model = KineticModel(feed=(1.0,), reactivity_ratios=((1.0,),), propagation_factors=(1.0,),
+                         termination_factors=(1.0,), total_random_events=1.0 / (1 - p) - 1)
+    m1, m2, m3 = length_power_moments(model, 3)
+    q = model.propagate_probs[0]
+    r = 1 - q
+
+    assert m1 == pytest.approx(1 / r)
+    assert m2 == pytest.approx((1 + q) / r ** 2)
+    assert m3 == pytest.approx((1 + 4 * q + q ** 2) / r ** 3)
+
+def test_compositions_consistent(exact):
+    assert exact.composition.sum() == pytest.approx(1.0)
+    assert exact.mean_fractions.sum() == pytest.approx(1.0, abs=1e-8)
+    assert np.allclose(exact.w_weights.sum(axis=1), exact.mn, rtol=1e-7)
+    assert np.allclose(exact.joint.sum(axis=(1, 2)), 1.0, atol=1e-8)
+    assert exact.pruned_probability < exact.tail_probability
+
+def test_exact_matches_monte_carlo(exact):
+    mc = chain_moments(200000, engine="skip", seed=3, model=SHORT_MODEL)
+    se = mc.standard_errors()
+
+    for key in ["mn", "mw", "mz", "pdi"]:
+        assert abs(getattr(mc, key) - getattr(exact, key)) < 5 * se[key]
+    assert np.all(np.abs(mc.composition - exact.composition) < 5 * se["composition"])
+    assert np.all(np.abs(mc.mean_fractions - exact.mean_fractions) < 5 * se["mean_fractions"])
+
+def test_chain_moments_exact_engine(exact):
+    result = chain_moments(10, engine="exact", model=SHORT_MODEL)
+
+    assert "mean_fractions" not in vars(result)  # closed form only, no dynamic programming yet
+    assert result.mn == pytest.approx(exact.mn)
+    assert result.mz == pytest.approx(exact.mz)
+    assert np.allclose(result.composition, exact.composition)
+    assert np.allclose(result.mean_fractions, exact.mean_fractions, rtol=1e-9)
+    assert result.standard_errors()["mn"] == 0.0
+    assert list(result.to_frame()["quantity"][:4]) == ["Mn", "Mw", "Mz", "PDI"]
+
+def test_histogram_chains_exact_engine():
+    n = 100000
+    w_exact, length_exact = histogram_chains(n, n_bins=20, engine="exact", model=SHORT_MODEL)
+    w_mc, length_mc = histogram_chains(n, n_bins=20, engine="skip", seed=4, model=SHORT_MODEL)
+
+    assert length_exact.counts.sum() == pytest.approx(n)
+    assert np.abs(w_exact.distribution() - w_mc.distribution()).max() < 0.05 * w_exact.distribution().max()
+    assert np.abs(length_exact.counts - length_mc.counts).max() < 5 * np.sqrt(length_exact.counts.max())
+
+def test_generate_chains_rejects_exact():
+    with pytest.raises(ValueError):
+        generate_chains(10, engine="exact")
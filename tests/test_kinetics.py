@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import generate_chains, _generate_chain_numba
+
+def test_default_model_matches_reference_parameters():
+    model = KineticModel()
+
+    P_AA = 0.6 / (0.6 + 0.2 / 5.0 + 0.2 / 10.0)
+    P_BC = (0.2 / 2.0) / (0.2 + 0.6 / 0.2 + 0.2 / 2.0)
+    Pa = (0.9091 * 1000) / (0.9091 * 1000 + 0.33)
+
+    assert model.n_monomers == 3
+    assert model.names == ("A", "B", "C")
+    assert np.isclose(model.transition_matrix[0, 0], P_AA)
+    assert np.isclose(model.transition_matrix[1, 2], P_BC)
+    assert np.isclose(model.propagate_probs[0], Pa)
+    assert np.allclose(model.transition_matrix.sum(axis=1), 1.0)
+    assert np.all(model.cumulative_transitions[:, -1] == 1.0)
+
+def test_model_shape_validation():
+    with pytest.raises(ValueError):
+        KineticModel(feed=(0.5, 0.5))
+    with pytest.raises(ValueError):
+        KineticModel(start_monomer=3)
+
+@pytest.mark.parametrize("engine", ["python", "numba", "skip"])
+def test_generate_copolymer_and_tetrapolymer(engine):
+    copolymer = KineticModel(
+        feed=(0.7, 0.3),
+        reactivity_ratios=((1.0, 2.0), (0.5, 1.0)),
+        propagation_factors=(0.9, 0.1),
+        termination_factors=(0.5, 0.5),
+        total_random_events=100,
+    )
+    D, Fa, Fb = generate_chains(200, engine=engine, model=copolymer, seed=0)
+    assert np.all(D >= 1)
+    assert np.allclose(Fa + Fb, 1.0)
+
+    tetrapolymer = KineticModel(
+        feed=(0.4, 0.2, 0.2, 0.2),
+        reactivity_ratios=np.ones((4, 4)),
+        propagation_factors=(0.7, 0.1, 0.1, 0.1),
+        termination_factors=(0.25, 0.25, 0.25, 0.25),
+        total_random_events=100,
+    )
+    D, *fractions = generate_chains(200, engine=engine, model=tetrapolymer, seed=0)
+    assert len(fractions) == 4
+    assert np.allclose(np.sum(fractions, axis=0), 1.0)
+
+def test_numba_kernel_compiles_once_for_new_parameters():
+    generate_chains(10, engine="numba", seed=0)
+    generate_chains(10, engine="numba", seed=0, model=KineticModel(feed=(0.5, 0.3, 0.2)))
+    assert len(_generate_chain_numba.signatures) == 1
@@ -1,11 +1,6 @@
 import numpy as np
 from montecarlo.performance import benchmark_sorting_algorithms
-from montecarlo.sorting_algorithms import (
-            bubble_sort, bubble_sort_numba,
-            insertion_sort, insertion_sort_numba,
-            selection_sort, selection_sort_numba,
-            tim_sort
-        )
+from montecarlo.sorting_algorithms import SORTING_ALGORITHMS
 
 def test_benchmark_sorting_algorithms():
     chain_lengths = np.array([5, 2, 9, 1, 5, 6])
@@ -17,7 +12,9 @@ def test_benchmark_sorting_algorithms():
         "bubble_sort", "bubble_sort_numba",
         "insertion_sort", "insertion_sort_numba",
         "selection_sort", "selection_sort_numba",
-        "tim_sort"
+        "tim_sort", "radix_sort_numba",
+        "merge_sort_numba", "introsort_numba",
+        "co_sort", "co_sort_numba"
     ]
 
     for algo in expected_algorithms:
@@ -29,15 +26,7 @@ def test_benchmark_sorting_algorithms():
     for algo, time_val in results.items():
         cl_copy = chain_lengths.copy()
         fa_copy = freq_A.copy()
-        func = {
-            "bubble_sort": bubble_sort,
-            "bubble_sort_numba": bubble_sort_numba,
-            "insertion_sort": insertion_sort,
-            "insertion_sort_numba": insertion_sort_numba,
-            "selection_sort": selection_sort,
-            "selection_sort_numba": selection_sort_numba,
-            "tim_sort": tim_sort
-        }[algo]
+        func = SORTING_ALGORITHMS[algo].func
         sorted_cl, sorted_fa = func(cl_copy, fa_copy)
 
         # chain_lengths deve estar ordenado
@@ -45,4 +34,24 @@ def test_benchmark_sorting_algorithms():
         
         # freq_A deve acompanhar a ordem de chain_lengths
         expected_fa = [x for _, x in sorted(zip(chain_lengths, freq_A))]
-        assert np.all(sorted_fa == expected_fa)
\ No newline at end of file
+        assert np.all(sorted_fa == expected_fa)
+
+def test_benchmark_sorting_algorithms_skips_quadratic():
+    chain_lengths = np.arange(100)
+    freq_A = np.random.rand(100)
+
+    results = benchmark_sorting_algorithms(chain_lengths, freq_A, max_quadratic_size=50)
+
+    assert "bubble_sort" not in results
+    assert "insertion_sort_numba" not in results
+    assert "radix_sort_numba" in results
+
+def test_benchmark_sorting_algorithms_reports_compile_times():
+    chain_lengths = np.arange(20)[::-1].copy()
+    freq_A = np.linspace(0, 1, 20)
+
+    results, compile_times = benchmark_sorting_algorithms(chain_lengths, freq_A, n_repeats=2,
+                                                          return_compile_times=True)
+
+    assert set(compile_times) == set(results)
+    assert all(t >= 0 for t in compile_times.values())
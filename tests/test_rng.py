@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from montecarlo.rng import counter_uniforms, _joint_transitions
+from montecarlo.simulation import generate_chains, DEFAULT_MODEL, BLOCK_SIZE
+
+def test_counter_uniforms_are_uniform():
+    u = counter_uniforms(7, 200000)
+
+    assert u.min() >= 0.0 and u.max() < 1.0
+    assert abs(u.mean() - 0.5) < 5 * np.sqrt(1 / 12 / len(u))
+    assert abs(u.var() - 1 / 12) < 0.002
+    assert abs(np.corrcoef(u[:-1], u[1:])[0, 1]) < 0.01
+    assert np.all(np.histogram(u, bins=10, range=(0, 1))[0] > 19000)
+
+def test_counter_uniforms_random_access_and_keys():
+    assert np.array_equal(counter_uniforms(3, 5, start=10), counter_uniforms(3, 15)[10:])
+    assert not np.array_equal(counter_uniforms(3, 5), counter_uniforms(4, 5))
+
+def test_joint_transitions_partition():
+    joint = _joint_transitions(DEFAULT_MODEL.propagate_probs, DEFAULT_MODEL.cumulative_transitions)
+    widths = np.diff(joint, prepend=0.0, axis=1)
+
+    assert np.allclose(widths, DEFAULT_MODEL.propagate_probs[:, np.newaxis] * DEFAULT_MODEL.transition_matrix)
+    assert np.array_equal(joint[:, -1], DEFAULT_MODEL.propagate_probs)
+
+@pytest.mark.parametrize("engine", ["numba-single", "counter"])
+def test_single_uniform_engines_reproducible(engine):
+    first = generate_chains(2 * BLOCK_SIZE, engine=engine, seed=5, n_threads=1)
+    second = generate_chains(2 * BLOCK_SIZE, engine=engine, seed=5)
+
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+
+@pytest.mark.parametrize("engine", ["numba-single", "counter"])
+def test_single_uniform_engines_match_numba_statistics(engine):
+    n = 20000
+    lengths, freq_A, _, _ = generate_chains(n, engine=engine, seed=1)
+    ref_lengths, ref_A, _, _ = generate_chains(n, engine="numba", seed=2)
+
+    se = np.sqrt((lengths.var() + ref_lengths.var()) / n)
+    assert abs(lengths.mean() - ref_lengths.mean()) < 5 * se
+    assert abs(freq_A.mean() - ref_A.mean()) < 0.005
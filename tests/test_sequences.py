@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from montecarlo.sequences import (
+    ChainSequences, SequenceStatistics, bits_per_monomer, record_sequences, sequence_statistics
+)
+from montecarlo.simulation import generate_chains
+from montecarlo.kinetics import KineticModel
+
+# Chains "AAB", "B", "CABB" packed 4 codes per byte, first monomer in the lowest bits
+packed = np.array([0 | 0 << 2 | 1 << 4, 1, 2 | 0 << 2 | 1 << 4 | 1 << 6], dtype=np.uint8)
+sequences = ChainSequences(packed, [0, 1, 2, 3], [3, 1, 4], bits=2, names="ABC")
+
+def test_bits_per_monomer():
+    assert bits_per_monomer(3) == 2
+    assert bits_per_monomer(4) == 2
+    assert bits_per_monomer(5) == 4
+    with pytest.raises(ValueError):
+        bits_per_monomer(17)
+
+def test_decode():
+    codes, chain_offsets = sequences.decode()
+    assert codes.tolist() == [0, 0, 1, 1, 2, 0, 1, 1]
+    assert chain_offsets.tolist() == [0, 3, 4, 8]
+    assert sequences.sequence(2).tolist() == [2, 0, 1, 1]
+
+def test_counts_runs_and_block_lengths():
+    assert sequences.counts().tolist() == [[2, 0, 1], [1, 1, 2], [0, 0, 1]]
+
+    monomers, lengths, chains = sequences.runs()
+    # The B ending chain 0 and the B of chain 1 are separate runs
+    assert monomers.tolist() == [0, 1, 1, 2, 0, 1]
+    assert lengths.tolist() == [2, 1, 1, 1, 1, 2]
+    assert chains.tolist() == [0, 0, 1, 2, 2, 2]
+    assert sequences.block_lengths("B").tolist() == [0, 2, 1]
+
+def test_count_pattern_stays_within_chains():
+    assert sequences.count_pattern("AB").tolist() == [1, 0, 1]
+    assert sequences.count_pattern("BB").tolist() == [0, 0, 1]  # not across chains 0 and 1
+    assert sequences.count_pattern([1]).tolist() == [1, 1, 2]
+
+@pytest.mark.parametrize("engine", ["numba", "skip"])
+def test_record_sequences_matches_generated_chains(engine):
+    recorded = record_sequences(5000, engine=engine, seed=8)
+    chain_lengths, *fractions = generate_chains(5000, engine=engine, seed=8)
+
+    assert np.array_equal(recorded.chain_lengths, chain_lengths)
+    assert np.allclose(recorded.counts() / chain_lengths, fractions)
+    assert recorded.nbytes < chain_lengths.sum() // 4 + 9 * len(chain_lengths) + 8
+    assert recorded.sequence(0)[0] == 0  # chains start with A
+
+def test_record_sequences_four_bit_codes(tmp_path):
+    model = KineticModel(feed=[0.2] * 5, reactivity_ratios=np.ones((5, 5)), propagation_factors=[0.2] * 5,
+                         termination_factors=[0.2] * 5)
+    recorded = record_sequences(300, engine="skip", seed=1, model=model)
+    assert recorded.bits == 4
+    assert recorded.counts().sum() == recorded.chain_lengths.sum()
+
+    recorded.save(tmp_path / "sequences.npz")
+    loaded = ChainSequences.load(tmp_path / "sequences.npz")
+    assert np.array_equal(loaded.counts(), recorded.counts())
+    assert loaded.names == recorded.names
+
+def test_record_sequences_rejects_python_engine():
+    with pytest.raises(ValueError):
+        record_sequences(10, engine="python")
+
+def test_statistics_of_recorded_sequences():
+    statistics = sequences.statistics(max_run=2)
+
+    # Dyads of "AAB", "B", "CABB": AA AB | - | CA AB BB
+    assert statistics.dyads.tolist() == [[1, 2, 0], [0, 1, 0], [1, 0, 0]]
+    assert statistics.triads[0, 0, 1] == 1 and statistics.triads[2, 0, 1] == 1 and statistics.triads[0, 1, 1] == 1
+    assert statistics.triads.sum() == 3
+    assert statistics.run_hist.tolist() == [[0, 1, 1], [0, 2, 1], [0, 1, 0]]
+    assert np.allclose(statistics.mean_block_lengths, [1.5, 4 / 3, 1.0])
+    assert statistics.fractions(2, symmetric=True)["AB"] == 2 / 5
+
+@pytest.mark.parametrize("engine", ["numba", "skip"])
+def test_sequence_statistics_match_recorded_sequences(engine):
+    statistics = sequence_statistics(3000, max_run=50, engine=engine, seed=6)
+    expected = record_sequences(3000, engine=engine, seed=6).statistics(max_run=50)
+
+    assert np.array_equal(statistics.dyads, expected.dyads)
+    assert np.array_equal(statistics.triads, expected.triads)
+    assert np.array_equal(statistics.run_hist, expected.run_hist)
+    assert np.array_equal(statistics.run_sums, expected.run_sums)
+    assert np.isclose(sum(statistics.fractions(3).values()), 1.0)
+
+def test_sequence_statistics_merge():
+    first = sequence_statistics(500, engine="skip", seed=1)
+    second = sequence_statistics(500, engine="skip", seed=2)
+    total = SequenceStatistics().merge(first).merge(second)
+
+    assert total.dyads.sum() == first.dyads.sum() + second.dyads.sum()
+    assert list(total.to_frame()["order"].unique()) == [2, 3]
+    with pytest.raises(ValueError):
+        total.merge(SequenceStatistics(max_run=10))
@@ -1,5 +1,16 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
 import numpy as np
-from montecarlo.simulation import generate_chains
+import pytest
+from montecarlo.simulation import (
+    generate_chains, iter_chains, histogram_chains, chain_moments, BLOCK_SIZE, _skip_tables
+)
+from montecarlo.kinetics import KineticModel
+from montecarlo.accumulators import (
+    WHistogramAccumulator, LengthHistogramAccumulator, MomentAccumulator, accumulate
+)
 
 def test_generate_chain_small():
     num_chains = 5
@@ -46,4 +57,133 @@ def test_generate_chains_values():
     _, Fa, Fb, Fc = generate_chains(100)
     assert np.all(Fa >= 0) and np.all(Fa <= 1)
     assert np.all(Fb >= 0) and np.all(Fb <= 1)
-    assert np.all(Fc >= 0) and np.all(Fc <= 1)
\ No newline at end of file
+    assert np.all(Fc >= 0) and np.all(Fc <= 1)
+
+def test_generate_chains_numba_seed_reproducible():
+    D1, Fa1, _, _ = generate_chains(10000, use_numba=True, seed=123)
+    D2, Fa2, _, _ = generate_chains(10000, use_numba=True, seed=123)
+    D3, _, _, _ = generate_chains(10000, use_numba=True, seed=124)
+
+    assert np.array_equal(D1, D2)
+    assert np.array_equal(Fa1, Fa2)
+    assert not np.array_equal(D1, D3)
+
+def test_generate_chains_numba_thread_count_independent():
+    # Run with 4 workqueue threads in a subprocess, so that the check also runs on single-core machines
+    code = (
+        "import numpy as np, numba\n"
+        "from montecarlo.simulation import generate_chains\n"
+        "assert numba.config.NUMBA_NUM_THREADS == 4\n"
+        "for engine in ['numba', 'skip']:\n"
+        "    one = generate_chains(10000, engine=engine, n_threads=1, seed=7)\n"
+        "    four = generate_chains(10000, engine=engine, n_threads=4, seed=7)\n"
+        "    print(all(np.array_equal(a, b) for a, b in zip(one, four)))\n"
+    )
+    env = {**os.environ, "NUMBA_THREADING_LAYER": "workqueue", "NUMBA_NUM_THREADS": "4"}
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=Path(__file__).resolve().parents[1],
+                         capture_output=True, text=True, check=True)
+
+    assert out.stdout.split() == ["True", "True"]
+
+def test_generate_chains_python_seed_reproducible():
+    D1, Fa1, _, _ = generate_chains(50, use_numba=False, seed=3)
+    D2, Fa2, _, _ = generate_chains(50, use_numba=False, seed=3)
+
+    assert np.array_equal(D1, D2)
+    assert np.array_equal(Fa1, Fa2)
+
+def test_generate_chains_skip_matches_numba_statistics():
+    D_skip, Fa_skip, Fb_skip, Fc_skip = generate_chains(20000, engine="skip", seed=11)
+    D_numba, Fa_numba, _, _ = generate_chains(20000, engine="numba", seed=12)
+
+    assert np.all(D_skip >= 1)
+    assert np.allclose(Fa_skip + Fb_skip + Fc_skip, 1.0)
+    assert abs(D_skip.mean() / D_numba.mean() - 1) < 0.05
+    assert abs(Fa_skip.mean() - Fa_numba.mean()) < 0.005
+
+def test_skip_tables_close_rows_on_last_switch_column():
+    transition_matrix = np.full((3, 3), 0.1)
+    np.fill_diagonal(transition_matrix, 0.8)
+    _, _, switch_cum = _skip_tables(np.full(3, 0.9), transition_matrix)
+
+    assert switch_cum[0, 2] == 1.0 and switch_cum[1, 2] == 1.0 and switch_cum[2, 1] == 1.0
+    assert np.all(np.diff(switch_cum, axis=1) >= 0)
+
+def test_skip_engine_rejects_endless_runs():
+    model = KineticModel(feed=(1.0, 0.0, 0.0), termination_factors=(0.0, 0.33, 0.34))
+    with pytest.raises(ValueError):
+        generate_chains(10, engine="skip", model=model)
+
+def test_generate_chains_invalid_engine():
+    with pytest.raises(ValueError):
+        generate_chains(10, engine="gpu")
+
+def test_iter_chains_matches_generate_chains():
+    D, Fa, Fb, Fc = generate_chains(10000, engine="numba", seed=5)
+
+    chunks = [(lengths.copy(), counts.copy())
+              for lengths, counts in iter_chains(10000, chunk_size=4096, engine="numba", seed=5)]
+
+    assert [len(lengths) for lengths, _ in chunks] == [4096, 4096, 1808]
+    lengths = np.concatenate([lengths for lengths, _ in chunks])
+    counts = np.concatenate([counts for _, counts in chunks], axis=1)
+    assert np.array_equal(lengths, D)
+    assert np.allclose(counts[0] / lengths, Fa)
+
+def test_iter_chains_reuses_buffer():
+    chunks = iter_chains(300, chunk_size=100, seed=1)
+    first_lengths, _ = next(chunks)
+    second_lengths, _ = next(chunks)
+    assert np.shares_memory(first_lengths, second_lengths)
+
+def test_iter_chains_rejects_unaligned_chunks_for_numba():
+    with pytest.raises(ValueError):
+        next(iter_chains(100, chunk_size=1000, engine="numba"))
+
+@pytest.mark.parametrize("engine", ["numba", "skip"])
+def test_histogram_chains_matches_stored_chains(engine):
+    w_hist, length_hist = histogram_chains(5000, n_bins=50, engine=engine, seed=9)
+
+    expected_w = WHistogramAccumulator(n_bins=50)
+    expected_lengths = LengthHistogramAccumulator()
+    accumulate(iter_chains(5000, chunk_size=BLOCK_SIZE, engine=engine, seed=9), expected_w, expected_lengths)
+
+    assert np.array_equal(w_hist.weights, expected_w.weights)
+    assert np.array_equal(length_hist.counts, expected_lengths.counts)
+    assert length_hist.counts.sum() == 5000
+
+def test_histogram_chains_python_engine():
+    w_hist, length_hist = histogram_chains(200, n_bins=20, engine="python", seed=0)
+    assert w_hist.weights.shape == (3, 20)
+    assert length_hist.counts.sum() == 200
+
+@pytest.mark.parametrize("engine", ["numba", "skip"])
+def test_chain_moments_matches_stored_chains(engine):
+    moments = chain_moments(5000, engine=engine, seed=4)
+    expected = accumulate(iter_chains(5000, chunk_size=BLOCK_SIZE, engine=engine, seed=4), MomentAccumulator())[0]
+
+    assert moments.n_chains == 5000
+    assert np.array_equal(moments.count_sums, expected.count_sums)
+    assert np.isclose(moments.mw, expected.mw, rtol=1e-12)
+    assert np.isclose(moments.mz, expected.mz, rtol=1e-12)
+    assert np.allclose(moments.mean_fractions, expected.mean_fractions, rtol=1e-12)
+
+def test_chain_moments_thread_count_independent():
+    first = chain_moments(3 * BLOCK_SIZE, engine="skip", seed=2, n_threads=1)
+    second = chain_moments(3 * BLOCK_SIZE, engine="skip", seed=2)
+
+    assert np.array_equal(first.sums, second.sums)
+    assert np.array_equal(first.fraction_m2, second.fraction_m2)
+
+def test_chain_moments_python_engine():
+    moments = chain_moments(200, engine="python", seed=0)
+    assert moments.n_chains == 200
+    assert moments.mz >= moments.mw >= moments.mn
+
+def test_histogram_chains_streams_other_engines():
+    w_hist, length_hist = histogram_chains(5000, n_bins=50, engine="counter", seed=9)
+
+    expected_w = WHistogramAccumulator(n_bins=50)
+    accumulate(iter_chains(5000, engine="counter", seed=9), expected_w)
+    assert np.array_equal(w_hist.weights, expected_w.weights)
+    assert length_hist.counts.sum() == 5000
@@ -1,9 +1,11 @@
 import numpy as np
+import pytest
 from montecarlo.sorting_algorithms import (
     bubble_sort, bubble_sort_numba,
     insertion_sort, insertion_sort_numba,
     selection_sort, selection_sort_numba,
-    tim_sort
+    tim_sort, radix_sort_numba, merge_sort_numba, introsort_numba, co_sort, co_sort_numba, co_sort_records,
+    SORTING_ALGORITHMS, select_algorithms, choose_algorithm, sort
 )
 
 chain_lenghts = np.array([5, 2, 9, 1, 5, 6])
@@ -46,3 +48,118 @@ def test_tim_sort_python():
     cl, fa = tim_sort(chain_lenghts.copy(), freq_A.copy())
     assert np.array_equal(cl, expected_chain_lenghts)
     assert np.array_equal(fa, expected_freq_A)
+
+def test_radix_sort_numba():
+    cl, fa = radix_sort_numba(chain_lenghts.copy(), freq_A.copy())
+    assert np.array_equal(cl, expected_chain_lenghts)
+    assert np.array_equal(fa, expected_freq_A)
+
+def test_radix_sort_numba_large_and_negative():
+    keys = np.random.randn(10000)
+    payload = np.arange(10000)
+    expected_order = np.argsort(keys, kind="stable")
+    expected_keys = keys[expected_order]
+    radix_sort_numba(payload, keys)
+    assert np.array_equal(keys, expected_keys)
+    assert np.array_equal(payload, expected_order)
+
+def test_merge_sort_numba():
+    cl, fa = merge_sort_numba(chain_lenghts.copy(), freq_A.copy())
+    assert np.array_equal(cl, expected_chain_lenghts)
+    assert np.array_equal(fa, expected_freq_A)
+
+def test_merge_sort_numba_large_is_stable():
+    keys = np.random.randint(0, 100, 5000).astype(np.float64)
+    payload = np.arange(5000)
+    expected_order = np.argsort(keys, kind="stable")
+    merge_sort_numba(payload, keys)
+    assert np.array_equal(payload, expected_order)
+
+def test_introsort_numba():
+    cl, fa = introsort_numba(chain_lenghts.copy(), freq_A.copy())
+    assert np.array_equal(cl, expected_chain_lenghts)
+    assert np.array_equal(fa, expected_freq_A)
+
+def test_introsort_numba_large():
+    keys = np.random.randint(0, 100, 200000).astype(np.float64)
+    original = keys.copy()
+    payload = np.arange(200000)
+    introsort_numba(payload, keys)
+    assert np.all(np.diff(keys) >= 0)
+    assert np.array_equal(original[payload], keys)
+
+def test_co_sort_python():
+    key = np.array([0.5, 0.2, 0.9, 0.1, 0.5, 0.6])
+    lengths = np.array([1, 2, 3, 4, 5, 6])
+    other = key * 10
+    co_sort(key, lengths, other)
+    assert np.array_equal(key, np.sort(freq_A))
+    assert np.array_equal(lengths, [4, 2, 1, 5, 6, 3])  # stable: 1 before 5
+    assert np.allclose(other, key * 10)
+
+def test_co_sort_numba():
+    key = np.array([0.5, 0.2, 0.9, 0.1, 0.5, 0.6])
+    lengths = np.array([1, 2, 3, 4, 5, 6])
+    other = key * 10
+    co_sort_numba(key, lengths, other)
+    assert np.array_equal(key, np.sort(freq_A))
+    assert np.array_equal(lengths, [4, 2, 1, 5, 6, 3])
+    assert np.allclose(other, key * 10)
+
+def test_co_sort_length_mismatch():
+    with pytest.raises(ValueError):
+        co_sort(freq_A.copy(), chain_lenghts[:3].copy())
+
+def test_co_sort_records():
+    records = np.zeros(len(freq_A), dtype=[("length", np.int64), ("freq_A", np.float64)])
+    records["length"] = chain_lenghts
+    records["freq_A"] = freq_A
+    co_sort_records(records, "freq_A")
+    assert np.array_equal(records["freq_A"], expected_freq_A)
+    assert np.array_equal(records["length"], expected_chain_lenghts)
+
+
+def test_registry_metadata():
+    assert SORTING_ALGORITHMS["bubble_sort"].quadratic
+    assert SORTING_ALGORITHMS["merge_sort_numba"].stable and SORTING_ALGORITHMS["merge_sort_numba"].parallel
+    assert not SORTING_ALGORITHMS["introsort_numba"].stable
+    assert not SORTING_ALGORITHMS["tim_sort"].in_place
+    for algorithm in SORTING_ALGORITHMS.values():
+        cl, fa = algorithm.func(chain_lenghts.copy(), freq_A.copy())
+        assert np.array_equal(fa, expected_freq_A), algorithm.name
+
+def test_select_algorithms():
+    numba_algos = select_algorithms(use_numba=True, n=100)
+    assert numba_algos["bubble_sort"].name == "bubble_sort_numba"
+    assert numba_algos["tim_sort"].name == "tim_sort"
+
+    python_algos = select_algorithms(use_numba=False, n=100)
+    assert python_algos["bubble_sort"].name == "bubble_sort"
+    assert python_algos["radix_sort"].name == "radix_sort_numba"
+
+    large = select_algorithms(n=10**6, max_quadratic_size=10**4)
+    assert not any(algorithm.quadratic for algorithm in large.values())
+
+def test_choose_algorithm():
+    n = 10000
+    assert choose_algorithm(np.random.rand(10)).name == "insertion_sort_numba"
+    assert choose_algorithm(np.arange(n, dtype=float)) is None
+
+    nearly_sorted = np.arange(n, dtype=float)
+    nearly_sorted[[10, 20]] = nearly_sorted[[20, 10]]
+    assert choose_algorithm(nearly_sorted).name == "co_sort"
+
+    chosen = choose_algorithm(np.random.rand(n), stable=True)
+    assert chosen.stable and not chosen.quadratic
+
+def test_sort_auto():
+    keys = np.random.rand(5000)
+    payload = np.arange(5000)
+    expected_order = np.argsort(keys, kind="stable")
+    _, sorted_keys = sort(payload, keys, stable=True)
+    assert np.all(np.diff(sorted_keys) >= 0)
+    assert np.array_equal(payload, expected_order)
+
+def test_sort_unknown_algorithm():
+    with pytest.raises(ValueError):
+        sort(chain_lenghts.copy(), freq_A.copy(), algorithm="quantum_sort")
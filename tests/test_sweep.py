@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from montecarlo.sweep import parameter_grid, run_sweep
+from montecarlo.kinetics import KineticModel
+from montecarlo.simulation import generate_chains
+
+def test_parameter_grid():
+    grid = parameter_grid(feed=[(0.6, 0.2, 0.2), (0.4, 0.3, 0.3)], total_random_events=[500, 1000, 2000])
+
+    assert len(grid) == 6
+    assert grid[1] == {"feed": (0.6, 0.2, 0.2), "total_random_events": 1000}
+
+def test_run_sweep_columns_and_normalization():
+    grid = parameter_grid(total_random_events=[100, 200])
+    df = run_sweep(grid, num_chains=500, n_bins=10, seed=0)
+
+    assert isinstance(df, pd.DataFrame)
+    assert list(df["set"]) == [0, 1]
+    for col in ["total_random_events", "mn", "mw", "pdi", "composition_A", "mean_fraction_C", "W_B", "estimated_time"]:
+        assert col in df.columns
+    assert np.allclose(df[["composition_A", "composition_B", "composition_C"]].sum(axis=1), 1.0)
+    assert np.isclose(df.loc[0, "W_A"].sum() * 0.1, 1.0)
+    assert df.loc[1, "mn"] > df.loc[0, "mn"]  # fewer terminations per propagation event
+
+def test_run_sweep_reproducible_and_thread_independent():
+    grid = parameter_grid(total_random_events=[100, 300, 500])
+    first = run_sweep(grid, num_chains=5000, seed=3, n_threads=1)
+    second = run_sweep(grid, num_chains=5000, seed=3)
+
+    assert np.array_equal(first["mn"], second["mn"])
+    assert all(np.array_equal(a, b) for a, b in zip(first["W_C"], second["W_C"]))
+
+@pytest.mark.parametrize("engine", ["numba", "skip"])
+def test_run_sweep_matches_single_simulation_statistics(engine):
+    model = KineticModel(total_random_events=200)
+    df = run_sweep([model], num_chains=20000, engine=engine, seed=1)
+    chain_lengths, freq_A, _, _ = generate_chains(20000, engine="skip", model=model, seed=2)
+
+    assert np.isclose(df.loc[0, "mn"], chain_lengths.mean(), rtol=0.05)
+    assert np.isclose(df.loc[0, "mean_fraction_A"], freq_A.mean(), rtol=0.02)
+
+def test_run_sweep_invalid_engine():
+    with pytest.raises(ValueError):
+        run_sweep([{}], engine="python")
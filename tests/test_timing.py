@@ -0,0 +1,30 @@
+import time
+from montecarlo.timing import measure, summarize_times
+
+def test_measure_separates_first_call():
+    calls = []
+
+    def func():
+        if not calls:
+            time.sleep(0.05)  # simulates JIT compilation
+        calls.append(1)
+
+    result = measure(func, min_repeats=3, max_repeats=5)
+
+    assert 3 <= len(result["times"]) <= 5
+    assert len(calls) == len(result["times"]) + 1
+    assert result["compile_time"] >= 0.04
+    assert result["first_call_time"] >= result["compile_time"]
+
+def test_measure_uses_setup_arguments():
+    seen = []
+    result = measure(lambda x: seen.append(x) or x * 2, setup=lambda: (21,), min_repeats=2, max_repeats=2)
+    assert result["result"] == 42
+    assert seen == [21, 21, 21]
+
+def test_summarize_times():
+    stats = summarize_times([1.0, 2.0, 3.0, 4.0, 100.0])
+    assert stats["median"] == 3.0
+    assert stats["min"] == 1.0
+    assert stats["iqr"] == 2.0
+    assert stats["n_repeats"] == 5
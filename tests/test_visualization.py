@@ -1,10 +1,12 @@
 import numpy as np
+import pandas as pd
 import matplotlib
 matplotlib.use("Agg")  # Prevents plot windows to open during test
 import matplotlib.pyplot as plt
 
-from montecarlo.visualization import plot_w_distribution
+from montecarlo.visualization import plot_w_distribution, save_w_distribution_csv
 from montecarlo.simulation import generate_chains
+from montecarlo.distribution import WDistribution
 
 def test_generate_chains_shapes():
     n = 100
@@ -26,3 +28,23 @@ def test_plot_w_distribution_runs_without_error():
     except Exception as e:
         assert False, f"plot_w_distribution levantou um erro: {e}"
     plt.close()
+
+def test_save_w_distribution_csv_matches_plotted_bins(tmp_path):
+    chain_lengths = np.array([1, 2, 4, 5])
+    freq_A = np.array([1.0, 0.5, 1.0, 0.4])
+    save_w_distribution_csv(freq_A, chain_lengths, filename=tmp_path / "w.csv", n_bins=4)
+    saved = pd.read_csv(tmp_path / "w.csv")
+
+    assert np.allclose(saved["bin_center"], [0.125, 0.375, 0.625, 0.875])
+    assert np.allclose(saved["W"], np.array([0, 5, 2, 5]) / 12 / 0.25)
+
+def test_save_w_distribution_csv_bins_counts_exactly(tmp_path):
+    chain_lengths = np.array([100, 100, 7])
+    counts_A = np.array([57, 29, 1])  # 0.57 * 100 == 56.99999999999999
+    save_w_distribution_csv(counts_A / chain_lengths, chain_lengths, filename=tmp_path / "w.csv", n_bins=100,
+                            counts=counts_A)
+    saved = pd.read_csv(tmp_path / "w.csv")
+
+    expected = WDistribution.from_counts(chain_lengths, counts_A[np.newaxis], n_bins=100).density(0)
+    assert np.allclose(saved["W"], expected)
+    assert saved["W"].iloc[57] > 0 and saved["W"].iloc[56] == 0